@@ -0,0 +1,120 @@
+"""Search benchmark: LIKE '%x%' full scan vs FTS5 trigram index.
+
+Usage:
+    python bench_search.py --rows 1000000
+"""
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from contact_db import ensure_fts_index, fts_match_expr
+
+FIRST_NAMES = ["Vicky", "Rohit", "Ananya", "Vikas", "Priya", "Amit", "Neha", "Rahul", "Sneha", "Karan"]
+LAST_NAMES = ["Chaubey", "Sharma", "Verma", "Kumar", "Singh", "Gupta", "Patel", "Yadav", "Mishra", "Jain"]
+CITIES = ["Jaipur", "Delhi", "Mumbai", "Noida", "Pune", "Patna", "Lucknow", "Indore"]
+
+SEARCH_TERMS = ["Sharma", "vik", "98765", "zzz"]
+PAGE_SIZE = 200
+
+
+def build_db(db_path: str, rows: int, seed: int = 42):
+    """Random contacts se member table bharo."""
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE member (
+            mem_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            firstname TEXT,
+            lastname TEXT,
+            gender TEXT,
+            age TEXT,
+            address TEXT,
+            contact TEXT
+        )
+        """
+    )
+    batch = []
+    for i in range(rows):
+        batch.append((
+            rnd.choice(FIRST_NAMES) + str(i % 997),
+            rnd.choice(LAST_NAMES),
+            rnd.choice(["Male", "Female"]),
+            str(rnd.randint(18, 80)),
+            rnd.choice(CITIES),
+            str(rnd.randint(6000000000, 9999999999)),
+        ))
+        if len(batch) == 50000:
+            conn.executemany("INSERT INTO member (firstname, lastname, gender, age, address, contact) VALUES (?, ?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO member (firstname, lastname, gender, age, address, contact) VALUES (?, ?, ?, ?, ?, ?)", batch)
+    conn.commit()
+
+    start = time.perf_counter()
+    ensure_fts_index(conn)
+    print(f"[BUILD] {rows} rows, FTS index built in {time.perf_counter() - start:.2f}s")
+    return conn
+
+
+def timed(conn, query, params, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = conn.execute(query, params).fetchall()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(conn):
+    like_where = "(firstname LIKE ? OR lastname LIKE ? OR contact LIKE ?)"
+    fts_where = "mem_id IN (SELECT rowid FROM member_fts WHERE member_fts MATCH ?)"
+    cols = "mem_id, firstname, lastname, gender, age, address, contact"
+
+    print(f"{'term':<10}{'query':<8}{'LIKE (ms)':>12}{'FTS (ms)':>12}{'rows':>10}")
+    for term in SEARCH_TERMS:
+        like = f"%{term}%"
+        like_params = (like, like, like)
+        fts_params = (fts_match_expr(term),)
+
+        for label, tail in (("count", None), ("page", f" ORDER BY lastname, mem_id LIMIT {PAGE_SIZE}")):
+            if tail is None:
+                like_sql = f"SELECT COUNT(*) FROM member WHERE {like_where}"
+                fts_sql = f"SELECT COUNT(*) FROM member WHERE {fts_where}"
+            else:
+                like_sql = f"SELECT {cols} FROM member WHERE {like_where}{tail}"
+                fts_sql = f"SELECT {cols} FROM member WHERE {fts_where}{tail}"
+
+            like_t, like_rows = timed(conn, like_sql, like_params)
+            fts_t, fts_rows = timed(conn, fts_sql, fts_params)
+            if like_rows != fts_rows:
+                print(f"[WARN] result mismatch for {term!r} ({label})")
+            n = like_rows[0][0] if tail is None else len(like_rows)
+            print(f"{term:<10}{label:<8}{like_t * 1000:>12.1f}{fts_t * 1000:>12.1f}{n:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE vs FTS5 search benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", help="DB file (default: temp file, delete ho jayega)")
+    args = parser.parse_args()
+
+    if args.db:
+        conn = build_db(args.db, args.rows)
+        run(conn)
+        conn.close()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_db(str(Path(tmp) / "bench.db"), args.rows)
+        run(conn)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Benchmark suite: ETL, list / search queries, import / export, stats.
+
+Usage:
+    python benchmark.py --rows 1000000 --out bench_v2.json
+    python benchmark.py --rows 1000000 --compare bench_v1.json   # regression check
+
+Data datagen.py se (seeded), isliye same --rows / --seed par har version same
+data par chalta hai. Results JSON me: har step ka best / mean time aur rows/sec.
+--compare ke saath koi step --threshold se zyada slow hua to exit code 1.
+"""
+import argparse
+import io
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+import datagen
+from contact_db import STATEMENT_CACHE_SIZE, ConnectionPool
+from contact_service import DEFAULT_PAGE_SIZE, ContactRepository
+
+SEARCH_TERMS = {
+    "search_name": "Sharma",  # FTS (trigram) path
+    "search_short": "Sh",     # FTS_MIN_TERM_LENGTH se chhota -> LIKE path
+    "search_contact": "98765",
+    "search_miss": "zzzz",
+}
+PAGE_WALK_PAGES = 50
+COMPARE_NOISE_FLOOR_S = 0.001  # dono taraf isse tez steps regression nahi gine jate (timer noise)
+
+
+class Bench:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results = {}
+
+    def run(self, name: str, func, rows=None, repeat=None):
+        """func ko repeat baar chalao, best / mean record karo. func ka last result return."""
+        runs = []
+        result = None
+        for _ in range(repeat or self.repeat):
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):  # ETL ke [LOAD] prints JSON report me nahi chahiye
+                result = func()
+            runs.append(time.perf_counter() - start)
+        if callable(rows):
+            rows = rows(result)
+        best = min(runs)
+        self.results[name] = {
+            "best_s": round(best, 6),
+            "mean_s": round(statistics.mean(runs), 6),
+            "runs": len(runs),
+            "rows": rows,
+            "rows_per_s": round(rows / best) if rows and best > 0 else None,
+        }
+        print(f"{name:<28}{best * 1000:>12.2f} ms" + (f"{rows:>12,} rows" if rows else ""))
+        return result
+
+
+def open_repo(db_path: str) -> ContactRepository:
+    pool = ConnectionPool(partial(
+        sqlite3.connect, db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+    ))
+    repo = ContactRepository("sqlite", pool=pool)
+    repo.init_schema()
+    return repo
+
+
+def page_walk(repo: ContactRepository, pages: int) -> int:
+    """Neeche scroll simulate karo: consecutive keyset pages."""
+    seen = 0
+    after = None
+    for _ in range(pages):
+        page = repo.fetch_page("", after_key=after, limit=DEFAULT_PAGE_SIZE)
+        if not page:
+            break
+        seen += len(page)
+        after = page[-1].key
+    return seen
+
+
+def run_suite(args, workdir: Path) -> dict:
+    import etl_contacts  # pandas sirf yahin chahiye
+
+    bench = Bench(args.repeat)
+    csv_path = workdir / "contacts.csv"
+    db_path = workdir / "bench.db"
+    db_path.unlink(missing_ok=True)  # har run fresh DB par
+
+    # ---------------- ETL ----------------
+    bench.run(
+        "datagen",
+        lambda: datagen.write_csv(str(csv_path), args.rows, args.seed),
+        rows=args.rows, repeat=1,
+    )
+    df = bench.run("etl_extract", lambda: etl_contacts.extract(str(csv_path)), rows=args.rows, repeat=1)
+    clean = bench.run("etl_transform", lambda: etl_contacts.transform(df.copy()), rows=len, repeat=1)
+    bench.run(
+        "etl_load_to_sqlite",
+        lambda: etl_contacts.load_to_sqlite(clean, str(db_path), bulk=args.bulk),
+        rows=len(clean), repeat=1,
+    )
+    del df, clean
+
+    # ---------------- Queries (GUI load_contacts = first page + count) ----------------
+    repo = open_repo(str(db_path))
+
+    def load_contacts(search=""):
+        page = repo.fetch_page(search, limit=DEFAULT_PAGE_SIZE)
+        return page, repo.count(search)
+
+    bench.run("load_contacts", load_contacts, rows=lambda r: len(r[0]))
+    for name, term in SEARCH_TERMS.items():
+        bench.run(f"load_contacts_{name}", partial(load_contacts, term), rows=lambda r: r[1])
+    bench.run("page_walk", partial(page_walk, repo, PAGE_WALK_PAGES), rows=lambda n: n)
+
+    # ---------------- Stats ----------------
+    def stats_cold():
+        repo.stats_cache = None
+        return repo.stats()
+
+    def stats_live_groupby():
+        # Purana show_stats: har baar full scan
+        with repo.connection() as conn:
+            return conn.execute("SELECT gender, COUNT(*) FROM member GROUP BY gender").fetchall()
+
+    bench.run("stats_cached_table", stats_cold, rows=lambda s: s["total"])
+    bench.run("stats_warm", repo.stats, rows=lambda s: s["total"])
+    bench.run("stats_live_groupby", stats_live_groupby)
+
+    # ---------------- Export / import ----------------
+    total = repo.count()
+    for fmt in ("csv", "csv.gz"):
+        out = workdir / f"export.{fmt}"
+        bench.run(f"export_{fmt.replace('.', '_')}", partial(repo.export, str(out), fmt=fmt), rows=total,
+                  repeat=min(args.repeat, 2))
+
+    def import_fresh():
+        import_db = workdir / "import.db"
+        import_db.unlink(missing_ok=True)
+        fresh = open_repo(str(import_db))
+        try:
+            return fresh.import_csv(str(csv_path), reject_path=str(workdir / "rejects.csv"))
+        finally:
+            fresh.pool.close_all()
+
+    bench.run("import_csv", import_fresh, rows=lambda r: r["inserted"], repeat=1)
+    repo.pool.close_all()
+    return bench.results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, meta: dict, baseline_path: str, threshold: float) -> bool:
+    """Baseline JSON se compare karo. True = koi regression nahi."""
+    report = json.loads(Path(baseline_path).read_text())
+    baseline = report["results"]
+    for field in ("rows", "seed", "bulk"):
+        if report["meta"].get(field) != meta[field]:
+            print(f"[WARN] baseline {field}={report['meta'].get(field)!r}, current {meta[field]!r}")
+    ok = True
+    print(f"\n{'step':<28}{'base ms':>12}{'now ms':>12}{'change':>10}")
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = now["best_s"] / base["best_s"] - 1 if base["best_s"] else 0.0
+        flag = ""
+        noisy = max(base["best_s"], now["best_s"]) < COMPARE_NOISE_FLOOR_S
+        if change > threshold and not noisy:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{name:<28}{base['best_s'] * 1000:>12.2f}{now['best_s'] * 1000:>12.2f}{change:>+10.1%}{flag}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contact system benchmark suite")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="Query steps kitni baar (best liya jata hai)")
+    parser.add_argument("--bulk", action="store_true", help="ETL load --bulk mode me")
+    parser.add_argument("--out", help="Results JSON file (default: stdout par hi)")
+    parser.add_argument("--workdir", help="CSV / DB yahan banenge (default: temp dir, baad me delete)")
+    parser.add_argument("--compare", help="Baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Itne fraction se slow = regression")
+    args = parser.parse_args(argv)
+
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "rows": args.rows,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "bulk": args.bulk,
+    }
+
+    if args.workdir:
+        workdir = Path(args.workdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        results = run_suite(args, workdir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run_suite(args, Path(tmp))
+
+    report = {"meta": meta, "results": results}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text)
+        print(f"\n[BENCH] Results written to {args.out}")
+    else:
+        print(text)
+
+    if args.compare and not compare(results, meta, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+"""In-process columnar cache of the member table (optional: GUI --cache).
+
+Desktop ka poora working set RAM me aa jata hai, to listing / search ke liye har
+baar DB tak jaane ki zaroorat nahi. member ek baar load hota hai, compact columns me:
+- mem_id, version: array('I'); age: array('B') (0 = NULL)
+- contact: array('Q') me E.164 ke digits ("+919876543210" -> 919876543210),
+  jo number is shape me nahi aata woh odd_contacts (mem_id -> text) me
+- firstname / lastname / gender / address: interned strings (same value = ek object)
+
+Indexes sirf positions ke array('I') hain (4 bytes/row), keys compare ke waqt banti hain:
+- order:      (lastname, firstname, mem_id) -- GUI ki keyset listing, DB jaisa hi order
+- rank:       position -> order me label (gaps ke saath), search results isi se sort
+- by_first / by_last: casefold naam -- sorted array par prefix range (trie jaisa lookup)
+- by_contact: contact digits -- number ka prefix ("98765", "+9198765")
+- by_phone:   ulte contact digits -- number ka suffix ("last 4 digits")
+
+Search = naam (first ya last) ka prefix, case-insensitive, ya contact ka prefix /
+suffix. DB search substring hai (FTS trigram), cache prefix / suffix.
+updated_at cache me nahi hai (Contact.updated_at None), version hai.
+
+Coherence: member_changes feed (migration 9) se sync() -- apne writes, ETL, doosra
+GUI sab isi raste aate hain. Feed follow na ho sake (prune, bulk 'R') to DB se reload.
+Sirf SQLite (MySQL par change feed nahi hai).
+"""
+import argparse
+import heapq
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from contact_service import DEFAULT_PAGE_SIZE, Contact, ContactRepository, OperationCancelled
+from migrations import CHANGE_RELOAD
+from normalize import DEFAULT_COUNTRY_CODE, E164_MAX_DIGITS, MAX_AGE
+
+# ======================= CACHE CONFIG ============================
+CACHE_LOAD_BATCH = 10_000        # load ke waqt fetchmany batch
+CACHE_SYNC_LIMIT = 20_000        # isse zyada pending changes -> DB se poora reload
+INDEX_REBUILD_THRESHOLD = 500    # isse zyada rows badle to row-by-row ki jagah indexes dobara sort
+COMPACT_FRACTION = 0.25          # itne slots deleted (tombstone) ho jayein to columns compact
+
+HIGHEST = "\U0010ffff"           # prefix range ka upper end
+RANK_MAX = 0xFFFF_FFFF           # array('I') ki limit
+
+# encode_phone jaisa hi rule SQL me, taaki load ke waqt per-row Python na chale
+E164_SQL = (
+    f"contact GLOB '+[1-9]*' AND substr(contact, 2) NOT GLOB '*[^0-9]*' "
+    f"AND length(contact) <= {E164_MAX_DIGITS + 1}"
+)
+LOAD_SQL = f"""
+    SELECT mem_id, COALESCE(firstname, ''), COALESCE(lastname, ''), COALESCE(gender, ''),
+           CASE WHEN age BETWEEN 1 AND {MAX_AGE} THEN age ELSE 0 END,
+           COALESCE(address, ''),
+           CASE WHEN {E164_SQL} THEN CAST(substr(contact, 2) AS INTEGER) ELSE 0 END,
+           CASE WHEN {E164_SQL} THEN NULL ELSE contact END,
+           version
+    FROM member ORDER BY mem_id
+"""
+
+# Columns jo load() ek naye object me bana ke swap karta hai
+STATE_ATTRS = (
+    "ids", "versions", "ages", "phones", "alive", "first", "last", "gender", "address",
+    "odd_contacts", "live", "order", "rank", "by_first", "by_last", "by_contact", "by_phone",
+)
+
+
+def encode_phone(contact) -> int:
+    """E.164 text -> int digits; jo is shape me nahi (0) woh odd_contacts me jata hai."""
+    if (contact and len(contact) <= E164_MAX_DIGITS + 1 and contact[0] == "+"
+            and contact[1:2] not in ("", "0") and contact[1:].isascii() and contact[1:].isdigit()):
+        return int(contact[1:])
+    return 0
+
+
+def encode_age(age) -> int:
+    return age if isinstance(age, int) and 1 <= age <= MAX_AGE else 0
+
+
+class ContactCache:
+    """member ki RAM copy. Saare public methods thread-safe (search worker thread se bhi)."""
+
+    def __init__(self, repo: ContactRepository):
+        if repo.backend != "sqlite":
+            raise ValueError("contact cache needs the SQLite change feed (member_changes)")
+        self.repo = repo
+        self.lock = threading.RLock()
+        self.change_seq = 0
+        self.generation = 0        # har index change par +1 (search memo invalidate)
+        self.last_query = None     # (term, generation, matches): fetch_page + count ek hi set
+        self._clear()
+
+    def _clear(self):
+        self.ids = array("I")          # position -> mem_id (ascending, bisect se lookup)
+        self.versions = array("I")
+        self.ages = array("B")
+        self.phones = array("Q")
+        self.alive = bytearray()       # 0 = deleted slot (compact hone tak)
+        self.first = []
+        self.last = []
+        self.gender = []
+        self.address = []
+        self.odd_contacts = {}
+        self.live = 0
+        self.order = array("I")
+        self.rank = array("I")
+        self.by_first = array("I")
+        self.by_last = array("I")
+        self.by_contact = array("I")
+        self.by_phone = array("I")
+
+    # ============================ LOAD / SYNC ============================
+
+    def load(self, progress=None, cancel_event=None) -> int:
+        """member poora padho (DB se), indexes banao. Return: rows.
+
+        progress(fraction, rows) optional; cancel_event set -> OperationCancelled.
+        Purana data load khatam hone tak search ke liye available rehta hai.
+        """
+        total = self.repo.count() or 1
+        seq = self.repo.last_change_seq()  # load se pehle: beech ke changes sync me dobara aayenge
+        staging = ContactCache(self.repo)
+        with self.repo.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(LOAD_SQL)
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    cursor.close()
+                    raise OperationCancelled()
+                rows = cursor.fetchmany(CACHE_LOAD_BATCH)
+                if not rows:
+                    break
+                staging._extend(rows)
+                if progress is not None:
+                    progress(min(staging.live / total, 1.0), staging.live)
+            cursor.close()
+        staging._build_indexes()
+        with self.lock:
+            for attr in STATE_ATTRS:
+                setattr(self, attr, getattr(staging, attr))
+            self.change_seq = seq
+            self.generation += 1
+        return self.live
+
+    def sync(self, reload: bool = True):
+        """Feed ke naye changes apply karo. Return: touched rows (-1 = DB se poora reload hua).
+
+        reload=False: feed follow na ho sake to load() nahi (GUI main thread block na ho),
+        None return -- caller background me load() kare.
+        """
+        changes = self.repo.changes_since(self.change_seq, CACHE_SYNC_LIMIT + 1)
+        if (changes is None or len(changes) > CACHE_SYNC_LIMIT
+                or any(op == CHANGE_RELOAD for _, op, _ in changes)):
+            if not reload:
+                return None
+            self.load()
+            return -1
+        if not changes:
+            return 0
+        touched = {mem_id for _, _, mem_id in changes}
+        fresh = self.repo.get_many(touched)
+        with self.lock:
+            # Bahut saare rows: har index me ek ek insert (memmove) se sasta poora sort
+            reindex = len(touched) > INDEX_REBUILD_THRESHOLD
+            for mem_id in touched:
+                self._remove(mem_id, unindex=not reindex)
+            for contact in fresh:
+                reindex = self._add(contact, index=not reindex) or reindex
+            if len(self.ids) - self.live > COMPACT_FRACTION * len(self.ids):
+                self._compact()
+            elif reindex:
+                self._build_indexes()
+            self.change_seq = changes[-1][0]
+        return len(touched)
+
+    # ============================ ROW STORAGE ============================
+
+    def _extend(self, rows):
+        """LOAD_SQL ka ek batch column-wise (ORDER BY mem_id, isliye seedha append)."""
+        ids, first, last, gender, ages, address, phones, odd, versions = zip(*rows)
+        self.ids.extend(ids)
+        self.versions.extend(versions)
+        self.ages.extend(ages)
+        self.phones.extend(phones)
+        self.alive.extend(b"\x01" * len(rows))
+        for column, values in ((self.first, first), (self.last, last),
+                               (self.gender, gender), (self.address, address)):
+            column.extend(map(sys.intern, values))
+        if any(odd):
+            self.odd_contacts.update((mem_id, text) for mem_id, text in zip(ids, odd) if text)
+        self.live += len(rows)
+
+    def _set(self, pos, contact: Contact):
+        self.odd_contacts.pop(self.ids[pos], None)
+        phone = encode_phone(contact.contact)
+        if not phone and contact.contact:
+            self.odd_contacts[contact.mem_id] = contact.contact
+        self.ids[pos] = contact.mem_id
+        self.versions[pos] = contact.version or 0
+        self.ages[pos] = encode_age(contact.age)
+        self.phones[pos] = phone
+        self.first[pos] = sys.intern(contact.firstname or "")
+        self.last[pos] = sys.intern(contact.lastname or "")
+        self.gender[pos] = sys.intern(contact.gender or "")
+        self.address[pos] = sys.intern(contact.address or "")
+
+    def _position(self, mem_id):
+        pos = bisect_left(self.ids, mem_id)
+        return pos if pos < len(self.ids) and self.ids[pos] == mem_id else None
+
+    def _add(self, contact: Contact, index: bool = True) -> bool:
+        """Row daalo / revive karo. True = positions khisak gayi, indexes dobara banane honge."""
+        pos = self._position(contact.mem_id)
+        if pos is not None and self.alive[pos]:
+            self._remove(contact.mem_id, unindex=index)
+        shifted = False
+        if pos is None:
+            # Nayi id hamesha sabse badi (AUTOINCREMENT) -> end me. Purani id wapas aayi
+            # (e.g. undo) aur uska slot compact ho chuka -> beech me, positions khisakti hain
+            pos = bisect_left(self.ids, contact.mem_id)
+            shifted = pos < len(self.ids)
+            for column in (self.ids, self.versions, self.ages, self.phones, self.alive, self.rank):
+                column.insert(pos, 0)
+            for column in (self.first, self.last, self.gender, self.address):
+                column.insert(pos, "")
+        self._set(pos, contact)
+        self.alive[pos] = 1
+        self.live += 1
+        if index and not shifted:
+            self._index(pos)
+        return shifted
+
+    def _remove(self, mem_id, unindex: bool = True):
+        pos = self._position(mem_id)
+        if pos is None or not self.alive[pos]:
+            return
+        self.generation += 1
+        if unindex:
+            for arr, key in self._indexes():
+                del arr[bisect_left(arr, key(pos), key=key)]
+        self.alive[pos] = 0
+        self.live -= 1
+
+    def _compact(self):
+        """Deleted slots hatao (strings bhi free), phir indexes dobara."""
+        keep = [pos for pos in range(len(self.ids)) if self.alive[pos]]
+        dead = [self.ids[pos] for pos in range(len(self.ids)) if not self.alive[pos]]
+        for mem_id in dead:
+            self.odd_contacts.pop(mem_id, None)
+        for attr in ("ids", "versions", "ages", "phones"):
+            old = getattr(self, attr)
+            setattr(self, attr, array(old.typecode, [old[pos] for pos in keep]))
+        for attr in ("first", "last", "gender", "address"):
+            old = getattr(self, attr)
+            setattr(self, attr, [old[pos] for pos in keep])
+        self.alive = bytearray(b"\x01") * len(keep)
+        self._build_indexes()
+
+    def contact_text(self, pos) -> str:
+        phone = self.phones[pos]
+        return f"+{phone}" if phone else self.odd_contacts.get(self.ids[pos], "")
+
+    def _contact(self, pos) -> Contact:
+        return Contact(
+            self.first[pos], self.last[pos], self.gender[pos], self.ages[pos] or None,
+            self.address[pos], self.contact_text(pos), self.ids[pos], self.versions[pos] or None,
+        )
+
+    # ============================ INDEXES ============================
+
+    def _order_key(self, pos):
+        return (self.last[pos], self.first[pos], self.ids[pos])
+
+    def _first_key(self, pos):
+        return (self.first[pos].casefold(), pos)
+
+    def _last_key(self, pos):
+        return (self.last[pos].casefold(), pos)
+
+    def _contact_key(self, pos):
+        phone = self.phones[pos]
+        return (str(phone) if phone else self.odd_contacts.get(self.ids[pos], ""), pos)
+
+    def _phone_key(self, pos):
+        return (self._contact_key(pos)[0][::-1], pos)
+
+    def _indexes(self):
+        return (
+            (self.order, self._order_key),
+            (self.by_first, self._first_key),
+            (self.by_last, self._last_key),
+            (self.by_contact, self._contact_key),
+            (self.by_phone, self._phone_key),
+        )
+
+    def _build_indexes(self):
+        """Saare indexes ek saath: keys ek baar list me, phir C sort (stable -> ties pos order me)."""
+        self.generation += 1
+        if self.live == len(self.ids):
+            positions = range(len(self.ids))
+        else:
+            positions = [pos for pos in range(len(self.ids)) if self.alive[pos]]
+        keys = list(zip(self.last, self.first, self.ids))
+        self.order = array("I", sorted(positions, key=keys.__getitem__))
+        for attr, column in (("by_first", self.first), ("by_last", self.last)):
+            folded = {value: value.casefold() for value in set(column)}
+            keys = [folded[value] for value in column]
+            setattr(self, attr, array("I", sorted(positions, key=keys.__getitem__)))
+        keys = list(map(str, self.phones))
+        if 0 in self.phones:
+            keys = [key if key != "0" else self.odd_contacts.get(self.ids[pos], "")
+                    for pos, key in enumerate(keys)]
+        self.by_contact = array("I", sorted(positions, key=keys.__getitem__))
+        keys = [key[::-1] for key in keys]
+        self.by_phone = array("I", sorted(positions, key=keys.__getitem__))
+        del keys
+        self._relabel()
+
+    def _relabel(self):
+        """rank dobara: order me barabar gaps, taaki beech me naye rows ko label mil sake."""
+        gap = RANK_MAX // (len(self.order) + 1)
+        rank = array("I", bytes(4 * len(self.ids)))
+        for i, pos in enumerate(self.order, 1):
+            rank[pos] = i * gap
+        self.rank = rank
+
+    def _index(self, pos):
+        self.generation += 1
+        for arr, key in self._indexes():
+            arr.insert(bisect_left(arr, key(pos), key=key), pos)
+        # Order me neighbours ke labels ke beech ka label; jagah na bache to sab relabel
+        i = bisect_left(self.order, self._order_key(pos), key=self._order_key)
+        low = self.rank[self.order[i - 1]] if i > 0 else 0
+        high = self.rank[self.order[i + 1]] if i + 1 < len(self.order) else RANK_MAX
+        if high - low < 2:
+            self._relabel()
+        else:
+            self.rank[pos] = (low + high) // 2
+
+    @staticmethod
+    def _prefix_range(arr, key, prefix):
+        lo = bisect_left(arr, (prefix,), key=key)
+        hi = bisect_left(arr, (prefix + HIGHEST,), key=key)
+        return arr[lo:hi]
+
+    # ============================ QUERIES ============================
+
+    def _matches(self, term: str):
+        """Search term se match hone wali positions (set), khali term ke liye None (sab)."""
+        term = term.strip()
+        if not term:
+            return None
+        if self.last_query is not None and self.last_query[:2] == (term, self.generation):
+            return self.last_query[2]
+        found = self._find(term)
+        self.last_query = (term, self.generation, found)
+        return found
+
+    def _find(self, term: str) -> set:
+        folded = term.casefold()
+        found = set(self._prefix_range(self.by_first, self._first_key, folded))
+        found.update(self._prefix_range(self.by_last, self._last_key, folded))
+        digits = term[1:] if term.startswith("+") else term
+        if digits.isascii() and digits.isdigit():
+            prefixes = {digits} if term.startswith("+") else {digits, DEFAULT_COUNTRY_CODE + digits}
+            for prefix in prefixes:
+                found.update(self._prefix_range(self.by_contact, self._contact_key, prefix))
+            if not term.startswith("+"):
+                # "+91..." poora number hai, suffix nahi -- reversed lookup galat rows laata
+                found.update(self._prefix_range(self.by_phone, self._phone_key, digits[::-1]))
+        return found
+
+    def fetch_page(self, search: str = "", after_key=None, before_key=None,
+                   limit: int = DEFAULT_PAGE_SIZE) -> list:
+        """ContactRepository.fetch_page jaisa hi: (lastname, firstname, mem_id) keyset page."""
+        with self.lock:
+            order = self.order
+            if after_key is not None:
+                start = bisect_right(order, tuple(after_key), key=self._order_key)
+            elif before_key is not None:
+                start = bisect_left(order, tuple(before_key), key=self._order_key)
+            else:
+                start = 0
+
+            matches = self._matches(search)
+            if matches is None:
+                # Poori listing: order index ka seedha slice, O(log n)
+                if before_key is not None:
+                    positions = order[max(start - limit, 0):start]
+                else:
+                    positions = order[start:start + limit]
+            else:
+                # Search: matches ko rank (integer) se -- tuple keys se kaafi sasta
+                rank = self.rank.__getitem__
+                bound = rank(order[start]) if start < len(order) else RANK_MAX + 1
+                if before_key is not None:
+                    candidates = [pos for pos in matches if rank(pos) < bound]
+                    positions = heapq.nlargest(limit, candidates, key=rank)[::-1]
+                else:
+                    if after_key is not None:
+                        matches = [pos for pos in matches if rank(pos) >= bound]
+                    positions = heapq.nsmallest(limit, matches, key=rank)
+            return [self._contact(pos) for pos in positions]
+
+    def count(self, search: str = "") -> int:
+        with self.lock:
+            matches = self._matches(search)
+            return self.live if matches is None else len(matches)
+
+    def get(self, mem_id: int):
+        with self.lock:
+            pos = self._position(mem_id)
+            return self._contact(pos) if pos is not None and self.alive[pos] else None
+
+    def get_many(self, mem_ids, search: str = "") -> list:
+        """ContactRepository.get_many jaisa, search cache ke hi rules se."""
+        with self.lock:
+            matches = self._matches(search)
+            found = []
+            for mem_id in mem_ids:
+                pos = self._position(mem_id)
+                if pos is not None and self.alive[pos] and (matches is None or pos in matches):
+                    found.append(self._contact(pos))
+            return found
+
+    # ============================ MEMORY ============================
+
+    def memory_report(self) -> dict:
+        """Har column / index kitni memory le raha hai, aur per live row bytes."""
+        with self.lock:
+            sizes = {}
+            for attr in ("ids", "versions", "ages", "phones", "order", "rank", "by_first",
+                         "by_last", "by_contact", "by_phone"):
+                arr = getattr(self, attr)
+                sizes[attr] = arr.buffer_info()[1] * arr.itemsize
+            sizes["alive"] = len(self.alive)
+            for attr in ("first", "last", "gender", "address"):
+                column = getattr(self, attr)
+                # List me sirf pointers; string ek hi baar gino (interned values share hote hain)
+                unique = {id(value): value for value in column}
+                sizes[attr] = sys.getsizeof(column) + sum(map(sys.getsizeof, unique.values()))
+            sizes["odd_contacts"] = sys.getsizeof(self.odd_contacts) + sum(
+                map(sys.getsizeof, self.odd_contacts.values())
+            )
+            total = sum(sizes.values())
+            return {
+                "rows": self.live,
+                "slots": len(self.ids),
+                "bytes": sizes,
+                "total_bytes": total,
+                "bytes_per_row": round(total / self.live, 1) if self.live else 0.0,
+            }
+
+
+# ============================ CLI ============================
+
+def main(argv=None):
+    from contact_db import ConnectionPool, connect_sqlite
+
+    parser = argparse.ArgumentParser(description="Load member into the in-memory cache and time it")
+    parser.add_argument("--db", default="pythontut.db")
+    parser.add_argument("--search", action="append", default=[], help="Search term time karo (kai baar de sakte ho)")
+    args = parser.parse_args(argv)
+
+    repo = ContactRepository("sqlite", pool=ConnectionPool(lambda: connect_sqlite(args.db)))
+    repo.init_schema()
+    cache = ContactCache(repo)
+    start = time.perf_counter()
+    rows = cache.load()
+    print(f"[CACHE] Loaded {rows} rows in {time.perf_counter() - start:.2f}s")
+    report = cache.memory_report()
+    print(f"[CACHE] {report['total_bytes'] / 1e6:.1f} MB total, {report['bytes_per_row']} bytes/row")
+    for name, size in report["bytes"].items():
+        print(f"    {name:<12}{size / 1e6:>10.2f} MB")
+    for term in args.search:
+        start = time.perf_counter()
+        page = cache.fetch_page(term)
+        total = cache.count(term)
+        print(f"[CACHE] search {term!r}: {total} matches, first page {len(page)} rows "
+              f"in {(time.perf_counter() - start) * 1000:.3f} ms")
+    repo.pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import instrumentation
+
+# ======================= DATABASE CONFIG ============================
+# "sqlite"  -> local file DB
+# "mysql"   -> MySQL / AWS RDS (MySQL engine)
+DB_BACKEND = "sqlite"  # "sqlite" ya "mysql" me se ek choose karo
+
+SQLITE_DB_NAME = "pythontut.db"
+
+if DB_BACKEND == "mysql":
+    try:
+        import mysql.connector
+    except ImportError:
+        raise ImportError(
+            "mysql-connector-python install karo: pip install mysql-connector-python"
+        )
+
+    MYSQL_CONFIG = {
+        "host": "localhost",        # AWS RDS ho to yahan endpoint doge
+        "user": "root",             # apna MySQL username
+        "password": "password123",  # apna password
+        "database": "contact_db",   # apna DB naam
+    }
+
+# ======================= CONNECTION POOL CONFIG ============================
+POOL_SIZE = 5                  # max open connections (MySQL par yahi TCP sockets hain)
+POOL_TIMEOUT = 10.0            # itne seconds tak free connection ka wait, fir error
+HEALTH_CHECK_INTERVAL = 30.0   # itni der idle raha connection use se pehle ping hoga
+STATEMENT_CACHE_SIZE = 256     # sqlite3 prepared statement cache (per connection)
+
+# ======================= CONCURRENCY CONFIG ============================
+BUSY_TIMEOUT_MS = 5000         # SQLite: lock mile tab tak itna wait (busy handler), fir "database is locked"
+WRITE_RETRIES = 5              # busy / lock wait / deadlock par write itni baar dobara
+RETRY_BASE_DELAY = 0.05        # pehla backoff (seconds), har retry par double + jitter
+RETRY_MAX_DELAY = 1.0
+MYSQL_RETRY_ERRNOS = (1205, 1213)  # lock wait timeout, deadlock
+
+
+def get_connection():
+    """DB backend ke hisaab se naya (raw) connection return karega.
+
+    App code ko ye seedha call nahi karna chahiye, get_pool().connection() use karo.
+    Instrumentation chalu ho to connection timed proxy me wrap hota hai.
+    """
+    if DB_BACKEND == "sqlite":
+        return instrumentation.connect_timed(connect_sqlite)
+    elif DB_BACKEND == "mysql":
+        return instrumentation.connect_timed(
+            lambda: mysql.connector.connect(**MYSQL_CONFIG), backend="mysql"
+        )
+    else:
+        raise ValueError("Invalid DB_BACKEND value")
+
+
+def connect_sqlite(path: str = None):
+    """SQLite connection: WAL (readers writers ko block nahi karte) + busy timeout.
+
+    Pool connections threads ke beech move ho sakte hain (ek time pe ek hi thread).
+    """
+    conn = sqlite3.connect(
+        path or SQLITE_DB_NAME,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.execute("PRAGMA journal_mode = WAL")
+    return conn
+
+
+PLACEHOLDER = "?" if DB_BACKEND == "sqlite" else "%s"
+
+
+def is_busy_error(exc) -> bool:
+    """Dobara try karne layak error: SQLite locked / busy, MySQL lock wait / deadlock."""
+    if isinstance(exc, sqlite3.OperationalError):
+        message = str(exc).lower()
+        return "locked" in message or "busy" in message
+    return getattr(exc, "errno", None) in MYSQL_RETRY_ERRNOS
+
+
+def run_with_retry(func, retries: int = WRITE_RETRIES):
+    """func() chalao; busy / deadlock par exponential backoff (jitter ke saath) se retry.
+
+    func poora transaction hona chahiye (fail hone par uska rollback ho chuka ho),
+    warna aadha kaam dobara ho jayega.
+    """
+    delay = RETRY_BASE_DELAY
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as exc:
+            if attempt == retries or not is_busy_error(exc):
+                raise
+        sleep = delay * (0.5 + random.random())
+        if instrumentation.ENABLED:
+            instrumentation.observe("db.busy_retry", sleep)
+        time.sleep(sleep)
+        delay = min(delay * 2, RETRY_MAX_DELAY)
+
+
+class PoolTimeout(Exception):
+    """POOL_TIMEOUT ke andar koi free connection nahi mila."""
+
+
+class ConnectionPool:
+    """Simple thread-safe connection pool.
+
+    - max `size` connections, uske baad acquire() wait karega
+    - idle connection HEALTH_CHECK_INTERVAL ke baad ping karke hi diya jata hai
+    - thread affinity: har thread ko pehle wahi connection milta hai jo usne
+      last time use kiya tha (SQLite statement cache warm rehta hai), aur same
+      thread ke nested acquire() ko wahi checked-out connection milta hai
+    - stats(): connections created, acquire count, total / max wait time
+    """
+
+    def __init__(
+        self,
+        factory,
+        size: int = POOL_SIZE,
+        timeout: float = POOL_TIMEOUT,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL,
+    ):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self.lock = threading.Condition()
+        self.idle = []          # [(conn, owner_thread_id, last_used)]
+        self.open_count = 0
+        self.local = threading.local()  # same-thread nesting: (conn, depth)
+        self.closed = False
+
+        self.connections_created = 0
+        self.acquire_count = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+        self.health_check_failures = 0
+
+    # ---------------- acquire / release ----------------
+
+    def acquire(self):
+        held = getattr(self.local, "held", None)
+        if held is not None:
+            conn, depth = held
+            self.local.held = (conn, depth + 1)
+            return conn
+
+        start = time.perf_counter()
+        thread_id = threading.get_ident()
+        conn = None
+        last_used = None
+        with self.lock:
+            while True:
+                if self.closed:
+                    raise PoolTimeout("Connection pool is closed")
+                if self.idle:
+                    # Is thread ka purana connection mile to wahi lo, warna sabse recent
+                    idx = len(self.idle) - 1
+                    for i in range(len(self.idle) - 1, -1, -1):
+                        if self.idle[i][1] == thread_id:
+                            idx = i
+                            break
+                    conn, _, last_used = self.idle.pop(idx)
+                    break
+                if self.open_count < self.size:
+                    self.open_count += 1
+                    break
+                remaining = self.timeout - (time.perf_counter() - start)
+                if remaining <= 0:
+                    raise PoolTimeout(f"No free DB connection after {self.timeout}s")
+                self.lock.wait(remaining)
+
+        try:
+            if conn is not None and time.monotonic() - last_used > self.health_check_interval:
+                if not self.is_healthy(conn):
+                    self.health_check_failures += 1
+                    self.close_quietly(conn)
+                    conn = None
+            if conn is None:
+                conn = self.factory()
+                with self.lock:
+                    self.connections_created += 1
+        except Exception:
+            with self.lock:
+                self.open_count -= 1
+                self.lock.notify()
+            raise
+
+        waited = time.perf_counter() - start
+        if instrumentation.ENABLED:
+            instrumentation.observe("pool.acquire", waited)
+        with self.lock:
+            self.acquire_count += 1
+            self.acquire_wait_total += waited
+            self.acquire_wait_max = max(self.acquire_wait_max, waited)
+
+        self.local.held = (conn, 1)
+        return conn
+
+    def release(self, conn, broken: bool = False):
+        held = getattr(self.local, "held", None)
+        if held is not None and held[0] is conn and held[1] > 1:
+            self.local.held = (conn, held[1] - 1)
+            return
+        self.local.held = None
+
+        if not broken:
+            try:
+                # Adhoori transaction agle user tak nahi jani chahiye
+                if getattr(conn, "in_transaction", False):
+                    conn.rollback()
+            except Exception:
+                broken = True
+
+        with self.lock:
+            if broken or self.closed:
+                self.open_count -= 1
+            else:
+                self.idle.append((conn, threading.get_ident(), time.monotonic()))
+            self.lock.notify()
+        if broken or self.closed:
+            self.close_quietly(conn)
+
+    def in_use_by_current_thread(self) -> bool:
+        """Is thread ne pehle se connection le rakha hai (nested with ke andar)?"""
+        return getattr(self.local, "held", None) is not None
+
+    @contextmanager
+    def connection(self):
+        """with get_pool().connection() as conn: ..."""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except Exception as exc:
+            broken = self.is_connection_error(exc)
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    # ---------------- helpers ----------------
+
+    @staticmethod
+    def is_healthy(conn) -> bool:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def is_connection_error(exc: Exception) -> bool:
+        """Sirf connection toot jane wale errors par connection discard karo."""
+        if isinstance(exc, sqlite3.ProgrammingError):
+            return True  # e.g. "Cannot operate on a closed database"
+        if DB_BACKEND == "mysql":
+            return isinstance(exc, mysql.connector.errors.OperationalError)
+        return False
+
+    @staticmethod
+    def close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self.lock:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.open_count -= len(idle)
+            self.lock.notify_all()
+        for conn, _, _ in idle:
+            self.close_quietly(conn)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "size": self.size,
+                "open": self.open_count,
+                "idle": len(self.idle),
+                "connections_created": self.connections_created,
+                "acquires": self.acquire_count,
+                "acquire_wait_total_ms": round(self.acquire_wait_total * 1000, 3),
+                "acquire_wait_max_ms": round(self.acquire_wait_max * 1000, 3),
+                "health_check_failures": self.health_check_failures,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Module-level shared pool (pehli baar use par banega)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(get_connection)
+        return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+# ======================= FULL-TEXT SEARCH (SQLite FTS5) ============================
+# member table ka ek shadow index. Triggers isko har INSERT / UPDATE / DELETE par
+# sync rakhte hain, chahe write GUI se ho ya ETL loader se.
+
+FTS_TABLE = "member_fts"
+FTS_TRIGGERS = ("member_fts_ai", "member_fts_ad", "member_fts_au")
+FTS_COLUMNS = ("firstname", "lastname", "address", "contact")
+# Search box sirf name / contact par search karta hai
+FTS_SEARCH_COLUMNS = ("firstname", "lastname", "contact")
+# Trigram tokenizer ko kam se kam 3 characters chahiye, usse chhote term LIKE se chalenge
+FTS_MIN_TERM_LENGTH = 3
+
+
+def fts_index_exists(conn: sqlite3.Connection) -> bool:
+    cursor = conn.cursor()
+    row = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone()
+    cursor.close()
+    return row is not None
+
+
+def create_fts_index(conn: sqlite3.Connection) -> bool:
+    """member_fts virtual table + sync triggers banao (agar nahi hain). Commit nahi karta,
+    taaki migration ki transaction ke andar chal sake.
+
+    True return karega agar FTS5 (trigram) is SQLite build me available hai.
+    """
+    cursor = conn.cursor()
+    if not fts_index_exists(conn):
+        cols = ", ".join(FTS_COLUMNS)
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"{cols}, content='member', content_rowid='mem_id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            # Purana SQLite (FTS5 / trigram nahi hai) -> LIKE fallback
+            cursor.close()
+            return False
+        # Pehle se pade data ko index me daalo
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    new_vals = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_vals = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    cols = ", ".join(FTS_COLUMNS)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS member_fts_ai AFTER INSERT ON member BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.mem_id, {new_vals});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS member_fts_ad AFTER DELETE ON member BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols})
+            VALUES ('delete', old.mem_id, {old_vals});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS member_fts_au AFTER UPDATE ON member BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols})
+            VALUES ('delete', old.mem_id, {old_vals});
+            INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.mem_id, {new_vals});
+        END
+    """)
+    cursor.close()
+    return True
+
+
+def ensure_fts_index(conn: sqlite3.Connection) -> bool:
+    """create_fts_index + commit."""
+    ok = create_fts_index(conn)
+    conn.commit()
+    return ok
+
+
+def fts_can_search(term: str) -> bool:
+    """Kya ye term FTS index se search ho sakta hai?"""
+    return len(term) >= FTS_MIN_TERM_LENGTH
+
+
+def fts_match_expr(term: str, columns=FTS_SEARCH_COLUMNS) -> str:
+    """Search term ko FTS5 MATCH expression me convert karo (substring search, sirf columns me)."""
+    phrase = term.replace('"', '""')
+    cols = " ".join(columns)
+    return f'{{{cols}}} : "{phrase}"'
@@ -0,0 +1,315 @@
+"""Local HTTP/JSON server over the contact store (asyncio, stdlib only).
+
+    python index.py --serve [--host 127.0.0.1] [--port 8080] [--shards DIR]
+
+Endpoints:
+    GET  /contacts?limit=&after=&q=   keyset paginated list (q = search term)
+    GET  /contacts/<mem_id>           ek contact
+    POST /contacts/bulk               JSON list of contacts, contact number par upsert
+    GET  /stats                       total / gender / age / city breakdown
+    GET  /metrics                     latency histograms + slow queries (--metrics ke saath)
+
+- HTTP/1.1 keep-alive, idle connection KEEPALIVE_TIMEOUT ke baad band
+- DB kaam ThreadPoolExecutor me (event loop kabhi block nahi hota)
+- MAX_CONCURRENT_REQUESTS se zyada requests ek saath DB tak nahi jate
+- GET responses par ETag = member table ka change counter; If-None-Match match
+  kare to 304 bina query chalaye
+"""
+import asyncio
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import instrumentation
+from contact_db import POOL_SIZE, close_pool
+from contact_service import DEFAULT_PAGE_SIZE, Contact, ContactRepository
+from normalize import MAX_AGE, MIN_AGE, normalize_contact
+
+# ======================= SERVER CONFIG ============================
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+DB_WORKERS = POOL_SIZE          # thread pool = connection pool size, koi thread wait nahi karega
+MAX_CONCURRENT_REQUESTS = 64    # isse zyada requests queue me wait karenge
+KEEPALIVE_TIMEOUT = 15.0        # idle keep-alive connection itne seconds baad band
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_PAGE_SIZE = 1000
+MAX_BULK_ITEMS = 10_000
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def encode_cursor(key) -> str:
+    """Keyset key -> opaque ?after= token."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        lastname, firstname, mem_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (lastname, firstname, int(mem_id))
+    except Exception:
+        raise HttpError(400, "invalid 'after' cursor")
+
+
+def contact_from_json(item) -> Contact:
+    """POST body ka ek item validate karke Contact banao."""
+    if not isinstance(item, dict):
+        raise HttpError(400, "each item must be a JSON object")
+    values = {}
+    for field in ("firstname", "lastname", "gender", "address", "contact"):
+        value = item.get(field, "")
+        if value is None:
+            value = ""
+        if not isinstance(value, str):
+            raise HttpError(400, f"'{field}' must be a string")
+        values[field] = value
+    age = item.get("age")
+    if isinstance(age, bool) or not isinstance(age, (int, str, type(None))):
+        raise HttpError(400, f"'age' must be an integer between {MIN_AGE} and {MAX_AGE}")
+
+    # Form / CSV import / ETL wale hi rules (normalize.py)
+    normalized, error = normalize_contact(
+        values["firstname"], values["lastname"], values["gender"],
+        age, values["address"], values["contact"],
+    )
+    if error:
+        raise HttpError(400, error)
+    return Contact(*normalized)
+
+
+class ContactServer:
+    def __init__(self, repo: ContactRepository, host: str = SERVER_HOST, port: int = SERVER_PORT):
+        self.repo = repo
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="contact-db")
+        self.limit = None  # asyncio.Semaphore, event loop ke andar banega
+
+    def prepare_db(self):
+        """Migrations. WAL + busy_timeout har SQLite connection par contact_db khud lagata hai."""
+        self.repo.init_schema()
+
+    async def db(self, func, *args):
+        loop = asyncio.get_running_loop()
+        async with self.limit:
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    # ============================ CONNECTION LOOP ============================
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), timeout=KEEPALIVE_TIMEOUT
+                    )
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 413, {"error": "headers too large"}, keep_alive=False)
+                    break
+
+                try:
+                    method, target, version, headers = self.parse_head(head)
+                    if "transfer-encoding" in headers:
+                        raise HttpError(400, "chunked request bodies are not supported")
+                    length = int(headers.get("content-length", "0") or 0)
+                    if length > MAX_BODY_BYTES:
+                        raise HttpError(413, "request body too large")
+                    body = await reader.readexactly(length) if length else b""
+                except HttpError as exc:
+                    await self.send(writer, exc.status, {"error": exc.message}, keep_alive=False)
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    await self.send(writer, 400, {"error": "malformed request"}, keep_alive=False)
+                    break
+
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.0":
+                    keep_alive = connection == "keep-alive"
+                else:
+                    keep_alive = connection != "close"
+                status, payload, extra = await self.dispatch(method, target, headers, body)
+                await self.send(writer, status, payload, keep_alive, extra)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def parse_head(head: bytes):
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "bad request line")
+        if not version.startswith("HTTP/1."):
+            raise HttpError(400, "unsupported HTTP version")
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, version, headers
+
+    async def send(self, writer, status: int, payload, keep_alive: bool = True, extra=None):
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode()
+        head = [
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+            f"Content-Length: {len(body)}",
+            "Connection: " + ("keep-alive" if keep_alive else "close"),
+        ]
+        if payload is not None:
+            head.append("Content-Type: application/json; charset=utf-8")
+        for name, value in (extra or {}).items():
+            head.append(f"{name}: {value}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    # ============================ ROUTING ============================
+
+    async def dispatch(self, method: str, target: str, headers: dict, body: bytes):
+        """(status, payload, extra headers) return karega."""
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if parts == ["contacts", "bulk"]:
+                if method != "POST":
+                    raise HttpError(405, "use POST")
+                return 200, await self.bulk_upsert(body), None
+
+            if method != "GET":
+                raise HttpError(405, "use GET")
+            if parts == ["metrics"]:
+                return 200, {
+                    "enabled": instrumentation.ENABLED,
+                    **instrumentation.snapshot(),
+                    **self.repo.pool_stats(),
+                }, None
+            if parts == ["contacts"]:
+                handler, args = self.repo_list, (query,)
+            elif len(parts) == 2 and parts[0] == "contacts" and parts[1].isdigit():
+                handler, args = self.repo_get, (int(parts[1]),)
+            elif parts == ["stats"]:
+                handler, args = self.repo_stats, ()
+            else:
+                raise HttpError(404, "not found")
+            return await self.cached_get(headers, handler, *args)
+        except HttpError as exc:
+            return exc.status, {"error": exc.message}, None
+        except Exception as exc:
+            return 500, {"error": str(exc)}, None
+
+    async def cached_get(self, headers: dict, handler, *args):
+        """ETag = change counter. Same counter -> data nahi badla -> 304.
+
+        Counter check aur query ek hi DB thread hop me (thread switch hi sabse mehenga hai).
+        """
+        if_none_match = headers.get("if-none-match", "")
+        return await self.db(self.conditional_get, if_none_match, handler, args)
+
+    def conditional_get(self, if_none_match: str, handler, args):
+        # Ek hi pooled connection: andar ke repo calls nested acquire se wahi paate hain
+        with self.repo.connection():
+            changes = self.repo.change_counter()
+            if changes is None:
+                return 200, handler(*args), None
+            etag = f'"c{changes}"'
+            if etag in (t.strip() for t in if_none_match.split(",")):
+                return 304, None, {"ETag": etag}
+            return 200, handler(*args), {"ETag": etag}
+
+    # ============================ HANDLERS (DB thread) ============================
+
+    def repo_list(self, query: dict) -> dict:
+        try:
+            limit = int(query.get("limit", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise HttpError(400, "'limit' must be an integer")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        after = decode_cursor(query["after"]) if query.get("after") else None
+        search = query.get("q", "").strip()
+
+        page = self.repo.fetch_page(search, after_key=after, limit=limit)
+        return {
+            "items": [c.to_dict() for c in page],
+            "next": encode_cursor(page[-1].key) if len(page) == limit else None,
+        }
+
+    def repo_get(self, mem_id: int) -> dict:
+        contact = self.repo.get(mem_id)
+        if contact is None:
+            raise HttpError(404, f"contact {mem_id} not found")
+        return contact.to_dict()
+
+    def repo_stats(self) -> dict:
+        return self.repo.stats()
+
+    async def bulk_upsert(self, body: bytes) -> dict:
+        try:
+            items = json.loads(body or b"null")
+        except ValueError:
+            raise HttpError(400, "body must be JSON")
+        if isinstance(items, dict):
+            items = items.get("contacts")
+        if not isinstance(items, list):
+            raise HttpError(400, "expected a JSON list of contacts")
+        if len(items) > MAX_BULK_ITEMS:
+            raise HttpError(413, f"at most {MAX_BULK_ITEMS} contacts per request")
+        contacts = [contact_from_json(item) for item in items]
+        inserted, updated = await self.db(self.repo.upsert_contacts, contacts)
+        return {"inserted": inserted, "updated": updated}
+
+    # ============================ RUN ============================
+
+    async def serve(self):
+        self.limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.prepare_db)
+        server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        print(f"[SERVE] Listening on http://{self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=True)
+            close_pool()
+
+
+def serve(host: str = SERVER_HOST, port: int = SERVER_PORT, repo=None):
+    """repo None = default backend (contact_db), warna e.g. ShardedContactRepository."""
+    ContactServer(repo if repo is not None else ContactRepository(), host, port).run()
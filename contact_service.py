@@ -0,0 +1,1231 @@
+"""UI-free contact service: Contact record + ContactRepository.
+
+Saara CRUD / query / import / export logic yahan hai. Tkinter app (index.py),
+ETL loader (etl_contacts.py) aur benchmarks sab isi ke upar chalte hain, isliye
+hot paths bina display ke profile / load-test ho sakte hain:
+
+    repo = ContactRepository()
+    repo.init_schema()
+    page = repo.fetch_page(search="sharma")
+"""
+import csv
+import functools
+import gzip
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from contact_db import (
+    DB_BACKEND,
+    fts_can_search,
+    fts_index_exists,
+    fts_match_expr,
+    get_pool,
+    run_with_retry,
+)
+from migrations import migrate, prune_change_log
+from normalize import normalize_contact, phone_prefixes
+
+CONTACT_COLUMNS = ("firstname", "lastname", "gender", "age", "address", "contact")
+SELECT_COLUMNS = "mem_id, " + ", ".join(CONTACT_COLUMNS) + ", version, updated_at"
+DEFAULT_PAGE_SIZE = 200
+MERGE_FILL_FIELDS = ("gender", "age", "address")  # merge me keep ke khali fields inse bharte hain
+
+# ======================= SORT / FILTER CONFIG ============================
+# Sort name -> ORDER BY columns (saare ek hi direction me, mem_id last = stable).
+# Har chain ke liye index hai (migration 4 / 10), isliye har page index seek hai.
+SORT_COLUMNS = {
+    "mem_id": ("mem_id",),
+    "firstname": ("firstname", "lastname", "mem_id"),
+    "lastname": ("lastname", "firstname", "mem_id"),
+    "gender": ("gender", "lastname", "firstname", "mem_id"),
+    "age": ("age", "mem_id"),
+    "address": ("address", "mem_id"),
+    "contact": ("contact", "mem_id"),
+}
+DEFAULT_SORT = "lastname"
+# Filter column ka index sirf in sorts ke saath (woh index khud sort order deta hai).
+# Baaki sorts me sort index walk karke filter lagta hai -- warna SQLite filter index
+# se lakhon rows utha ke temp B-tree me sort karta hai (gender=Female + age sort: ~1.5s).
+FILTER_INDEX_SORTS = {
+    "gender": ("gender", "lastname"),  # idx_member_gender (gender, lastname, firstname, mem_id)
+    "age": ("age",),
+}
+LIKE_ESCAPE = "!"  # address LIKE ka escape char ('\\' SQLite / MySQL me alag parse hota hai)
+
+# ======================= BULK EDIT / UNDO CONFIG ============================
+BULK_CHUNK_SIZE = 500        # ek DELETE / UPDATE ... IN (...) me itne mem_ids (SQLite variable limit se kaafi neeche)
+BULK_EDIT_COLUMNS = ("gender", "age", "address")  # bulk edit me ye columns set ho sakte hain
+UNDO_KEEP_BATCHES = 20       # undo journal me itne latest bulk operations rakhe jaate hain
+
+# ======================= CHANGE FEED CONFIG ============================
+CHANGE_LOG_KEEP = 50000   # member_changes me itne latest changes rakhe jaate hain
+
+# ======================= CSV IMPORT CONFIG ============================
+IMPORT_CHUNK_SIZE = 1000  # executemany me ek baar me kitne rows
+IMPORT_COLUMNS = list(CONTACT_COLUMNS)
+
+# ======================= EXPORT CONFIG ============================
+EXPORT_FETCH_SIZE = 5000  # fetchmany batch, memory me isse zyada rows nahi aate
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".gz": "csv.gz",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+# MySQL par member_stats table nahi hai, wahan live GROUP BY (cache ke saath)
+MYSQL_STATS_QUERIES = {
+    "gender": "SELECT COALESCE(gender, ''), COUNT(*) FROM member GROUP BY 1",
+    "age": (
+        "SELECT CASE WHEN age IS NULL THEN 'unknown' "
+        "ELSE CONCAT(FLOOR(age / 10) * 10, '-', FLOOR(age / 10) * 10 + 9) END, COUNT(*) "
+        "FROM member GROUP BY 1"
+    ),
+    "city": "SELECT COALESCE(TRIM(SUBSTRING_INDEX(address, ',', -1)), ''), COUNT(*) FROM member GROUP BY 1",
+}
+
+
+class OperationCancelled(Exception):
+    """User ne Cancel dabaya (import rollback ho jati hai, export ki adhuri file delete)."""
+
+
+class ConflictError(Exception):
+    """Optimistic concurrency: row kisi aur ne beech me badal diya. current = DB ka abhi wala row."""
+
+    def __init__(self, current: "Contact"):
+        super().__init__(
+            f"contact {current.mem_id} was changed by someone else "
+            f"(version {current.version}, updated {current.updated_at})"
+        )
+        self.current = current
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def retry_writes(method):
+    """Repository write: busy / lock / deadlock par poora transaction backoff ke saath dobara.
+
+    Sirf tab jab method apna connection khud le raha ho. Bahar ka transaction
+    (conn=... ya nested with repo.connection()) ho to retry caller ka kaam hai.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        pool = self.pool or get_pool()
+        if self.conn is not None or pool.in_use_by_current_thread():
+            return method(self, *args, **kwargs)
+        return run_with_retry(lambda: method(self, *args, **kwargs))
+    return wrapper
+
+
+@dataclass(slots=True)
+class Contact:
+    """member table ka ek row. mem_id None = abhi DB me insert nahi hua.
+
+    version: har update par +1 (optimistic concurrency), None = pata nahi / blind write.
+    updated_at: aakhri update ka UTC time, None = insert ke baad kabhi update nahi hua.
+    """
+
+    firstname: str
+    lastname: str
+    gender: str
+    age: Optional[int]
+    address: str
+    contact: str
+    mem_id: Optional[int] = None
+    version: Optional[int] = None
+    updated_at: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row) -> "Contact":
+        """(mem_id, firstname, lastname, gender, age, address, contact[, version, updated_at]) DB row se."""
+        return cls(*row[1:7], row[0], *row[7:9])
+
+    def as_row(self) -> tuple:
+        """Treeview / DB row layout: mem_id pehle."""
+        return (self.mem_id, self.firstname, self.lastname, self.gender,
+                self.age, self.address, self.contact)
+
+    def values(self) -> tuple:
+        """CONTACT_COLUMNS order me values (INSERT ke liye, mem_id ke bina)."""
+        return (self.firstname, self.lastname, self.gender,
+                self.age, self.address, self.contact)
+
+    def to_dict(self) -> dict:
+        """JSON ke liye (HTTP server)."""
+        return {
+            "mem_id": self.mem_id,
+            "firstname": self.firstname,
+            "lastname": self.lastname,
+            "gender": self.gender,
+            "age": self.age,
+            "address": self.address,
+            "contact": self.contact,
+            "version": self.version,
+            "updated_at": self.updated_at,
+        }
+
+    @property
+    def key(self) -> tuple:
+        """Keyset pagination key: (lastname, firstname, mem_id)."""
+        return (self.lastname, self.firstname, self.mem_id)
+
+    def key_for(self, sort: str = DEFAULT_SORT) -> tuple:
+        """Kisi bhi sort ka keyset key (SORT_COLUMNS[sort] ki values)."""
+        return tuple(getattr(self, column) for column in SORT_COLUMNS[sort])
+
+
+@dataclass(frozen=True)
+class ContactFilter:
+    """Filter bar ke structured filters. Khali / None field = woh filter nahi lagega.
+
+    gender: exact (Male / Female / Other), age_min / age_max: inclusive range,
+    address: substring, contact_prefix: number ka shuru ka hissa (normalize.phone_prefixes).
+    """
+
+    gender: str = ""
+    age_min: Optional[int] = None
+    age_max: Optional[int] = None
+    address: str = ""
+    contact_prefix: str = ""
+
+    def __bool__(self) -> bool:
+        return bool(self.gender or self.age_min is not None or self.age_max is not None
+                    or self.address or self.contact_prefix)
+
+
+def keyset_segments(columns, key, greater: bool, ph: str) -> list:
+    """Keyset condition ko index-seekable row-value ranges me todo: [(sql, params)], order me.
+
+    SQLite / MySQL dono me NULL ASC me sabse pehle aata hai. Row value comparison NULL
+    ko chhod deta hai, isliye pehle column ka NULL block alag segment hai (baaki columns
+    names / mem_id, unka NULL pehle jaisa hi ignore).
+    greater=True: key ke baad (ASC), False: key se pehle (DESC me chalte hue).
+    """
+    first, rest = columns[0], columns[1:]
+
+    def row_cmp(cols, op):
+        return f"({', '.join(cols)}) {op} ({', '.join([ph] * len(cols))})"
+
+    op = ">" if greater else "<"
+    segments = []
+    if key[0] is None:
+        if rest:
+            segments.append((f"{first} IS NULL AND {row_cmp(rest, op)}", tuple(key[1:])))
+        if greater:
+            segments.append((f"{first} IS NOT NULL", ()))
+    else:
+        segments.append((row_cmp(columns, op), tuple(key)))
+        if not greater and first != "mem_id":
+            segments.append((f"{first} IS NULL", ()))
+    return segments
+
+
+def sort_key(key):
+    """Keyset key ko SQL ORDER BY jaisa comparable banao (NULL sabse pehle).
+
+    keyset_segments wala hi order -- shard merge aur GUI ka bisect dono isi se.
+    """
+    return tuple((value is not None, "" if value is None else value) for value in key)
+
+
+class ContactRepository:
+    """member table ka headless service layer.
+
+    - default me shared pool (get_pool()) se connections leta hai
+    - conn=... diya ho to wahi ek connection use hoga (ETL bulk load, bina commit)
+    - stats() cache 'changes' counter se validate hota hai (SQLite), writes par reset
+    """
+
+    def __init__(self, backend: str = DB_BACKEND, pool=None, conn=None):
+        self.backend = backend
+        self.pool = pool
+        self.conn = conn
+        self.placeholder = "?" if backend == "sqlite" else "%s"
+        self.fts_enabled = False  # init_schema me set hoga (sirf SQLite)
+        self.stats_cache = None   # (changes counter, stats dict)
+
+    @contextmanager
+    def connection(self):
+        if self.conn is not None:
+            yield self.conn
+            return
+        with (self.pool or get_pool()).connection() as conn:
+            yield conn
+
+    def pool_stats(self) -> dict:
+        """Is repo ke connection pool ke stats (server /metrics)."""
+        return {"pool": (self.pool or get_pool()).stats()}
+
+    def init_schema(self):
+        """Schema migrations chalao (table, indexes, FTS ...), idempotent hai."""
+        with self.connection() as conn:
+            migrate(conn, self.backend)
+
+            # SQLite par search ke liye FTS5 shadow index, MySQL LIKE path hi use karega
+            if self.backend == "sqlite":
+                self.fts_enabled = fts_index_exists(conn)
+
+    # ============================ QUERIES ============================
+
+    def build_search_filter(self, search: str):
+        """Search term ke liye WHERE clause ka part + params return karega."""
+        if not search:
+            return "", ()
+        ph = self.placeholder
+        if self.fts_enabled and fts_can_search(search):
+            return (
+                f"mem_id IN (SELECT rowid FROM member_fts WHERE member_fts MATCH {ph})",
+                (fts_match_expr(search),),
+            )
+        # MySQL backend ya bahut chhota term -> purana LIKE path
+        like = f"%{search}%"
+        return (
+            f"(firstname LIKE {ph} OR lastname LIKE {ph} OR contact LIKE {ph})",
+            (like, like, like),
+        )
+
+    def filter_column(self, column: str, sort) -> str:
+        """SQLite: '+column' = is condition ke liye index mat lo (FILTER_INDEX_SORTS).
+
+        MySQL me unary + string ko number bana deta hai, aur uska planner LIMIT ke saath
+        khud sort index choose karta hai, isliye wahan column jaisa hai.
+        """
+        if sort is None or self.backend != "sqlite" or sort in FILTER_INDEX_SORTS[column]:
+            return column
+        return "+" + column
+
+    def build_filter(self, filters: Optional[ContactFilter], sort=None):
+        """Structured filters -> (WHERE conditions list, params list), sab parameterized.
+
+        sort: jis order me page chahiye (None = count / lookup, koi order nahi).
+        """
+        conditions = []
+        params = []
+        if not filters:
+            return conditions, params
+        ph = self.placeholder
+        if filters.gender:
+            conditions.append(f"{self.filter_column('gender', sort)} = {ph}")
+            params.append(filters.gender)
+        age = self.filter_column("age", sort)
+        if filters.age_min is not None:
+            conditions.append(f"{age} >= {ph}")
+            params.append(filters.age_min)
+        if filters.age_max is not None:
+            conditions.append(f"{age} <= {ph}")
+            params.append(filters.age_max)
+        address = filters.address.strip()
+        if address:
+            if self.fts_enabled and fts_can_search(address):
+                conditions.append(f"mem_id IN (SELECT rowid FROM member_fts WHERE member_fts MATCH {ph})")
+                params.append(fts_match_expr(address, ("address",)))
+            else:
+                escaped = "".join(
+                    LIKE_ESCAPE + ch if ch in (LIKE_ESCAPE, "%", "_") else ch for ch in address
+                )
+                conditions.append(f"address LIKE {ph} ESCAPE '{LIKE_ESCAPE}'")
+                params.append(f"%{escaped}%")
+        if filters.contact_prefix:
+            prefixes = phone_prefixes(filters.contact_prefix)
+            if prefixes is None:
+                raise ValueError(f"Invalid contact prefix: {filters.contact_prefix!r}")
+            # LIKE 'x%' ki jagah range: dono backends par idx_member_contact ka seek
+            ranges = []
+            for prefix in prefixes:
+                ranges.append(f"(contact >= {ph} AND contact < {ph})")
+                params.extend((prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)))
+            conditions.append("(" + " OR ".join(ranges) + ")")
+        return conditions, params
+
+    def build_where(self, search: str = "", filters: Optional[ContactFilter] = None, sort=None):
+        """Search + filters -> (" WHERE ..." ya "", params)."""
+        conditions, params = self.build_filter(filters, sort)
+        search_sql, search_params = self.build_search_filter(search)
+        if search_sql:
+            conditions.insert(0, search_sql)
+            params[:0] = search_params
+        if not conditions:
+            return "", ()
+        return " WHERE " + " AND ".join(conditions), tuple(params)
+
+    def fetch_page(self, search: str = "", after_key=None, before_key=None,
+                   limit: int = DEFAULT_PAGE_SIZE, sort: str = DEFAULT_SORT,
+                   descending: bool = False, filters: Optional[ContactFilter] = None) -> list:
+        """Keyset pagination, SORT_COLUMNS[sort] order me -- har page ek index seek.
+
+        after_key  -> us key ke baad wale rows (neeche scroll)
+        before_key -> us key se pehle wale rows (upar scroll), result display order me hi milega
+        Keys Contact.key_for(sort) hain. Return: [Contact]
+        """
+        columns = SORT_COLUMNS[sort]
+        where_sql, params = self.build_where(search, filters, sort)
+        key = after_key if after_key is not None else before_key
+        forward = before_key is None or after_key is not None
+        ascending = forward != descending
+        if key is None:
+            segments = [("", ())]
+        else:
+            segments = keyset_segments(columns, key, ascending, self.placeholder)
+        order = "ASC" if ascending else "DESC"
+        order_sql = ", ".join(f"{column} {order}" for column in columns)
+
+        rows = []
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            # Segments order me hain: pehla page bhar de to baaki queries nahi chalti
+            for segment_sql, segment_params in segments:
+                query = f"SELECT {SELECT_COLUMNS} FROM member{where_sql}"
+                if segment_sql:
+                    query += (" AND " if where_sql else " WHERE ") + segment_sql
+                query += f" ORDER BY {order_sql} LIMIT {int(limit) - len(rows)}"
+                cursor.execute(query, params + segment_params)
+                rows.extend(cursor.fetchall())
+                if len(rows) >= limit:
+                    break
+            cursor.close()
+
+        if not forward:
+            rows.reverse()
+        return [Contact.from_row(row) for row in rows]
+
+    def search(self, term: str, limit: int = DEFAULT_PAGE_SIZE) -> list:
+        """Search term ka pehla page."""
+        return self.fetch_page(search=term.strip(), limit=limit)
+
+    def iter_contacts(self, search: str = "", batch_size: int = DEFAULT_PAGE_SIZE,
+                      sort: str = DEFAULT_SORT, descending: bool = False, filters=None):
+        """Saare (ya search / filters se match hone wale) contacts sorted order me, page by page."""
+        after_key = None
+        while True:
+            page = self.fetch_page(search=search, after_key=after_key, limit=batch_size,
+                                   sort=sort, descending=descending, filters=filters)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after_key = page[-1].key_for(sort)
+
+    def count(self, search: str = "", filters: Optional[ContactFilter] = None) -> int:
+        if not search and not filters and self.backend == "sqlite":
+            # Poora table count karne ki zaroorat nahi, member_stats me ready hai
+            return self.stats()["total"]
+
+        where_sql, params = self.build_where(search, filters)
+        query = "SELECT COUNT(*) FROM member" + where_sql
+
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            cursor.close()
+        return row[0] if row else 0
+
+    def get(self, mem_id: int) -> Optional[Contact]:
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {SELECT_COLUMNS} FROM member WHERE mem_id = {self.placeholder}",
+                (mem_id,),
+            )
+            row = cursor.fetchone()
+            cursor.close()
+        return Contact.from_row(row) if row else None
+
+    def get_many(self, mem_ids, search: str = "", filters: Optional[ContactFilter] = None) -> list:
+        """In mem_ids me se jo rows abhi hain (aur search / filters se match karte hain), unsorted."""
+        mem_ids = list(mem_ids)
+        if not mem_ids:
+            return []
+        ph = self.placeholder
+        where_sql, params = self.build_where(search, filters)
+        query = f"SELECT {SELECT_COLUMNS} FROM member WHERE mem_id IN ({', '.join([ph] * len(mem_ids))})"
+        if where_sql:
+            query += " AND " + where_sql[len(" WHERE "):]
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (*mem_ids, *params))
+            rows = cursor.fetchall()
+            cursor.close()
+        return [Contact.from_row(row) for row in rows]
+
+    # ============================ WRITES ============================
+
+    def _insert_sql(self, extra_columns=()) -> str:
+        columns = (*CONTACT_COLUMNS, *extra_columns)
+        marks = ", ".join([self.placeholder] * len(columns))
+        return f"INSERT INTO member ({', '.join(columns)}) VALUES ({marks})"
+
+    @retry_writes
+    def insert(self, contact: Contact, commit: bool = True) -> int:
+        """Naya contact insert karo, naya mem_id return (contact.mem_id bhi set hota hai).
+
+        commit=False -> transaction caller sambhalega (WriteQueue group commit).
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._insert_sql(), contact.values())
+            contact.mem_id = cursor.lastrowid
+            contact.version = 1
+            if commit:
+                conn.commit()
+            cursor.close()
+        self.stats_cache = None
+        return contact.mem_id
+
+    @retry_writes
+    def update(self, contact: Contact, commit: bool = True) -> bool:
+        """contact.mem_id wale row ko update karo. False = row mila hi nahi (delete ho chuka).
+
+        contact.version set ho to compare-and-swap: DB ka version alag mila (kisi aur ne
+        beech me edit kiya) to ConflictError. version None = blind update.
+        Success par contact.version / updated_at naye values par aa jaate hain.
+        """
+        ph = self.placeholder
+        now = utc_now()
+        sets = ", ".join(f"{col} = {ph}" for col in CONTACT_COLUMNS)
+        query = f"UPDATE member SET {sets}, version = version + 1, updated_at = {ph} WHERE mem_id = {ph}"
+        params = (*contact.values(), now, contact.mem_id)
+        if contact.version is not None:
+            query += f" AND version = {ph}"
+            params += (contact.version,)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            found = cursor.rowcount > 0
+            if commit:
+                conn.commit()
+            cursor.close()
+            if not found and contact.version is not None:
+                current = self.get(contact.mem_id)
+                if current is not None:
+                    raise ConflictError(current)
+        self.stats_cache = None
+        if found:
+            contact.version = None if contact.version is None else contact.version + 1
+            contact.updated_at = now
+        return found
+
+    @retry_writes
+    def delete(self, mem_id: int, version: Optional[int] = None, commit: bool = True) -> bool:
+        """Row delete karo. version diya ho to sirf tab jab DB me wahi version ho, warna ConflictError."""
+        ph = self.placeholder
+        query = f"DELETE FROM member WHERE mem_id = {ph}"
+        params = (mem_id,)
+        if version is not None:
+            query += f" AND version = {ph}"
+            params += (version,)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            found = cursor.rowcount > 0
+            if commit:
+                conn.commit()
+            cursor.close()
+            if not found and version is not None:
+                current = self.get(mem_id)
+                if current is not None:
+                    raise ConflictError(current)
+        self.stats_cache = None
+        return found
+
+    def bulk_insert(self, rows, commit: bool = True) -> int:
+        """Bahut saare rows ek executemany me (Contact ya CONTACT_COLUMNS order ke tuples).
+
+        rows generator bhi ho sakta hai, poori list nahi banti.
+        commit=False -> transaction caller sambhalega (ETL batches).
+        """
+        rows = (r.values() if isinstance(r, Contact) else r for r in rows)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._insert_sql(), rows)
+            count = cursor.rowcount
+            if commit:
+                conn.commit()
+            cursor.close()
+        self.stats_cache = None
+        return count
+
+    def bulk_upsert(self, rows, hash_column=None, commit: bool = True) -> int:
+        """contact number par upsert: naya contact insert, purana update.
+
+        hash_column diya ho to rows me last value us column ki hai, aur update sirf
+        tab hota hai jab hash badla ho (unchanged rows touch hi nahi hote).
+        Return: kitne rows sach me insert / update hue (UNIQUE index on contact chahiye).
+        """
+        extra = (hash_column,) if hash_column else ()
+        update_cols = [c for c in CONTACT_COLUMNS if c != "contact"] + list(extra)
+        rows = (r.values() if isinstance(r, Contact) else r for r in rows)
+        # Har row ke params me extra column na ho isliye timestamp literal (utc_now ka
+        # fixed format, user input nahi); poore batch ka ek hi updated_at
+        bump = f"version = version + 1, updated_at = '{utc_now()}'"
+        if self.backend == "sqlite":
+            sets = ",\n                ".join(
+                [f"{c} = excluded.{c}" for c in update_cols] + [bump.replace("version +", "member.version +")]
+            )
+            query = f"""
+                {self._insert_sql(extra)}
+                ON CONFLICT(contact) DO UPDATE SET
+                {sets}
+            """
+            if hash_column:
+                query += f" WHERE member.{hash_column} IS NOT excluded.{hash_column}"
+        else:
+            sets = ", ".join([f"{c} = VALUES({c})" for c in update_cols] + [bump])
+            query = f"{self._insert_sql(extra)} ON DUPLICATE KEY UPDATE {sets}"
+
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(query, rows)
+            count = cursor.rowcount
+            if commit:
+                conn.commit()
+            cursor.close()
+        self.stats_cache = None
+        return count
+
+    @retry_writes
+    def upsert_contacts(self, contacts) -> tuple:
+        """contact number par upsert, ek transaction me. Return (inserted, updated).
+
+        UPDATE ... WHERE contact = ? (idx_member_contact), row na mile to INSERT.
+        contacts list hona chahiye (busy retry par transaction dobara chalta hai).
+        bulk_upsert ke ulat isko UNIQUE(contact) index ki zaroorat nahi.
+        """
+        ph = self.placeholder
+        sets = ", ".join(f"{col} = {ph}" for col in CONTACT_COLUMNS if col != "contact")
+        update_sql = f"UPDATE member SET {sets}, version = version + 1, updated_at = {ph} WHERE contact = {ph}"
+        insert_sql = self._insert_sql()
+        now = utc_now()
+        inserted = updated = 0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for contact in contacts:
+                    values = contact.values()
+                    cursor.execute(update_sql, values[:-1] + (now, contact.contact))
+                    if cursor.rowcount > 0:
+                        updated += 1
+                    else:
+                        cursor.execute(insert_sql, values)
+                        inserted += 1
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                self.stats_cache = None
+        return inserted, updated
+
+    @retry_writes
+    def merge(self, keep_id: int, drop_ids, commit: bool = True) -> int:
+        """Duplicates merge: drop_ids ke contacts keep_id me mila ke delete.
+
+        keep ke khali fields (MERGE_FILL_FIELDS) drop rows ki values se bharte hain,
+        naam / contact keep ke hi rehte hain. Ek transaction. Deleted rows return.
+        """
+        drop_ids = [mem_id for mem_id in drop_ids if mem_id != keep_id]
+        ph = self.placeholder
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                ids = [keep_id, *drop_ids]
+                cursor.execute(
+                    f"SELECT {SELECT_COLUMNS} FROM member WHERE mem_id IN ({', '.join([ph] * len(ids))})",
+                    ids,
+                )
+                found = {contact.mem_id: contact for contact in map(Contact.from_row, cursor.fetchall())}
+                keep = found.get(keep_id)
+                if keep is None:
+                    raise ValueError(f"contact {keep_id} not found")
+                for mem_id in drop_ids:
+                    other = found.get(mem_id)
+                    if other is None:
+                        continue
+                    for field in MERGE_FILL_FIELDS:
+                        if getattr(keep, field) in (None, "") and getattr(other, field) not in (None, ""):
+                            setattr(keep, field, getattr(other, field))
+
+                sets = ", ".join(f"{col} = {ph}" for col in CONTACT_COLUMNS)
+                cursor.execute(
+                    f"UPDATE member SET {sets}, version = version + 1, updated_at = {ph} WHERE mem_id = {ph}",
+                    (*keep.values(), utc_now(), keep_id),
+                )
+                deleted = 0
+                if drop_ids:
+                    cursor.execute(
+                        f"DELETE FROM member WHERE mem_id IN ({', '.join([ph] * len(drop_ids))})",
+                        drop_ids,
+                    )
+                    deleted = cursor.rowcount
+                if commit:
+                    conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                self.stats_cache = None
+        return deleted
+
+    # ============================ BULK EDIT / UNDO ============================
+
+    def matching_ids(self, search: str = "", filters: Optional[ContactFilter] = None) -> list:
+        """Search / filters se match hone wale saare mem_ids (bulk edit "all matching" ke liye)."""
+        where_sql, params = self.build_where(search, filters)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT mem_id FROM member" + where_sql, params)
+            ids = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+        return ids
+
+    @retry_writes
+    def bulk_delete(self, mem_ids, description: str = "", progress=None, cancel_event=None) -> dict:
+        """mem_ids delete karo: ek transaction, BULK_CHUNK_SIZE ka ek DELETE ... IN (...) per chunk.
+
+        Har row pehle member_undo me copy hoti hai (undo_batch se wapas). Blind delete,
+        version check nahi -- journal hi safety net hai.
+        progress(fraction, rows); cancel_event set -> rollback + OperationCancelled.
+        Return: {"batch_id", "rows"}
+        """
+        def apply(cursor, ids, marks):
+            cursor.execute(f"DELETE FROM member WHERE mem_id IN ({marks})", ids)
+            return cursor.rowcount
+
+        return self._bulk("delete", mem_ids, description, apply, progress, cancel_event)
+
+    @retry_writes
+    def bulk_update(self, mem_ids, changes: dict, description: str = "",
+                    progress=None, cancel_event=None) -> dict:
+        """mem_ids par same values set karo (e.g. {"gender": "Female"}), bulk_delete jaisa hi.
+
+        changes ke columns BULK_EDIT_COLUMNS me hone chahiye, values already normalized.
+        Har row ka version +1 (doosre editors ko conflict milega). Return: {"batch_id", "rows"}
+        """
+        unknown = set(changes) - set(BULK_EDIT_COLUMNS)
+        if not changes or unknown:
+            raise ValueError(f"Bulk edit columns must be from {BULK_EDIT_COLUMNS}, got {sorted(changes)}")
+        ph = self.placeholder
+        columns = [col for col in BULK_EDIT_COLUMNS if col in changes]
+        sets = ", ".join(f"{col} = {ph}" for col in columns)
+        values = [changes[col] for col in columns]
+        now = utc_now()
+
+        def apply(cursor, ids, marks):
+            cursor.execute(
+                f"UPDATE member SET {sets}, version = version + 1, updated_at = {ph} WHERE mem_id IN ({marks})",
+                (*values, now, *ids),
+            )
+            return cursor.rowcount
+
+        return self._bulk("update", mem_ids, description, apply, progress, cancel_event)
+
+    def _bulk(self, action: str, mem_ids, description, apply, progress, cancel_event) -> dict:
+        mem_ids = list(dict.fromkeys(mem_ids))
+        ph = self.placeholder
+        journal_cols = "mem_id, " + ", ".join(CONTACT_COLUMNS) + ", version, updated_at"
+        done = 0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    f"INSERT INTO undo_batches (action, description, created_at) VALUES ({ph}, {ph}, {ph})",
+                    (action, description[:255], utc_now()),
+                )
+                batch_id = cursor.lastrowid
+                cursor.execute(f"DELETE FROM member_undo WHERE batch_id <= {ph}", (batch_id - UNDO_KEEP_BATCHES,))
+                cursor.execute(f"DELETE FROM undo_batches WHERE batch_id <= {ph}", (batch_id - UNDO_KEEP_BATCHES,))
+                for start in range(0, len(mem_ids), BULK_CHUNK_SIZE):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled()
+                    ids = mem_ids[start:start + BULK_CHUNK_SIZE]
+                    marks = ", ".join([ph] * len(ids))
+                    # Pehle journal (purani values), phir asli change -- dono ek hi statement per chunk
+                    cursor.execute(
+                        f"INSERT INTO member_undo (batch_id, {journal_cols}) "
+                        f"SELECT {ph}, {journal_cols} FROM member WHERE mem_id IN ({marks})",
+                        (batch_id, *ids),
+                    )
+                    done += apply(cursor, ids, marks)
+                    if progress is not None:
+                        progress(min((start + len(ids)) / len(mem_ids), 1.0), done)
+                cursor.execute(
+                    f"UPDATE undo_batches SET row_count = {ph} WHERE batch_id = {ph}", (done, batch_id)
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                self.stats_cache = None
+        return {"batch_id": batch_id, "rows": done}
+
+    def last_undo_batch(self) -> Optional[dict]:
+        """Sabse naya bulk operation jo abhi undo nahi hua, ya None."""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT batch_id, action, description, row_count, created_at FROM undo_batches "
+                "WHERE undone_at IS NULL ORDER BY batch_id DESC LIMIT 1"
+            )
+            row = cursor.fetchone()
+            cursor.close()
+        if row is None:
+            return None
+        return dict(zip(("batch_id", "action", "description", "row_count", "created_at"), row))
+
+    @retry_writes
+    def undo_batch(self, batch_id: int, progress=None) -> dict:
+        """Bulk operation wapas: deleted rows apne purane mem_id ke saath wapas, edited rows
+        purani values par -- sirf jo bulk edit ke baad kisi ne nahi badle (version check).
+
+        Return: {"restored", "skipped"}. skipped = baad me edit / delete hue rows, ya
+        jinka contact number ab kisi aur ke paas hai.
+        """
+        ph = self.placeholder
+        now = utc_now()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    f"SELECT action, undone_at FROM undo_batches WHERE batch_id = {ph}", (batch_id,)
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    raise ValueError(f"Undo batch {batch_id} not found (journal keeps {UNDO_KEEP_BATCHES})")
+                action, undone_at = row
+                if undone_at is not None:
+                    raise ValueError(f"Undo batch {batch_id} was already undone at {undone_at}")
+                cursor.execute(f"SELECT COUNT(*) FROM member_undo WHERE batch_id = {ph}", (batch_id,))
+                total = cursor.fetchone()[0]
+
+                cols = ", ".join(CONTACT_COLUMNS)
+                if action == "delete":
+                    ignore = "INSERT OR IGNORE" if self.backend == "sqlite" else "INSERT IGNORE"
+                    # Row bilkul wahi version hai jo delete se pehle tha, isliye version bhi wahi
+                    # (isse pehle ke bulk edit ka undo bhi in rows par chal sakta hai)
+                    cursor.execute(
+                        f"{ignore} INTO member (mem_id, {cols}, version, updated_at) "
+                        f"SELECT mem_id, {cols}, version, updated_at FROM member_undo WHERE batch_id = {ph}",
+                        (batch_id,),
+                    )
+                    restored = cursor.rowcount
+                else:
+                    sets = ", ".join(f"{col} = {ph}" for col in CONTACT_COLUMNS)
+                    query = (
+                        f"UPDATE member SET {sets}, version = version + 1, updated_at = {ph} "
+                        f"WHERE mem_id = {ph} AND version = {ph}"
+                    )
+                    cursor.execute(
+                        f"SELECT mem_id, {cols}, version FROM member_undo WHERE batch_id = {ph}", (batch_id,)
+                    )
+                    journal = cursor.fetchall()
+                    restored = 0
+                    for start in range(0, len(journal), BULK_CHUNK_SIZE):
+                        chunk = journal[start:start + BULK_CHUNK_SIZE]
+                        # Bulk edit ne version +1 kiya tha; usse aage gaya = kisi ne baad me edit kiya
+                        cursor.executemany(
+                            query, [(*r[1:7], now, r[0], r[7] + 1) for r in chunk]
+                        )
+                        restored += cursor.rowcount
+                        if progress is not None:
+                            progress(min((start + len(chunk)) / len(journal), 1.0), restored)
+                cursor.execute(
+                    f"UPDATE undo_batches SET undone_at = {ph} WHERE batch_id = {ph}", (now, batch_id)
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                self.stats_cache = None
+        return {"restored": restored, "skipped": total - restored}
+
+    # ============================ CHANGE FEED ============================
+
+    def last_change_seq(self) -> Optional[int]:
+        """member_changes ka latest seq (0 = abhi koi change nahi). MySQL par None (feed nahi)."""
+        if self.backend != "sqlite":
+            return None
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(seq) FROM member_changes")
+            row = cursor.fetchone()
+            cursor.close()
+        return row[0] or 0
+
+    def changes_since(self, seq: int, limit: int) -> Optional[list]:
+        """seq ke baad ke changes [(seq, op, mem_id)], purane se naye. Primary key range scan.
+
+        None = feed se catch-up nahi ho sakta (beech ke changes prune ho gaye ya
+        MySQL) -> caller poora reload kare.
+        """
+        if self.backend != "sqlite":
+            return None
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT seq, op, mem_id FROM member_changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, int(limit)),
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        # seq me gap sirf prune se aata hai (rollback hone par AUTOINCREMENT bhi wapas)
+        if rows and rows[0][0] != seq + 1:
+            return None
+        return rows
+
+    def prune_changes(self, keep: int = CHANGE_LOG_KEEP) -> int:
+        if self.backend != "sqlite":
+            return 0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            deleted = prune_change_log(cursor, keep)
+            conn.commit()
+            cursor.close()
+        return deleted
+
+    # ============================ STATISTICS ============================
+
+    def change_counter(self):
+        """member table ka write counter (member_stats 'changes'), MySQL par None.
+
+        Har INSERT / UPDATE / DELETE par badhta hai -> cache / ETag validation ke liye.
+        """
+        if self.backend != "sqlite":
+            return None
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            row = cursor.execute(
+                "SELECT n FROM member_stats WHERE stat = 'changes' AND bucket = ''"
+            ).fetchone()
+            cursor.close()
+        return row[0] if row else 0
+
+    def stats(self) -> dict:
+        """{"total", "gender", "age", "city"} -- har breakdown [(bucket, count)] hai.
+
+        SQLite: member_stats table (triggers se maintained) -> sirf chhoti si read.
+        Cache 'changes' counter se validate hota hai, to ETL / dusre process ke
+        writes bhi pakde jate hain. MySQL: live GROUP BY, cache sirf apne writes par reset.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            if self.backend == "sqlite":
+                changes = self.change_counter()
+                if self.stats_cache is not None and self.stats_cache[0] == changes:
+                    cursor.close()
+                    return self.stats_cache[1]
+                rows = cursor.execute(
+                    "SELECT stat, bucket, n FROM member_stats WHERE n > 0 ORDER BY stat, n DESC, bucket"
+                ).fetchall()
+            else:
+                if self.stats_cache is not None:
+                    cursor.close()
+                    return self.stats_cache[1]
+                changes = None
+                cursor.execute("SELECT COUNT(*) FROM member")
+                rows = [("total", "", cursor.fetchone()[0])]
+                for stat, query in MYSQL_STATS_QUERIES.items():
+                    cursor.execute(query)
+                    rows += sorted(
+                        ((stat, bucket, n) for bucket, n in cursor.fetchall()),
+                        key=lambda r: (-r[2], r[1]),
+                    )
+            cursor.close()
+
+        stats = {"total": 0, "gender": [], "age": [], "city": []}
+        for stat, bucket, n in rows:
+            if stat == "total":
+                stats["total"] = n
+            elif stat in stats:
+                stats[stat].append((bucket, n))
+        stats["age"].sort(key=lambda r: (r[0] == "unknown", len(r[0]), r[0]))
+        self.stats_cache = (changes, stats)
+        return stats
+
+    # ============================ CSV IMPORT ============================
+
+    def import_csv(
+        self,
+        path: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        reject_path=None,
+        progress=None,
+        cancel_event=None,
+    ) -> dict:
+        """CSV se contacts import karo (kisi bhi thread se chal sakta hai).
+
+        - header ek hi baar resolve hota hai (case-insensitive column -> index)
+        - rows chunk_size ke batches me executemany se, poori import ek transaction me
+        - skip hue rows reason ke saath reject_path CSV me likhe jate hain
+        - progress(fraction, inserted, rejected) har batch ke baad call hota hai
+        - cancel_event set ho to OperationCancelled raise + rollback
+
+        Return: {"inserted": n, "rejected": n, "reject_path": path ya None}
+        """
+        if reject_path is None:
+            reject_path = str(Path(path).with_suffix("")) + ".rejects.csv"
+        total_size = max(Path(path).stat().st_size, 1)
+        query = self._insert_sql()
+
+        inserted = 0
+        rejected = 0
+        reject_file = None
+        reject_writer = None
+        header = None
+
+        def reject(raw_row, reason):
+            nonlocal rejected, reject_file, reject_writer
+            rejected += 1
+            if reject_writer is None:
+                reject_file = open(reject_path, "w", newline="", encoding="utf-8")
+                reject_writer = csv.writer(reject_file)
+                reject_writer.writerow([*header, "reject_reason"])
+            reject_writer.writerow([*raw_row, reason])
+
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            chars_read = 0
+
+            def counted_lines():
+                nonlocal chars_read
+                for line in f:
+                    chars_read += len(line)
+                    yield line
+
+            reader = csv.reader(counted_lines())
+            header = next(reader, None)
+            if not header:
+                raise ValueError("CSV file is empty or invalid.")
+
+            # Header resolution ek hi baar: column naam -> position
+            positions = {}
+            for i, name in enumerate(header):
+                positions.setdefault(name.strip().lower(), i)
+            if not all(col in positions for col in IMPORT_COLUMNS):
+                raise ValueError(
+                    "CSV must contain columns: firstname, lastname, gender, age, address, contact"
+                )
+            col_idx = [positions[col] for col in IMPORT_COLUMNS]
+
+            try:
+                with self.connection() as conn:
+                    cursor = conn.cursor()
+                    try:
+                        if self.backend == "sqlite" and not conn.in_transaction:
+                            # Explicit BEGIN: warna sqlite3 me har batch ka SAVEPOINT apni
+                            # transaction banata aur RELEASE usko commit kar deta
+                            cursor.execute("BEGIN")
+                        batch = []
+                        raw_batch = []
+                        for raw_row in reader:
+                            # Wahi rules jo form aur ETL me (normalize.py): E.164, gender, age range
+                            values, error = normalize_contact(
+                                *(raw_row[i] if i < len(raw_row) else "" for i in col_idx)
+                            )
+                            if error:
+                                reject(raw_row, error)
+                                continue
+                            batch.append(values)
+                            raw_batch.append(raw_row)
+
+                            if len(batch) >= chunk_size:
+                                inserted += _insert_import_batch(cursor, query, batch, raw_batch, reject)
+                                batch, raw_batch = [], []
+                                if cancel_event is not None and cancel_event.is_set():
+                                    raise OperationCancelled()
+                                if progress is not None:
+                                    progress(min(chars_read / total_size, 1.0), inserted, rejected)
+
+                        if batch:
+                            inserted += _insert_import_batch(cursor, query, batch, raw_batch, reject)
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise OperationCancelled()
+                        conn.commit()
+                    except BaseException:
+                        conn.rollback()
+                        raise
+                    finally:
+                        cursor.close()
+                        self.stats_cache = None
+            except OperationCancelled:
+                # Kuch import hi nahi hua, to adhuri reject file ka koi matlab nahi
+                if reject_file is not None:
+                    reject_file.close()
+                    reject_file = None
+                    Path(reject_path).unlink(missing_ok=True)
+                raise
+            finally:
+                if reject_file is not None:
+                    reject_file.close()
+
+        if progress is not None:
+            progress(1.0, inserted, rejected)
+        return {
+            "inserted": inserted,
+            "rejected": rejected,
+            "reject_path": reject_path if rejected else None,
+        }
+
+    # ============================ EXPORT ============================
+
+    def export(
+        self,
+        path: str,
+        search: str = "",
+        fmt=None,
+        progress=None,
+        cancel_event=None,
+        total=None,
+        sort: str = DEFAULT_SORT,
+        descending: bool = False,
+        filters: Optional[ContactFilter] = None,
+    ) -> int:
+        """member table ko stream karke file me likho (worker thread se chalta hai).
+
+        search   -> sirf matching contacts (GUI ka current search)
+        sort / descending / filters -> GUI list jaisa hi order aur filter
+        fmt      -> None ho to extension se (csv, csv.gz, parquet, arrow)
+        progress(fraction, rows) har batch ke baad; total na ho to fraction 0 rahega.
+
+        Rows EXPORT_FETCH_SIZE ke batches me fetchmany se aate hain, poora table kabhi
+        memory me nahi aata. MySQL par unbuffered (server-side) cursor use hota hai.
+        """
+        where_sql, params = self.build_where(search, filters, sort)
+        order = "DESC" if descending else "ASC"
+        query = "SELECT " + ", ".join(CONTACT_COLUMNS) + " FROM member" + where_sql
+        query += " ORDER BY " + ", ".join(f"{column} {order}" for column in SORT_COLUMNS[sort])
+
+        writer = open_export_writer(path, fmt)
+
+        written = 0
+        ok = False
+        try:
+            with self.connection() as conn:
+                # mysql.connector: buffered=False -> rows server se batch me aate hain
+                cursor = conn.cursor(buffered=False) if self.backend == "mysql" else conn.cursor()
+                try:
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                        if not rows:
+                            break
+                        writer.write(rows)
+                        written += len(rows)
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise OperationCancelled()
+                        if progress is not None:
+                            progress(min(written / total, 1.0) if total else 0.0, written)
+                finally:
+                    cursor.close()
+            ok = True
+        finally:
+            writer.close()
+            if not ok:
+                Path(path).unlink(missing_ok=True)
+
+        if progress is not None:
+            progress(1.0, written)
+        return written
+
+
+def export_format_for(path: str) -> str:
+    """File extension se export format: csv / csv.gz / parquet / arrow."""
+    return EXPORT_FORMATS.get(Path(path).suffix.lower(), "csv")
+
+
+def open_export_writer(path: str, fmt=None):
+    """Export file kholo: writer.write(rows) (CONTACT_COLUMNS order ke tuples), writer.close()."""
+    fmt = fmt or export_format_for(path)
+    if fmt == "csv":
+        return _CsvExportWriter(open(path, "w", newline="", encoding="utf-8"))
+    if fmt == "csv.gz":
+        return _CsvExportWriter(gzip.open(path, "wt", newline="", encoding="utf-8"))
+    if fmt in ("parquet", "arrow"):
+        return _ArrowExportWriter(path, fmt)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+class _CsvExportWriter:
+    def __init__(self, f):
+        self.f = f
+        self.writer = csv.writer(f)
+        self.writer.writerow(IMPORT_COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.f.close()
+
+
+class _ArrowExportWriter:
+    """Parquet / Arrow IPC writer, ek batch = ek row group / record batch.
+
+    pandas + pyarrow optional hain, sirf in formats ke liye chahiye.
+    """
+
+    def __init__(self, path: str, fmt: str):
+        try:
+            import pandas as pd
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Parquet/Arrow export ke liye pandas aur pyarrow install karo: pip install pandas pyarrow"
+            )
+        self.pd = pd
+        self.pa = pa
+        self.schema = pa.schema([
+            ("firstname", pa.string()),
+            ("lastname", pa.string()),
+            ("gender", pa.string()),
+            ("age", pa.int64()),
+            ("address", pa.string()),
+            ("contact", pa.string()),
+        ])
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, rows):
+        df = self.pd.DataFrame.from_records(rows, columns=IMPORT_COLUMNS)
+        for col in ("firstname", "lastname", "gender", "address", "contact"):
+            df[col] = df[col].astype("string")
+        df["age"] = self.pd.to_numeric(df["age"], errors="coerce").astype("Int64")
+        table = self.pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+
+
+def _insert_import_batch(cursor, query, batch, raw_batch, reject) -> int:
+    """Ek batch executemany se. Koi row fail ho to batch savepoint tak rollback karke
+    row by row dobara, taaki sirf kharab row reject ho."""
+    cursor.execute("SAVEPOINT import_batch")
+    try:
+        cursor.executemany(query, batch)
+        cursor.execute("RELEASE SAVEPOINT import_batch")
+        return len(batch)
+    except Exception:
+        cursor.execute("ROLLBACK TO SAVEPOINT import_batch")
+
+    inserted = 0
+    for values, raw_row in zip(batch, raw_batch):
+        try:
+            cursor.execute(query, values)
+            inserted += 1
+        except Exception as exc:
+            reject(raw_row, f"db error: {exc}")
+    cursor.execute("RELEASE SAVEPOINT import_batch")
+    return inserted
@@ -0,0 +1,743 @@
+"""Sharded SQLite backend: member table N SQLite files me, contact number ke hash se.
+
+Ek SQLite file par ek time me ek hi writer chalta hai -- bade contact sets par
+wahi bottleneck tha. Yahan:
+- shard = crc32(contact) % N (contact normalized E.164 hai, same number hamesha
+  same shard par). Har shard ek poora normal contacts DB hai (wahi migrations,
+  FTS, triggers, change feed) apne ConnectionPool ke saath
+- global mem_id = local mem_id * N + shard: get / update / delete bina lookup ke
+  sahi shard par jaate hain, aur ek shard ke andar local aur global order same hai
+- list / search / count saare shards par parallel (executor), phir heapq.merge se
+  k-way merge usi sort order me -- keyset pagination (GUI, server) waisa hi chalta hai
+- alag shards = alag files / write locks: ShardedWriteQueue har shard ka apna
+  writer thread + group commit, bulk_insert / upsert shards par parallel, isliye
+  write throughput shard count ke saath badhta hai
+- edit me contact number badla aur naya shard alag hai to row move hoti hai (naya mem_id)
+
+DIR/shards.json (manifest) me shard count aur files hain. Rebalance (shard count
+badalna) offline tool hai, mem_ids badal jaate hain -- GUI / server band karke chalao:
+
+    python contact_shards.py import shards/ --from pythontut.db --shards 4
+    python contact_shards.py rebalance shards/ --shards 8
+    python contact_shards.py stats shards/
+    python contact_shards.py bench --shards 1 4 --writers 8
+    python index.py --shards shards/
+
+CSV import, bulk edit / undo, duplicate review aur in-memory cache sirf
+single-file backend par hain.
+"""
+import argparse
+import heapq
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+import instrumentation
+from contact_db import ConnectionPool, connect_sqlite, run_with_retry
+from contact_service import (
+    CONTACT_COLUMNS,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SORT,
+    EXPORT_FETCH_SIZE,
+    SELECT_COLUMNS,
+    ConflictError,
+    Contact,
+    ContactFilter,
+    ContactRepository,
+    OperationCancelled,
+    open_export_writer,
+    sort_key,
+    utc_now,
+)
+from write_queue import CLOSE_TIMEOUT, WriteQueue
+
+# ======================= SHARD CONFIG ============================
+DEFAULT_SHARD_COUNT = 4
+MANIFEST_NAME = "shards.json"
+SHARD_FILE = "member-g{generation}-{index:03d}.db"  # generation har rebalance par +1
+SHARD_POOL_SIZE = 3      # har shard ka pool (N shards -> max N * size connections)
+COPY_BATCH_SIZE = 5000   # import / rebalance: source se ek baar me itne rows
+
+COPY_COLUMNS = (*CONTACT_COLUMNS, "version", "updated_at")  # move / copy me version bhi saath
+
+
+def shard_for_contact(contact: str, shard_count: int) -> int:
+    """Contact number ka shard. crc32 stable hai (Python hash() har process me alag hota hai)."""
+    return zlib.crc32((contact or "").encode("utf-8")) % shard_count
+
+
+# ============================ MANIFEST ============================
+
+def make_manifest(shard_count: int, generation: int = 1) -> dict:
+    if shard_count < 1:
+        raise ValueError("shard count must be at least 1")
+    return {
+        "shard_count": shard_count,
+        "generation": generation,
+        "files": [SHARD_FILE.format(generation=generation, index=i) for i in range(shard_count)],
+    }
+
+
+def read_manifest(directory) -> Optional[dict]:
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(directory, manifest: dict):
+    """Atomic: temp file likh ke rename, aadha likha manifest kabhi nahi dikhta."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, directory / MANIFEST_NAME)
+
+
+def remove_shard_files(directory, manifest: dict):
+    for name in manifest["files"]:
+        for suffix in ("", "-wal", "-shm"):
+            (Path(directory) / (name + suffix)).unlink(missing_ok=True)
+
+
+def _connect_shard(path: str):
+    return instrumentation.connect_timed(lambda: connect_sqlite(path))
+
+
+class _InterruptScope:
+    """connection() scope: andar chal rahi fan-out queries ke connections, interrupt() sabko rokta hai."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.conns = set()
+        self.interrupted = False
+
+    def add(self, conn) -> bool:
+        with self.lock:
+            if self.interrupted:
+                return False
+            self.conns.add(conn)
+            return True
+
+    def discard(self, conn):
+        with self.lock:
+            self.conns.discard(conn)
+
+    def interrupt(self):
+        with self.lock:
+            self.interrupted = True
+            for conn in self.conns:
+                conn.interrupt()
+
+
+class ShardedContactRepository:
+    """ContactRepository jaisa interface, N SQLite shards ke upar.
+
+    shards[i] normal ContactRepository hai (apna pool). Bahar hamesha global mem_ids.
+    Writes ek shard ke andar atomic hain, shards ke beech nahi (bulk_insert, move).
+    """
+
+    backend = "sharded"
+
+    def __init__(self, directory, shard_count: Optional[int] = None, manifest: Optional[dict] = None,
+                 pool_size: int = SHARD_POOL_SIZE):
+        self.directory = Path(directory)
+        if manifest is None:
+            manifest = read_manifest(self.directory)
+            if manifest is None:
+                manifest = make_manifest(shard_count or DEFAULT_SHARD_COUNT)
+                write_manifest(self.directory, manifest)
+            elif shard_count is not None and shard_count != manifest["shard_count"]:
+                raise ValueError(
+                    f"{directory} has {manifest['shard_count']} shards, use rebalance to change it"
+                )
+        self.manifest = manifest
+        self.shard_count = manifest["shard_count"]
+        self.paths = [str(self.directory / name) for name in manifest["files"]]
+        self.pools = [
+            ConnectionPool(lambda path=path: _connect_shard(path), size=pool_size) for path in self.paths
+        ]
+        self.shards = [ContactRepository("sqlite", pool=pool) for pool in self.pools]
+        self.executor = ThreadPoolExecutor(max_workers=self.shard_count, thread_name_prefix="contact-shard")
+        self.local = threading.local()  # connection() scope (search interrupt)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for pool in self.pools:
+            pool.close_all()
+
+    def pool_stats(self) -> dict:
+        """ContactRepository.pool_stats jaisa, par har shard ka apna pool (global pool nahi)."""
+        return {"shard_pools": [pool.stats() for pool in self.pools]}
+
+    # ============================ ROUTING ============================
+
+    def shard_of_contact(self, contact: str) -> int:
+        return shard_for_contact(contact, self.shard_count)
+
+    def locate(self, mem_id: int) -> tuple:
+        """global mem_id -> (shard, local mem_id)."""
+        return mem_id % self.shard_count, mem_id // self.shard_count
+
+    def global_id(self, local_id, shard: int):
+        return None if local_id is None else local_id * self.shard_count + shard
+
+    def globalize(self, contact: Optional[Contact], shard: int) -> Optional[Contact]:
+        """Shard se aaya Contact (local mem_id) -> global mem_id (in place)."""
+        if contact is not None:
+            contact.mem_id = self.global_id(contact.mem_id, shard)
+        return contact
+
+    def local_key(self, key, shard: int, greater: bool):
+        """Global keyset key -> us shard ka local key (last value mem_id hai).
+
+        local * N + shard > g  <=>  local > (g - shard) / N  -> floor kaafi hai;
+        "<" ke liye ceil. Is tarah har shard ki seek bilkul global key ke baad / pehle.
+        """
+        if key is None:
+            return None
+        g = key[-1]
+        local = (g - shard) // self.shard_count if greater else -((shard - g) // self.shard_count)
+        return (*key[:-1], local)
+
+    def partition(self, rows, contact_of) -> dict:
+        """rows ko shard ke hisaab se baanto: {shard: [rows]}."""
+        groups = {}
+        for row in rows:
+            groups.setdefault(self.shard_of_contact(contact_of(row)), []).append(row)
+        return groups
+
+    # ============================ FAN-OUT ============================
+
+    @contextmanager
+    def connection(self):
+        """ContactRepository.connection jaisa scope (search worker / server ke liye).
+
+        Yield hua object sirf interrupt() deta hai: scope ke andar chal rahi saari
+        shard queries ruk jaati hain (sqlite3.OperationalError "interrupted").
+        """
+        scope = getattr(self.local, "scope", None)
+        if scope is not None:
+            yield scope
+            return
+        scope = self.local.scope = _InterruptScope()
+        try:
+            yield scope
+        finally:
+            self.local.scope = None
+
+    def fanout(self, func, shards=None) -> list:
+        """func(shard, repo) har shard par parallel; results shards ke order me.
+
+        repo us shard ke ek connection par bound ContactRepository hai.
+        """
+        scope = getattr(self.local, "scope", None)
+        shards = range(self.shard_count) if shards is None else list(shards)
+
+        def run(shard):
+            source = self.shards[shard]
+            with source.connection() as conn:
+                if scope is not None and not scope.add(conn):
+                    raise sqlite3.OperationalError("interrupted")
+                try:
+                    repo = ContactRepository("sqlite", conn=conn)
+                    repo.fts_enabled = source.fts_enabled
+                    return func(shard, repo)
+                finally:
+                    if scope is not None:
+                        scope.discard(conn)
+
+        if len(shards) == 1:
+            return [run(shards[0])]
+        return list(self.executor.map(run, shards))
+
+    def init_schema(self):
+        """Har shard par migrations (parallel)."""
+        list(self.executor.map(ContactRepository.init_schema, self.shards))
+
+    # ============================ READS ============================
+
+    def fetch_page(self, search: str = "", after_key=None, before_key=None,
+                   limit: int = DEFAULT_PAGE_SIZE, sort: str = DEFAULT_SORT,
+                   descending: bool = False, filters: Optional[ContactFilter] = None) -> list:
+        """ContactRepository.fetch_page jaisa: har shard se ek page (parallel), phir k-way merge."""
+        if limit <= 0:
+            return []
+        forward = before_key is None or after_key is not None
+        greater = forward != descending
+
+        def page(shard, repo):
+            rows = repo.fetch_page(
+                search,
+                after_key=self.local_key(after_key, shard, greater),
+                before_key=self.local_key(before_key, shard, greater),
+                limit=limit, sort=sort, descending=descending, filters=filters,
+            )
+            return [self.globalize(contact, shard) for contact in rows]
+
+        merged = heapq.merge(
+            *self.fanout(page), key=lambda contact: sort_key(contact.key_for(sort)), reverse=descending
+        )
+        if forward:
+            return list(islice(merged, limit))
+        return list(merged)[-limit:]
+
+    # Sirf fetch_page par bane hain, sharded par bhi bina badle chalte hain
+    search = ContactRepository.search
+    iter_contacts = ContactRepository.iter_contacts
+
+    def count(self, search: str = "", filters: Optional[ContactFilter] = None) -> int:
+        return sum(self.fanout(lambda shard, repo: repo.count(search, filters)))
+
+    def get(self, mem_id: int) -> Optional[Contact]:
+        shard, local = self.locate(mem_id)
+        return self.globalize(self.shards[shard].get(local), shard)
+
+    def get_many(self, mem_ids, search: str = "", filters: Optional[ContactFilter] = None) -> list:
+        groups = {}
+        for mem_id in mem_ids:
+            shard, local = self.locate(mem_id)
+            groups.setdefault(shard, []).append(local)
+        if not groups:
+            return []
+
+        def fetch(shard, repo):
+            return [self.globalize(c, shard) for c in repo.get_many(groups[shard], search, filters)]
+
+        return [contact for rows in self.fanout(fetch, sorted(groups)) for contact in rows]
+
+    def matching_ids(self, search: str = "", filters: Optional[ContactFilter] = None) -> list:
+        def ids(shard, repo):
+            return [self.global_id(mem_id, shard) for mem_id in repo.matching_ids(search, filters)]
+
+        return [mem_id for rows in self.fanout(ids) for mem_id in rows]
+
+    # ============================ WRITES ============================
+
+    def insert(self, contact: Contact) -> int:
+        shard = self.shard_of_contact(contact.contact)
+        self.shards[shard].insert(contact)
+        return self.globalize(contact, shard).mem_id
+
+    def update(self, contact: Contact) -> bool:
+        """ContactRepository.update jaisa; naya contact number doosre shard ka ho to row move."""
+        shard, local = self.locate(contact.mem_id)
+        target = self.shard_of_contact(contact.contact)
+        moved = replace(contact, mem_id=local)
+        try:
+            if target == shard:
+                found = self.shards[shard].update(moved)
+            else:
+                # move() contact ko sirf success par badalta hai, retry par wahi input
+                found = run_with_retry(lambda: self.move(self.shards[shard], moved, target))
+                if found:
+                    shard = target
+        except ConflictError as exc:
+            self.globalize(exc.current, shard)
+            raise
+        if found:
+            contact.mem_id = self.global_id(moved.mem_id, shard)
+            contact.version, contact.updated_at = moved.version, moved.updated_at
+        return found
+
+    def move(self, source: ContactRepository, contact: Contact, target: int, commit: bool = True) -> bool:
+        """Row source shard se target shard me (contact.mem_id local hai, baad me target ka naya local id).
+
+        Pehle source par version check + delete, phir target me insert (version + 1).
+        Insert fail ho to delete bhi wapas (commit=False: caller ka savepoint / transaction).
+        Target alag file hai: dono ek atomic transaction nahi, insert commit hone ke baad
+        source commit fail ho to row dono jagah reh sakti hai (rebalance / dedupe saaf karte hain).
+        """
+        with source.connection() as conn:
+            try:
+                current = source.get(contact.mem_id)
+                if current is None:
+                    return False
+                if contact.version is not None and current.version != contact.version:
+                    raise ConflictError(current)
+                if not source.delete(current.mem_id, current.version, commit=False):
+                    return False
+                moved = replace(contact, version=(current.version or 0) + 1, updated_at=utc_now())
+                with self.shards[target].connection() as target_conn:
+                    cursor = target_conn.cursor()
+                    cursor.execute(_copy_insert_sql(), _copy_values(moved))
+                    moved.mem_id = cursor.lastrowid
+                    target_conn.commit()
+                    cursor.close()
+                if commit:
+                    conn.commit()
+            except BaseException:
+                if commit:
+                    conn.rollback()
+                raise
+        contact.mem_id, contact.updated_at = moved.mem_id, moved.updated_at
+        contact.version = None if contact.version is None else moved.version
+        return True
+
+    def delete(self, mem_id: int, version: Optional[int] = None) -> bool:
+        shard, local = self.locate(mem_id)
+        try:
+            return self.shards[shard].delete(local, version)
+        except ConflictError as exc:
+            self.globalize(exc.current, shard)
+            raise
+
+    def parallel_writes(self, groups: dict, func) -> list:
+        """func(shard repo, rows) har shard ke group par, alag threads me (alag write locks)."""
+        return list(self.executor.map(lambda shard: func(self.shards[shard], groups[shard]), sorted(groups)))
+
+    def bulk_insert(self, rows) -> int:
+        """Rows shard ke hisaab se baant ke har shard me parallel executemany (har shard apna commit)."""
+        rows = (r.values() if isinstance(r, Contact) else r for r in rows)
+        groups = self.partition(rows, lambda row: row[5])
+        return sum(self.parallel_writes(groups, lambda repo, group: repo.bulk_insert(group)))
+
+    def bulk_upsert(self, rows, hash_column=None) -> int:
+        """Contact number par upsert -- same number same shard par hai, UNIQUE index shard ka hi kaafi."""
+        rows = (r.values() if isinstance(r, Contact) else r for r in rows)
+        groups = self.partition(rows, lambda row: row[5])
+        return sum(self.parallel_writes(groups, lambda repo, group: repo.bulk_upsert(group, hash_column)))
+
+    def upsert_contacts(self, contacts) -> tuple:
+        groups = self.partition(contacts, lambda contact: contact.contact)
+        results = self.parallel_writes(groups, lambda repo, group: repo.upsert_contacts(group))
+        return sum(r[0] for r in results), sum(r[1] for r in results)
+
+    # ============================ CHANGE FEED ============================
+
+    def last_change_seq(self) -> Optional[tuple]:
+        """Har shard ka latest seq, tuple me (GUI isko bas wapas changes_since ko deta hai)."""
+        seqs = self.fanout(lambda shard, repo: repo.last_change_seq())
+        return None if None in seqs else tuple(seqs)
+
+    def changes_since(self, seq: tuple, limit: int) -> Optional[list]:
+        """Saare shards ke changes [(position, op, global mem_id)].
+
+        position = us change tak har shard ka seq (tuple), taaki aakhri entry ka
+        position agla changes_since ka seq ban sake. Kisi bhi shard me gap -> None.
+        """
+        if seq is None or len(seq) != self.shard_count:
+            return None
+        per_shard = self.fanout(lambda shard, repo: repo.changes_since(seq[shard], limit))
+        if any(rows is None for rows in per_shard):
+            return None
+        position = list(seq)
+        changes = []
+        for shard, rows in enumerate(per_shard):
+            for change_seq, op, mem_id in rows:
+                position[shard] = change_seq
+                changes.append((tuple(position), op, self.global_id(mem_id, shard)))
+        return changes[:limit]
+
+    def prune_changes(self, *args) -> int:
+        return sum(shard.prune_changes(*args) for shard in self.shards)
+
+    # ============================ STATISTICS ============================
+
+    def change_counter(self):
+        """Shards ke write counters ka jod (har write par badhta hai -> ETag)."""
+        return sum(self.fanout(lambda shard, repo: repo.change_counter()))
+
+    def stats(self) -> dict:
+        """ContactRepository.stats jaisa hi dict, shards ke counts jod ke."""
+        per_shard = list(self.executor.map(ContactRepository.stats, self.shards))
+        stats = {"total": sum(s["total"] for s in per_shard)}
+        for stat in ("gender", "age", "city"):
+            counts = Counter()
+            for s in per_shard:
+                counts.update(dict(s[stat]))
+            stats[stat] = sorted(counts.items(), key=lambda r: (-r[1], r[0]))
+        stats["age"].sort(key=lambda r: (r[0] == "unknown", len(r[0]), r[0]))
+        return stats
+
+    def shard_stats(self) -> list:
+        """Har shard: rows, file size (rebalance / skew dekhne ke liye)."""
+        return [
+            {
+                "shard": i,
+                "file": Path(path).name,
+                "rows": shard.stats()["total"],
+                "bytes": sum(
+                    os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix)
+                ),
+                "pool": pool.stats(),
+            }
+            for i, (path, shard, pool) in enumerate(zip(self.paths, self.shards, self.pools))
+        ]
+
+    # ============================ EXPORT ============================
+
+    def export(self, path: str, search: str = "", fmt=None, progress=None, cancel_event=None,
+               total=None, sort: str = DEFAULT_SORT, descending: bool = False,
+               filters: Optional[ContactFilter] = None) -> int:
+        """ContactRepository.export jaisa; rows shards ke merge se, GUI wale order me."""
+        writer = open_export_writer(path, fmt)
+        rows = (c.values() for c in self.iter_contacts(search, EXPORT_FETCH_SIZE, sort, descending, filters))
+        written = 0
+        ok = False
+        try:
+            for batch in iter(lambda: list(islice(rows, EXPORT_FETCH_SIZE)), []):
+                writer.write(batch)
+                written += len(batch)
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                if progress is not None:
+                    progress(min(written / total, 1.0) if total else 0.0, written)
+            ok = True
+        finally:
+            writer.close()
+            if not ok:
+                Path(path).unlink(missing_ok=True)
+
+        if progress is not None:
+            progress(1.0, written)
+        return written
+
+
+def _copy_insert_sql() -> str:
+    return f"INSERT INTO member ({', '.join(COPY_COLUMNS)}) VALUES ({', '.join(['?'] * len(COPY_COLUMNS))})"
+
+
+def _copy_values(contact: Contact) -> tuple:
+    return (*contact.values(), contact.version or 1, contact.updated_at)
+
+
+# ============================ WRITE QUEUE ============================
+
+class ShardedWriteQueue:
+    """WriteQueue ka sharded roop: har shard ka apna writer thread + group commit.
+
+    Alag shards ke writes alag files par parallel commit hote hain. Futures global
+    mem_ids ke saath resolve hote hain, baaki interface WriteQueue jaisa hi.
+    """
+
+    def __init__(self, repo: ShardedContactRepository):
+        self.repo = repo
+        self.queues = [WriteQueue(shard) for shard in repo.shards]
+
+    def chain(self, future: Future, shard: int, convert=None) -> Future:
+        """Shard queue ka future -> naya future, result / ConflictError global mem_ids me."""
+        outer = Future()
+
+        def done(inner):
+            exc = inner.exception()
+            if exc is None:
+                result = inner.result()
+                outer.set_result(convert(result) if convert is not None else result)
+                return
+            if isinstance(exc, ConflictError):
+                self.repo.globalize(exc.current, shard)
+            outer.set_exception(exc)
+
+        future.add_done_callback(done)
+        return outer
+
+    def insert(self, contact: Contact) -> Future:
+        """Future -> naya global mem_id."""
+        shard = self.repo.shard_of_contact(contact.contact)
+        return self.chain(
+            self.queues[shard].insert(contact), shard, lambda local: self.repo.global_id(local, shard)
+        )
+
+    def update(self, contact: Contact) -> Future:
+        """Future -> found (bool), ya ConflictError. Naya number doosre shard ka -> move."""
+        shard, local = self.repo.locate(contact.mem_id)
+        target = self.repo.shard_of_contact(contact.contact)
+        moved = replace(contact, mem_id=local)
+        if target == shard:
+            return self.chain(self.queues[shard].update(moved), shard)
+        return self.chain(
+            self.queues[shard].submit(lambda repo: self.repo.move(repo, replace(moved), target, commit=False)),
+            shard,
+        )
+
+    def delete(self, mem_id: int, version=None) -> Future:
+        shard, local = self.repo.locate(mem_id)
+        return self.chain(self.queues[shard].delete(local, version), shard)
+
+    def flush(self, timeout=None) -> bool:
+        return all([queue.flush(timeout) for queue in self.queues])
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> bool:
+        return all([queue.close(timeout) for queue in self.queues])
+
+    def stats(self) -> dict:
+        per_shard = [queue.stats() for queue in self.queues]
+        batches = sum(s["batches"] for s in per_shard)
+        writes = sum(s["writes"] for s in per_shard)
+        return {
+            "pending": sum(s["pending"] for s in per_shard),
+            "batches": batches,
+            "writes": writes,
+            "writes_per_commit": round(writes / batches, 2) if batches else 0.0,
+            "shards": len(per_shard),
+        }
+
+
+# ============================ IMPORT / REBALANCE ============================
+
+def copy_contacts(sources, target: ShardedContactRepository, progress=None) -> int:
+    """sources (ContactRepository list) ke saare rows target shards me, version / updated_at ke saath.
+
+    Source streaming (fetchmany) me padha jata hai; har batch target shards par
+    parallel executemany + commit. Naye mem_ids milte hain.
+    """
+    query = _copy_insert_sql()
+    copied = 0
+
+    def write(repo, rows):
+        with repo.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(query, rows)
+            conn.commit()
+            cursor.close()
+        return len(rows)
+
+    for source in sources:
+        with source.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {SELECT_COLUMNS} FROM member ORDER BY mem_id")
+            while True:
+                rows = cursor.fetchmany(COPY_BATCH_SIZE)
+                if not rows:
+                    break
+                groups = target.partition(
+                    (_copy_values(Contact.from_row(row)) for row in rows), lambda values: values[5]
+                )
+                copied += sum(target.parallel_writes(groups, write))
+                if progress is not None:
+                    progress(copied)
+            cursor.close()
+    return copied
+
+
+def import_database(directory, db_path: str, shard_count: Optional[int] = None, progress=None) -> int:
+    """Single-file DB (e.g. pythontut.db) ke contacts shard set me daalo."""
+    source = ContactRepository("sqlite", pool=ConnectionPool(lambda: connect_sqlite(db_path)))
+    source.init_schema()
+    target = ShardedContactRepository(directory, shard_count)
+    try:
+        target.init_schema()
+        return copy_contacts([source], target, progress)
+    finally:
+        target.close()
+        source.pool.close_all()
+
+
+def rebalance(directory, shard_count: int, progress=None) -> dict:
+    """Shard set ko naye shard count par (offline). Naya generation bana ke manifest swap.
+
+    Beech me crash ho to manifest purana hi rehta hai, adhuri nayi files agli baar hat jaati hain.
+    Change feed / undo journal / dedupe review naye shards me nahi jaate, mem_ids naye hain.
+    """
+    if read_manifest(directory) is None:
+        raise ValueError(f"{directory} is not a shard set (no {MANIFEST_NAME})")
+    old = ShardedContactRepository(directory)
+    new_manifest = make_manifest(shard_count, old.manifest["generation"] + 1)
+    remove_shard_files(directory, new_manifest)
+    new = ShardedContactRepository(directory, manifest=new_manifest)
+    try:
+        old.init_schema()
+        new.init_schema()
+        copied = copy_contacts(old.shards, new, progress)
+    finally:
+        new.close()
+        old.close()
+    write_manifest(directory, new_manifest)
+    remove_shard_files(directory, old.manifest)
+    return {"rows": copied, "from": old.shard_count, "to": shard_count}
+
+
+# ============================ CLI ============================
+
+def bench_writes(shard_count: int, writers: int, rows: int) -> float:
+    """writers threads, har ek `rows` single-row inserts (har insert apna commit). rows/s."""
+    from datagen import generate_rows
+    from normalize import normalize_contact
+
+    contacts = []
+    for raw in generate_rows(writers * rows, dup_rate=0, dirty_rate=0):
+        values, error = normalize_contact(*raw)
+        if not error:
+            contacts.append(Contact(*values))
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ShardedContactRepository(tmp, shard_count)
+        repo.init_schema()
+        chunks = [contacts[i::writers] for i in range(writers)]
+
+        def worker(chunk):
+            for contact in chunk:
+                repo.insert(contact)
+
+        threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        repo.close()
+    return len(contacts) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded SQLite contact store: import / rebalance / stats")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("import", help="Single-file DB ke contacts shard set me daalo")
+    p.add_argument("directory")
+    p.add_argument("--from", dest="db", default="pythontut.db", help="Source SQLite DB")
+    p.add_argument("--shards", type=int, help=f"Naya shard set ho to shard count (default {DEFAULT_SHARD_COUNT})")
+    p = sub.add_parser("rebalance", help="Shard count badlo (GUI / server band karke, mem_ids badal jaate hain)")
+    p.add_argument("directory")
+    p.add_argument("--shards", type=int, required=True)
+    p = sub.add_parser("stats", help="Har shard ke rows / size")
+    p.add_argument("directory")
+    p = sub.add_parser("bench", help="Concurrent single-row insert throughput, alag shard counts par")
+    p.add_argument("--shards", type=int, nargs="+", default=[1, DEFAULT_SHARD_COUNT])
+    p.add_argument("--writers", type=int, default=8)
+    p.add_argument("--rows", type=int, default=200, help="Har writer itne inserts")
+    args = parser.parse_args(argv)
+
+    def progress(rows):
+        print(f"[SHARDS] Copied {rows} contacts ...", end="\r")
+
+    start = time.perf_counter()
+    if args.command == "import":
+        rows = import_database(args.directory, args.db, args.shards, progress)
+        print(f"[SHARDS] Imported {rows} contacts from {args.db} in {time.perf_counter() - start:.1f}s")
+    elif args.command == "rebalance":
+        result = rebalance(args.directory, args.shards, progress)
+        print(
+            f"[SHARDS] Rebalanced {result['rows']} contacts: {result['from']} -> {result['to']} shards "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+    elif args.command == "stats":
+        repo = ShardedContactRepository(args.directory)
+        repo.init_schema()
+        for s in repo.shard_stats():
+            print(f"[SHARDS] {s['shard']:>3}  {s['file']:<24}{s['rows']:>12,} rows{s['bytes'] / 1e6:>10.1f} MB")
+        print(f"[SHARDS] Total {repo.count():,} contacts in {repo.shard_count} shards")
+        repo.close()
+    else:
+        for shard_count in args.shards:
+            rate = bench_writes(shard_count, args.writers, args.rows)
+            print(f"[SHARDS] {shard_count:>3} shards, {args.writers} writers: {rate:>10,.0f} inserts/s")
+
+
+if __name__ == "__main__":
+    main()
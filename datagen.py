@@ -0,0 +1,98 @@
+"""Seeded synthetic contacts generator (benchmarks + ETL testing ke liye).
+
+Usage:
+    python datagen.py --rows 1000000 --out contacts_1m.csv --seed 42
+
+- realistic Indian first / last names, cities, "house, area, city" addresses
+- dup_rate fraction rows pehle aa chuke contact number dobara use karte hain
+- dirty_rate fraction rows me kharab age (khali, negative, text, > MAX_AGE) aur
+  gender / whitespace ki gandagi -- bilkul waisi jo transform() saaf karta hai
+- rows stream hote hain (generator), 10M rows par bhi memory flat rehti hai
+"""
+import argparse
+import csv
+import random
+import time
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Vihaan", "Arjun", "Sai", "Reyansh", "Krishna", "Ishaan", "Rohit",
+    "Vicky", "Rahul", "Amit", "Vikas", "Karan", "Siddharth", "Manish", "Deepak", "Suresh", "Rajesh",
+    "Ananya", "Diya", "Aadhya", "Saanvi", "Priya", "Neha", "Sneha", "Pooja", "Kavya", "Isha",
+    "Riya", "Meera", "Anjali", "Shreya", "Nisha", "Sunita", "Lakshmi", "Divya", "Tanvi", "Aditi",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Gupta", "Singh", "Kumar", "Chaubey", "Patel", "Yadav", "Mishra", "Jain",
+    "Agarwal", "Reddy", "Nair", "Iyer", "Menon", "Das", "Bose", "Chatterjee", "Mukherjee", "Banerjee",
+    "Pandey", "Tiwari", "Dubey", "Shukla", "Srivastava", "Saxena", "Joshi", "Kulkarni", "Deshmukh", "Patil",
+    "Khan", "Ansari", "Qureshi", "Fernandes", "D'Souza", "Gill", "Sandhu", "Chauhan", "Rathore", "Thakur",
+]
+CITIES = [
+    "Jaipur", "Delhi", "Mumbai", "Noida", "Pune", "Patna", "Lucknow", "Indore", "Bhopal", "Raipur",
+    "Bhilai", "Kolkata", "Chennai", "Bengaluru", "Hyderabad", "Ahmedabad", "Surat", "Nagpur", "Kanpur", "Varanasi",
+]
+AREAS = ["MG Road", "Civil Lines", "Sector 18", "Gandhi Nagar", "Station Road", "Model Town", "Shastri Nagar", "Lal Bagh"]
+GENDERS = ["Male", "Female"]
+DIRTY_GENDERS = ["male", "FEMALE", " M", "f ", "Other", ""]
+DIRTY_AGES = ["", "-5", "0", "abc", "250", "NaN", " 42 ", "33.0"]
+
+HEADER = ["firstname", "lastname", "gender", "age", "address", "contact"]
+
+
+def generate_rows(rows: int, seed: int = 42, dup_rate: float = 0.05, dirty_rate: float = 0.03):
+    """rows contacts yield karo (HEADER order me strings). Same seed -> same data."""
+    rnd = random.Random(seed)
+    random_ = rnd.random
+    choice = rnd.choice
+    # Recent contacts ka chhota ring buffer, duplicates yahin se aate hain
+    recent = []
+    recent_max = 10_000
+
+    for i in range(rows):
+        if recent and random_() < dup_rate:
+            contact = choice(recent)
+        else:
+            contact = str(6_000_000_000 + rnd.randrange(4_000_000_000))
+            if len(recent) < recent_max:
+                recent.append(contact)
+            else:
+                recent[i % recent_max] = contact
+
+        firstname = choice(FIRST_NAMES)
+        lastname = choice(LAST_NAMES)
+        gender = choice(GENDERS)
+        age = str(rnd.randint(18, 85))
+        address = f"{rnd.randint(1, 999)}, {choice(AREAS)}, {choice(CITIES)}"
+
+        if random_() < dirty_rate:
+            age = choice(DIRTY_AGES)
+            gender = choice(DIRTY_GENDERS)
+            firstname = f"  {firstname.lower()} "
+        yield (firstname, lastname, gender, age, address, contact)
+
+
+def write_csv(path: str, rows: int, seed: int = 42, dup_rate: float = 0.05, dirty_rate: float = 0.03) -> int:
+    """generate_rows ko CSV file me stream karo, likhe gaye rows return."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(generate_rows(rows, seed, dup_rate, dirty_rate))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic contacts CSV generator")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--out", default="contacts_synthetic.csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dup-rate", type=float, default=0.05, help="Duplicate contact numbers ka fraction")
+    parser.add_argument("--dirty-rate", type=float, default=0.03, help="Kharab age / gender wale rows ka fraction")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    write_csv(args.out, args.rows, args.seed, args.dup_rate, args.dirty_rate)
+    elapsed = time.perf_counter() - start
+    print(f"[DATAGEN] {args.rows:,} rows -> {args.out} in {elapsed:.2f}s ({args.rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Fuzzy duplicate detection: blocking index + similarity scoring + review table.
+
+    python dedupe.py [--db pythontut.db] [--threshold 0.8]
+    python etl_contacts.py --find-duplicates          (load ke baad)
+    GUI: Data -> Find Duplicates / Review Duplicates
+
+Har pair compare karna O(n^2) hai. Isliye har record kuch "blocking keys" paata hai
+aur sirf same key wale records compare hote hain:
+- "p:" + contact ke last PHONE_SUFFIX_DIGITS digits (formatting / country code alag ho to bhi)
+- "n:" + first / last name ke soundex codes (sorted -> first/last swap bhi same key) + city
+Bade blocks me sab pairs nahi, sorted-neighbourhood window (contact order me aas paas ke
+BLOCK_WINDOW records) -- kul comparisons ~ n * BLOCK_WINDOW, yaani near-linear.
+
+Pairs ka score (0..1) SCORE_WEIGHTS se: naam (swap bhi), phone, address, age. Score
+DUPLICATE_THRESHOLD se upar -> union-find se clusters -> dedupe_review table me
+'pending'. GUI me reviewer ek record rakhta hai (merge) ya cluster dismiss karta hai;
+dismissed clusters agli run me dobara nahi aate.
+"""
+import argparse
+import time
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter, ne
+
+from contact_db import connect_sqlite
+from contact_service import CONTACT_COLUMNS, Contact, ContactRepository, OperationCancelled
+
+# ======================= DEDUPE CONFIG ============================
+PHONE_SUFFIX_DIGITS = 7       # phone block key: last itne digits
+ALL_PAIRS_BLOCK = 8           # itne tak ke block me har pair compare, bade me window
+BLOCK_WINDOW = 5              # bade block me har record agle itne records se compare
+DUPLICATE_THRESHOLD = 0.80
+PHONE_MIN_SIMILARITY = 0.80   # isse kam phone similarity = alag number (0 score)
+SCORE_WEIGHTS = {"name": 0.45, "phone": 0.35, "address": 0.15, "age": 0.05}
+LOAD_BATCH = 50_000           # records itne itne karke padhe jate hain (progress ke liye)
+REVIEW_LIMIT = 200            # review window me ek baar me itne clusters
+
+STATUS_PENDING = "pending"
+STATUS_MERGED = "merged"
+STATUS_DISMISSED = "dismissed"
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+
+
+# ============================ SIMILARITY ============================
+
+@lru_cache(maxsize=100_000)
+def soundex(name: str) -> str:
+    """American soundex ("Sharma" -> "S650"). Khali / non-latin naam -> ""."""
+    letters = [c for c in name.upper() if "A" <= c <= "Z"]
+    if not letters:
+        return ""
+    code = letters[0]
+    prev = SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        if c in "HW":
+            continue  # H / W same code wale letters ko alag nahi karte
+        digit = SOUNDEX_CODES.get(c, "")
+        if digit and digit != prev:
+            code += digit
+        prev = digit
+    return (code + "000")[:4]
+
+
+@lru_cache(maxsize=200_000)
+def text_similarity(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def phone_similarity(a: str, b: str) -> float:
+    """Digits ki similarity; same length par sasta Hamming (typo / swapped digit)."""
+    if a == b:
+        return 1.0
+    if len(a) == len(b):
+        sim = 1 - sum(map(ne, a, b)) / len(a)
+    else:
+        sim = SequenceMatcher(None, a, b).ratio()
+    return sim if sim >= PHONE_MIN_SIMILARITY else 0.0
+
+
+def name_similarity(a, b) -> float:
+    """(first, last) pairs; first/last swap bhi check hota hai."""
+    straight = (text_similarity(a[0], b[0]) + text_similarity(a[1], b[1])) / 2
+    if straight == 1.0:
+        return straight
+    swapped = (text_similarity(a[0], b[1]) + text_similarity(a[1], b[0])) / 2
+    return max(straight, swapped)
+
+
+# ============================ RECORDS + BLOCKING ============================
+
+# Record tuple fields
+R_ID, R_FIRST, R_LAST, R_AGE, R_ADDRESS, R_DIGITS, R_CITY = range(7)
+
+
+def make_record(mem_id, firstname, lastname, age, address, contact) -> tuple:
+    address = " ".join((address or "").lower().split())
+    return (
+        mem_id,
+        (firstname or "").strip().lower(),
+        (lastname or "").strip().lower(),
+        age,
+        address,
+        "".join(c for c in (contact or "") if c.isdigit()),
+        address.rsplit(",", 1)[-1].strip(),
+    )
+
+
+def blocking_keys(rec) -> list:
+    keys = []
+    if len(rec[R_DIGITS]) >= PHONE_SUFFIX_DIGITS:
+        keys.append("p:" + rec[R_DIGITS][-PHONE_SUFFIX_DIGITS:])
+    codes = sorted((soundex(rec[R_FIRST]), soundex(rec[R_LAST])))
+    if any(codes):
+        keys.append(f"n:{codes[0]}|{codes[1]}|{rec[R_CITY]}")
+    return keys
+
+
+def score_pair(a, b, threshold: float = DUPLICATE_THRESHOLD) -> float:
+    """0..1 score. Sasti cheezein pehle; upper bound threshold se neeche gaya to 0 (skip)."""
+    w = SCORE_WEIGHTS
+    phone = phone_similarity(a[R_DIGITS], b[R_DIGITS])
+    bound = w["name"] + w["phone"] * phone + w["address"] + w["age"]
+    if bound < threshold:
+        return 0.0
+
+    name = name_similarity((a[R_FIRST], a[R_LAST]), (b[R_FIRST], b[R_LAST]))
+    bound -= w["name"] * (1 - name)
+    if bound < threshold:
+        return 0.0
+
+    if a[R_AGE] is None or b[R_AGE] is None:
+        age = 0.5
+    else:
+        age = 1.0 if abs(a[R_AGE] - b[R_AGE]) <= 1 else 0.0
+    if a[R_ADDRESS] and b[R_ADDRESS]:
+        address = text_similarity(a[R_ADDRESS], b[R_ADDRESS])
+    else:
+        address = 0.5
+    return (
+        w["name"] * name + w["phone"] * phone + w["address"] * address + w["age"] * age
+    )
+
+
+def candidate_pairs(members: list):
+    """Ek block (contact order me sorted) ke compare hone wale index pairs."""
+    if len(members) <= ALL_PAIRS_BLOCK:
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                yield members[i], members[j]
+        return
+    for i in range(len(members)):
+        for j in range(i + 1, min(i + 1 + BLOCK_WINDOW, len(members))):
+            yield members[i], members[j]
+
+
+def detect(records: list, threshold: float = DUPLICATE_THRESHOLD, dismissed=None,
+           progress=None, cancel_event=None):
+    """records (make_record tuples) me duplicate clusters dhoondo.
+
+    dismissed: mem_id -> set(cluster_id); jo do records ek hi dismissed cluster me
+    the, unka pair dobara nahi joda jata.
+    Return (clusters, stats): clusters = [[(mem_id, best_score), ...], ...] best score desc.
+    """
+    dismissed = dismissed or {}
+    n = len(records)
+    parent = list(range(n))
+    best = [0.0] * n
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Blocking: (key, digits, index) sort -> har key ka group contact order me
+    entries = [
+        (key, rec[R_DIGITS], i)
+        for i, rec in enumerate(records)
+        for key in blocking_keys(rec)
+    ]
+    entries.sort()
+
+    comparisons = 0
+    blocks = 0
+    seen = 0
+    for _, group in groupby(entries, key=itemgetter(0)):
+        members = [i for _, _, i in group]
+        seen += len(members)
+        if len(members) < 2:
+            continue
+        blocks += 1
+        for i, j in candidate_pairs(members):
+            ri, rj = find(i), find(j)
+            if ri == rj:
+                continue  # pehle hi ek cluster me
+            a, b = records[i], records[j]
+            if dismissed and dismissed.get(a[R_ID], set()) & dismissed.get(b[R_ID], set()):
+                continue
+            comparisons += 1
+            score = score_pair(a, b, threshold)
+            if score >= threshold:
+                parent[ri] = rj
+                best[i] = max(best[i], score)
+                best[j] = max(best[j], score)
+        if blocks % 10_000 == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                raise OperationCancelled()
+            if progress is not None:
+                progress(seen / max(len(entries), 1), comparisons)
+
+    groups = {}
+    for i in range(n):
+        if best[i]:
+            groups.setdefault(find(i), []).append((records[i][R_ID], round(best[i], 4)))
+    clusters = [sorted(g) for g in groups.values() if len(g) > 1]
+    clusters.sort(key=lambda g: -max(score for _, score in g))
+    stats = {
+        "records": n,
+        "blocks": blocks,
+        "comparisons": comparisons,
+        "clusters": len(clusters),
+        "duplicates": sum(len(g) - 1 for g in clusters),
+    }
+    return clusters, stats
+
+
+# ============================ DB: DETECT / REVIEW / MERGE ============================
+
+def load_records(repo: ContactRepository, progress=None, cancel_event=None) -> list:
+    records = []
+    with repo.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT mem_id, firstname, lastname, age, address, contact FROM member ORDER BY mem_id"
+        )
+        while True:
+            rows = cursor.fetchmany(LOAD_BATCH)
+            if not rows:
+                break
+            records.extend(make_record(*row) for row in rows)
+            if cancel_event is not None and cancel_event.is_set():
+                raise OperationCancelled()
+            if progress is not None:
+                progress(len(records))
+        cursor.close()
+    return records
+
+
+def load_dismissed(repo: ContactRepository) -> dict:
+    dismissed = {}
+    with repo.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT cluster_id, mem_id FROM dedupe_review WHERE status = {repo.placeholder}",
+            (STATUS_DISMISSED,),
+        )
+        for cluster_id, mem_id in cursor.fetchall():
+            dismissed.setdefault(mem_id, set()).add(cluster_id)
+        cursor.close()
+    return dismissed
+
+
+def find_duplicates(repo: ContactRepository, threshold: float = DUPLICATE_THRESHOLD,
+                    progress=None, cancel_event=None) -> dict:
+    """Poori member table scan karo, naye pending clusters dedupe_review me likho.
+
+    Purane pending clusters replace ho jaate hain; merged / dismissed history rehti hai.
+    progress(fraction, message). Return stats dict (+ elapsed seconds).
+    """
+    start = time.perf_counter()
+    total = max(repo.count(), 1)
+
+    def loaded(n):
+        if progress is not None:
+            progress(0.3 * min(n / total, 1.0), f"Loaded {n} of {total} contacts ...")
+
+    def scored(frac, comparisons):
+        if progress is not None:
+            progress(0.3 + 0.65 * frac, f"Compared {comparisons} candidate pairs ...")
+
+    records = load_records(repo, loaded, cancel_event)
+    clusters, stats = detect(records, threshold, load_dismissed(repo), scored, cancel_event)
+    del records
+
+    ph = repo.placeholder
+    with repo.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"DELETE FROM dedupe_review WHERE status = {ph}", (STATUS_PENDING,))
+            cursor.execute("SELECT COALESCE(MAX(cluster_id), 0) FROM dedupe_review")
+            next_id = cursor.fetchone()[0] + 1
+            cursor.executemany(
+                f"INSERT INTO dedupe_review (cluster_id, mem_id, score, status) "
+                f"VALUES ({ph}, {ph}, {ph}, {ph})",
+                (
+                    (next_id + n, mem_id, score, STATUS_PENDING)
+                    for n, cluster in enumerate(clusters)
+                    for mem_id, score in cluster
+                ),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    stats["elapsed"] = round(time.perf_counter() - start, 3)
+    if progress is not None:
+        progress(1.0, f"Found {stats['clusters']} duplicate groups.")
+    return stats
+
+
+def pending_clusters(repo: ContactRepository, limit: int = REVIEW_LIMIT) -> list:
+    """Review ke liye pending clusters: [(cluster_id, [(Contact, score), ...]), ...].
+
+    Jin clusters ke 2 se kam contacts bache hain (beech me delete ho gaye) woh skip.
+    """
+    columns = ", ".join(f"m.{col}" for col in ("mem_id", *CONTACT_COLUMNS))
+    ph = repo.placeholder
+    with repo.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT r.cluster_id, r.score, {columns}
+            FROM dedupe_review r
+            JOIN (
+                SELECT DISTINCT cluster_id FROM dedupe_review
+                WHERE status = {ph} ORDER BY cluster_id LIMIT {ph}
+            ) c ON c.cluster_id = r.cluster_id
+            JOIN member m ON m.mem_id = r.mem_id
+            WHERE r.status = {ph}
+            ORDER BY r.cluster_id, m.mem_id
+            """,
+            (STATUS_PENDING, limit, STATUS_PENDING),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    clusters = []
+    for cluster_id, group in groupby(rows, key=itemgetter(0)):
+        members = [(Contact.from_row(row[2:]), row[1]) for row in group]
+        if len(members) > 1:
+            clusters.append((cluster_id, members))
+    return clusters
+
+
+def merge_cluster(repo: ContactRepository, cluster_id: int, keep_id: int) -> int:
+    """Cluster ke baaki contacts keep_id me merge, cluster 'merged'. Deleted rows return."""
+    ph = repo.placeholder
+    with repo.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                f"SELECT mem_id FROM dedupe_review WHERE cluster_id = {ph} AND status = {ph}",
+                (cluster_id, STATUS_PENDING),
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if keep_id not in ids:
+                raise ValueError(f"contact {keep_id} is not in pending group {cluster_id}")
+            deleted = repo.merge(keep_id, [i for i in ids if i != keep_id], commit=False)
+            cursor.execute(
+                f"UPDATE dedupe_review SET status = {ph} WHERE cluster_id = {ph}",
+                (STATUS_MERGED, cluster_id),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    return deleted
+
+
+def dismiss_cluster(repo: ContactRepository, cluster_id: int):
+    """"Not duplicates": cluster dobara suggest nahi hoga."""
+    ph = repo.placeholder
+    with repo.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"UPDATE dedupe_review SET status = {ph} WHERE cluster_id = {ph}",
+            (STATUS_DISMISSED, cluster_id),
+        )
+        conn.commit()
+        cursor.close()
+
+
+# ============================ CLI ============================
+
+def print_progress(frac, message):
+    print(f"\r[DEDUPE] {frac:6.1%} {message:<60}", end="", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzzy duplicate contacts -> dedupe_review table")
+    parser.add_argument("--db", help="SQLite DB (default: contact_db ka configured backend)")
+    parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.db:
+        repo = ContactRepository("sqlite", conn=connect_sqlite(args.db))
+    else:
+        repo = ContactRepository()
+    repo.init_schema()
+    stats = find_duplicates(repo, args.threshold, progress=print_progress)
+    print()
+    print(
+        f"[DEDUPE] {stats['records']:,} contacts, {stats['blocks']:,} blocks, "
+        f"{stats['comparisons']:,} comparisons in {stats['elapsed']:.2f}s"
+    )
+    print(
+        f"[DEDUPE] {stats['clusters']:,} duplicate groups ({stats['duplicates']:,} extra rows) "
+        "written to dedupe_review -- GUI: Data -> Review Duplicates"
+    )
+
+
+if __name__ == "__main__":
+    main()
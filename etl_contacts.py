@@ -1,19 +1,69 @@
+import argparse
+import glob
+import os
+from datetime import datetime, timezone
 import pandas as pd
 import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
+import instrumentation
+from contact_db import FTS_TABLE, FTS_TRIGGERS, connect_sqlite, ensure_fts_index
+from contact_service import ContactRepository
+from normalize import normalize_frame
+from migrations import (
+    CHANGE_TRIGGERS,
+    STATS_TRIGGERS,
+    create_change_triggers,
+    create_stats_triggers,
+    rebuild_member_stats,
+    record_reload,
+)
+
 # RAW CSV file ka naam
 RAW_CSV = "contacts_raw.csv"
 DB_NAME = "pythontut.db"   # wahi DB jo tumhara Tkinter app use kar raha hai
+CLEAN_CSV = "contacts_clean.csv"
+
+MEMBER_COLUMNS = ["firstname", "lastname", "gender", "age", "address", "contact"]
+
+# Multi-file mode: writer itne rows ke baad commit karega (ek badi transaction)
+WRITE_BATCH_ROWS = 100_000
+
+# Bulk load mode (--bulk) ke PRAGMAs
+BULK_CACHE_KB = 512 * 1024     # ~512 MB page cache load ke dauran
+BULK_SYNCHRONOUS = "OFF"       # crash par load dobara chalana padega, data file corrupt nahi hogi (WAL)
+
+# Incremental mode (--incremental): contact number hi natural key hai
+UNIQUE_CONTACT_INDEX = "ux_member_contact"
+HASH_COLUMNS = MEMBER_COLUMNS
 
+@instrumentation.timed("etl.extract")
 def extract(csv_path: str) -> pd.DataFrame:
     """CSV se data read karo."""
     print(f"[EXTRACT] Reading data from {csv_path} ...")
-    df = pd.read_csv(csv_path)
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
     return df
 
-def transform(df: pd.DataFrame) -> pd.DataFrame:
-    """Data clean + transform karo."""
+def extract_chunks(csv_path: str, chunksize: int):
+    """CSV ko chunks me padho (poori file memory me nahi aayegi).
+
+    dtype=str taaki har chunk me column types same rahein (warna kisi chunk me
+    NaN aane par contact float ban jata hai). keep_default_na=False: "NA" / "null"
+    jaise values bhi raw string rehte hain, bilkul CSV import jaisa.
+    """
+    print(f"[EXTRACT] Streaming {csv_path} in chunks of {chunksize} rows ...")
+    chunks = pd.read_csv(csv_path, chunksize=chunksize, dtype=str, keep_default_na=False)
+    return instrumentation.timed_iter("etl.extract_chunk", chunks)
+
+@instrumentation.timed("etl.transform")
+def transform(df: pd.DataFrame, seen=None) -> pd.DataFrame:
+    """Data clean + transform karo.
+
+    seen -> SeenContacts; diya ho to pichle chunks me aa chuke contacts bhi drop honge.
+    """
     print("[TRANSFORM] Cleaning and transforming data ...")
 
     # Column names normalize
@@ -31,80 +81,661 @@ def transform(df: pd.DataFrame) -> pd.DataFrame:
     df = df[[*rename_map.keys()]]
     df = df.rename(columns=rename_map)
 
-    # String columns trim karna
-    for col in ["firstname", "lastname", "gender", "address", "contact"]:
-        df[col] = df[col].astype(str).str.strip()
-
-    # Age numeric me convert karo
-    df["age"] = pd.to_numeric(df["age"], errors="coerce")
-
-    # Invalid age remove (NaN ya <=0)
-    df = df.dropna(subset=["age"])
-    df = df[df["age"] > 0]
+    # Shared normalization engine (normalize.py): form / CSV import jaise hi rules,
+    # poore DataFrame par vectorized -- trim, name case, gender, age range, E.164 contact
+    clean = normalize_frame(df)
+    bad = clean["error"] != ""
+    if bad.any():
+        print("[TRANSFORM] Rejected rows:", int(bad.sum()))
+        for reason, n in clean.loc[bad, "error"].value_counts().items():
+            print(f"    {reason}: {n}")
+    df = clean.loc[~bad, MEMBER_COLUMNS]
 
-    # Age ko int bana do
-    df["age"] = df["age"].astype(int)
+    # age nullable hai: pd.NA -> None (sqlite3 NA bind nahi kar sakta)
+    df["age"] = df["age"].astype(object).where(df["age"].notna(), None)
 
     # Duplicate contacts remove karo (same contact number)
     df = df.drop_duplicates(subset=["contact"])
 
+    # Streaming mode: pichle chunks wale contacts bhi hatao
+    if seen is not None:
+        df = df[seen.add_new(df["contact"])]
+
     # Optional: full_name add kar sakte ho (future use ke liye)
     df["full_name"] = df["firstname"] + " " + df["lastname"]
 
     print("[TRANSFORM] Rows after cleaning:", len(df))
     return df
 
-def load_to_sqlite(df: pd.DataFrame, db_path: str):
-    """Clean data ko SQLite DB ke member table me load karo."""
-    print(f"[LOAD] Loading data into SQLite DB: {db_path}")
+class SeenContacts:
+    """Chunks ke beech duplicate contacts pakadne ke liye disk-backed set.
+
+    Private temp SQLite DB (connect("")) me rehta hai, isliye multi-GB files par
+    bhi memory bounded rehti hai. Close karte hi file delete ho jati hai.
+    """
+
+    LOOKUP_BATCH = 500  # SQLite ke bound-parameter limit se kam
+
+    def __init__(self):
+        self.conn = sqlite3.connect("")
+        self.conn.execute("CREATE TABLE seen (contact TEXT PRIMARY KEY) WITHOUT ROWID")
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Table schema same rakha hai jo tumhare Tkinter code me hai
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS member (
-            mem_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
-            firstname TEXT,
-            lastname TEXT,
-            gender TEXT,
-            age TEXT,
-            address TEXT,
-            contact TEXT
+    def add_new(self, contacts: pd.Series) -> pd.Series:
+        """Boolean mask: True = contact pehli baar dikha. Naye contacts set me add ho jate hain.
+
+        contacts me khud duplicates nahi hone chahiye (transform pehle hi hata deta hai).
+        """
+        values = contacts.tolist()
+        existing = set()
+        for i in range(0, len(values), self.LOOKUP_BATCH):
+            batch = values[i:i + self.LOOKUP_BATCH]
+            marks = ", ".join("?" * len(batch))
+            existing.update(
+                row[0] for row in self.conn.execute(
+                    f"SELECT contact FROM seen WHERE contact IN ({marks})", batch
+                )
+            )
+        mask = ~contacts.isin(existing)
+        self.conn.executemany(
+            "INSERT INTO seen (contact) VALUES (?)",
+            ((c,) for c in contacts[mask]),
+        )
+        self.conn.commit()
+        return mask
+
+    def close(self):
+        self.conn.close()
+
+def init_member_table(conn: sqlite3.Connection):
+    """member table (+ FTS index, indexes ...) banao / upgrade karo.
+
+    Wahi migrations jo Tkinter app chalata hai, dono ka schema hamesha same rahega.
+    """
+    ContactRepository("sqlite", conn=conn).init_schema()
+
+@instrumentation.timed("etl.insert_batch")
+def insert_records(conn: sqlite3.Connection, df: pd.DataFrame) -> int:
+    """DataFrame rows ko member me insert karo (commit caller karega).
+
+    itertuples generator seedha executemany ko jata hai, poori list nahi banti.
+    """
+    repo = ContactRepository("sqlite", conn=conn)
+    repo.bulk_insert(df[MEMBER_COLUMNS].itertuples(index=False, name=None), commit=False)
+    return len(df)
+
+def ensure_incremental_schema(conn: sqlite3.Connection, dedupe_existing: bool = False):
+    """Upsert ke liye row_hash column, UNIQUE(contact) index aur watermark table banao."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(member)")}
+    if "row_hash" not in columns:
+        conn.execute("ALTER TABLE member ADD COLUMN row_hash INTEGER")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS etl_watermark (
+            source TEXT PRIMARY KEY,
+            file_size INTEGER,
+            file_mtime_ns INTEGER,
+            rows_seen INTEGER,
+            inserted INTEGER,
+            updated INTEGER,
+            loaded_at TEXT
         )
     """)
 
+    has_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (UNIQUE_CONTACT_INDEX,)
+    ).fetchone()
+    if not has_index:
+        duplicates = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT contact FROM member GROUP BY contact HAVING COUNT(*) > 1)"
+        ).fetchone()[0]
+        if duplicates and not dedupe_existing:
+            raise SystemExit(
+                f"[ERROR] member me {duplicates} contact number(s) ek se zyada baar hain. "
+                "UNIQUE index nahi ban sakta -- --dedupe-existing ke saath chalao "
+                "(har contact ka sabse purana row rakha jayega)."
+            )
+        if duplicates:
+            conn.execute("""
+                DELETE FROM member WHERE mem_id NOT IN (
+                    SELECT MIN(mem_id) FROM member GROUP BY contact
+                )
+            """)
+            print(f"[INCREMENTAL] Removed duplicate rows for {duplicates} contact(s)")
+        conn.execute(f"CREATE UNIQUE INDEX {UNIQUE_CONTACT_INDEX} ON member(contact)")
+    conn.commit()
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Har row ka content hash (vectorized, signed 64-bit taaki SQLite INTEGER me fit ho)."""
+    return pd.util.hash_pandas_object(df[HASH_COLUMNS], index=False).astype("int64")
+
+@instrumentation.timed("etl.upsert_batch")
+def upsert_records(conn: sqlite3.Connection, df: pd.DataFrame) -> int:
+    """INSERT ... ON CONFLICT(contact) DO UPDATE, sirf jab row_hash badla ho.
+
+    Return: kitne rows sach me insert / update hue (unchanged rows touch hi nahi hote,
+    isliye unke triggers / index writes bhi nahi chalte).
+    """
+    records = df[MEMBER_COLUMNS].assign(row_hash=row_hashes(df))
+    repo = ContactRepository("sqlite", conn=conn)
+    return repo.bulk_upsert(
+        records.itertuples(index=False, name=None), hash_column="row_hash", commit=False
+    )
+
+class UpsertTally:
+    """Incremental load ke inserted / updated / unchanged counts.
+
+    Naye rows ko mem_id > pehle ka MAX(mem_id) se gina jata hai (rowid index, full scan nahi).
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.rows = 0
+        self.changed = 0
+        self.start_id = self.max_mem_id()
+
+    def max_mem_id(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(mem_id), 0) FROM member").fetchone()[0]
+
+    def load(self, df: pd.DataFrame) -> tuple:
+        """df ko upsert karo, (inserted, updated) return karega."""
+        before_id = self.max_mem_id()
+        changed = upsert_records(self.conn, df)
+        inserted = self.conn.execute(
+            "SELECT COUNT(*) FROM member WHERE mem_id > ?", (before_id,)
+        ).fetchone()[0]
+        self.rows += len(df)
+        self.changed += changed
+        return inserted, changed - inserted
+
+    def totals(self) -> tuple:
+        """Poore run ke (inserted, updated, unchanged)."""
+        inserted = self.conn.execute(
+            "SELECT COUNT(*) FROM member WHERE mem_id > ?", (self.start_id,)
+        ).fetchone()[0]
+        return inserted, self.changed - inserted, self.rows - self.changed
+
+    def summary(self) -> str:
+        inserted, updated, unchanged = self.totals()
+        return f"[INCREMENTAL] {inserted} new, {updated} updated, {unchanged} unchanged (skipped)"
+
+def file_fingerprint(path) -> tuple:
+    stat = Path(path).stat()
+    return stat.st_size, stat.st_mtime_ns
+
+def source_unchanged(db_path: str, path) -> bool:
+    """Watermark check: file pichle successful load ke baad se badli nahi?"""
+    if not Path(db_path).exists():
+        return False
+    conn = instrumentation.instrument(connect_sqlite(db_path))
+    try:
+        row = conn.execute(
+            "SELECT file_size, file_mtime_ns FROM etl_watermark WHERE source = ?",
+            (str(Path(path).resolve()),),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        row = None  # watermark table abhi bani hi nahi
+    finally:
+        conn.close()
+    return row is not None and tuple(row) == file_fingerprint(path)
+
+def record_watermark(conn: sqlite3.Connection, path, rows_seen: int, inserted: int, updated: int):
+    size, mtime_ns = file_fingerprint(path)
+    conn.execute("""
+        INSERT INTO etl_watermark (source, file_size, file_mtime_ns, rows_seen, inserted, updated, loaded_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(source) DO UPDATE SET
+            file_size = excluded.file_size,
+            file_mtime_ns = excluded.file_mtime_ns,
+            rows_seen = excluded.rows_seen,
+            inserted = excluded.inserted,
+            updated = excluded.updated,
+            loaded_at = excluded.loaded_at
+    """, (
+        str(Path(path).resolve()), size, mtime_ns, rows_seen, inserted, updated,
+        datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    ))
+
+@contextmanager
+def bulk_load_mode(conn: sqlite3.Connection, drop_indexes: bool = False):
+    """Load ke dauran fast PRAGMAs, baad me purani (safe) settings wapas.
+
+    FTS sync triggers load ke dauran band rehte hain aur end me FTS index ek
+    baar me rebuild hota hai -- row by row trigram indexing hi load ka sabse
+    mehenga hissa hai. member_stats triggers bhi isi tarah pause + rebuild.
+    Change feed triggers bhi band, end me ek 'R' (reload) entry.
+
+    drop_indexes=True -> member ke B-tree indexes bhi isi tarah drop + rebuild honge.
+    """
+    pragmas = ("journal_mode", "synchronous", "cache_size", "temp_store")
+    saved = {p: conn.execute(f"PRAGMA {p}").fetchone()[0] for p in pragmas}
+
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {BULK_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = -{BULK_CACHE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    index_sql = []
+    if drop_indexes:
+        index_sql = [
+            (name, sql) for name, sql in conn.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'member' AND sql IS NOT NULL"
+            )
+            # UNIQUE indexes constraints hain (incremental upsert inhi par depend karta hai)
+            if not sql.upper().startswith("CREATE UNIQUE")
+        ]
+        for name, _ in index_sql:
+            conn.execute(f'DROP INDEX "{name}"')
+        print(f"[BULK] Dropped {len(index_sql)} index(es) for the load")
+
+    fts_paused = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone() is not None
+    for trigger in FTS_TRIGGERS + STATS_TRIGGERS + CHANGE_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.commit()
+
+    try:
+        yield
+        conn.commit()
+    except BaseException:
+        # Fail hua batch commit nahi hona chahiye -- sirf poore hue batches rehte hain
+        conn.rollback()
+        raise
+    finally:
+        start = time.perf_counter()
+        with instrumentation.timer("etl.bulk_rebuild"):
+            for _, sql in index_sql:
+                conn.execute(sql)
+            if fts_paused:
+                conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+                ensure_fts_index(conn)  # triggers wapas
+            cursor = conn.cursor()
+            rebuild_member_stats(cursor)
+            create_stats_triggers(cursor)
+            create_change_triggers(cursor)
+            record_reload(cursor)
+            cursor.close()
+            conn.commit()
+        print(f"[BULK] Rebuilt indexes in {time.perf_counter() - start:.2f}s")
+
+        conn.execute(f"PRAGMA journal_mode = {saved['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous = {saved['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = {saved['cache_size']}")
+        conn.execute(f"PRAGMA temp_store = {saved['temp_store']}")
+
+def load_mode(conn: sqlite3.Connection, bulk: bool, drop_indexes: bool = False):
+    return bulk_load_mode(conn, drop_indexes) if bulk else nullcontext()
+
+@instrumentation.timed("etl.load")
+def load_to_sqlite(
+    df: pd.DataFrame,
+    db_path: str,
+    bulk: bool = False,
+    drop_indexes: bool = False,
+    batch_size: int = WRITE_BATCH_ROWS,
+    incremental: bool = False,
+    source=None,
+):
+    """Clean data ko SQLite DB ke member table me load karo.
+
+    bulk=True        -> tuned PRAGMAs + har batch_size rows par commit.
+    incremental=True -> contact par upsert (blind append nahi), source ka watermark record hoga.
+    """
+    print(f"[LOAD] Loading data into SQLite DB: {db_path}")
+    start = time.perf_counter()
+
+    conn = instrumentation.instrument(connect_sqlite(db_path))
+    init_member_table(conn)
+    tally = None
+    if incremental:
+        ensure_incremental_schema(conn)
+        tally = UpsertTally(conn)
+
     # Pehle purana data delete karna ho toh uncomment karo:
-    # cursor.execute("DELETE FROM member")
+    # conn.execute("DELETE FROM member")
 
     # Data insert karo
-    records = df[["firstname", "lastname", "gender", "age", "address", "contact"]].values.tolist()
-    cursor.executemany("""
-        INSERT INTO member (firstname, lastname, gender, age, address, contact)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, records)
+    inserted = 0
+    step = batch_size if bulk else max(len(df), 1)
+    with load_mode(conn, bulk, drop_indexes):
+        for i in range(0, len(df), step):
+            batch = df.iloc[i:i + step]
+            if tally is not None:
+                tally.load(batch)
+                inserted += len(batch)
+            else:
+                inserted += insert_records(conn, batch)
+            conn.commit()
 
+    if tally is not None:
+        if source is not None:
+            inserted_rows, updated_rows, _ = tally.totals()
+            record_watermark(conn, source, tally.rows, inserted_rows, updated_rows)
+        print(tally.summary())
     conn.commit()
     conn.close()
-    print(f"[LOAD] Inserted {len(records)} rows into 'member' table.")
+    print_load_rate(inserted, time.perf_counter() - start, incremental)
+
+def print_load_rate(rows: int, elapsed: float, incremental: bool = False):
+    """Incremental me rows = processed (insert / update / skip tally alag print hota hai)."""
+    rate = rows / elapsed if elapsed else 0
+    verb = "Processed" if incremental else "Inserted"
+    print(f"[LOAD] {verb} {rows} rows into 'member' table in {elapsed:.2f}s ({rate:,.0f} rows/sec).")
+
+@instrumentation.timed("etl.save_clean_csv")
+def save_clean_csv(df: pd.DataFrame, out_path: str = CLEAN_CSV, append: bool = False):
+    """Cleaned data ko CSV me bhi save karo (optional).
+
+    append=True -> streaming mode, header sirf pehle chunk ke saath likha jata hai.
+    """
+    df.to_csv(out_path, index=False, mode="a" if append else "w", header=not append)
+    if not append:
+        print(f"[SAVE] Cleaned data saved to {out_path}")
+
+def run_streaming(
+    csv_path: str,
+    db_path: str,
+    chunksize: int,
+    clean_csv: str = CLEAN_CSV,
+    bulk: bool = False,
+    drop_indexes: bool = False,
+    incremental: bool = False,
+):
+    """Chunk by chunk extract -> transform -> load. Memory ~ ek chunk ke barabar."""
+    seen = SeenContacts()
+    conn = instrumentation.instrument(connect_sqlite(db_path))
+    init_member_table(conn)
+    tally = None
+    if incremental:
+        ensure_incremental_schema(conn)
+        tally = UpsertTally(conn)
+
+    rows_in = 0
+    rows_out = 0
+    start = time.perf_counter()
+    try:
+        with load_mode(conn, bulk, drop_indexes):
+            for i, chunk in enumerate(extract_chunks(csv_path, chunksize)):
+                rows_in += len(chunk)
+                df_clean = transform(chunk, seen=seen)
+                save_clean_csv(df_clean, clean_csv, append=i > 0)
+                if tally is not None:
+                    tally.load(df_clean)
+                    rows_out += len(df_clean)
+                else:
+                    rows_out += insert_records(conn, df_clean)
+                conn.commit()  # har chunk ek transaction
+                print(f"[LOAD] Chunk {i + 1}: {rows_out}/{rows_in} rows loaded so far")
+        if tally is not None:
+            inserted_rows, updated_rows, _ = tally.totals()
+            record_watermark(conn, csv_path, rows_out, inserted_rows, updated_rows)
+            conn.commit()
+            print(tally.summary())
+    finally:
+        conn.close()
+        seen.close()
 
-def save_clean_csv(df: pd.DataFrame, out_path: str = "contacts_clean.csv"):
-    """Cleaned data ko CSV me bhi save karo (optional)."""
-    df.to_csv(out_path, index=False)
-    print(f"[SAVE] Cleaned data saved to {out_path}")
+    print(f"[LOAD] {rows_in - rows_out} rows dropped while cleaning.")
+    print_load_rate(rows_out, time.perf_counter() - start, incremental)
 
-def main():
+def resolve_inputs(pattern: str) -> list:
+    """--input ko files ki list me badlo: directory (saari *.csv), glob ya single file."""
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(path.glob("*.csv"))
+    if glob.has_magic(pattern):
+        return sorted(Path(p) for p in glob.glob(pattern))
+    return [path]
+
+def process_shard(csv_path: str):
+    """Worker process: ek shard ka extract + transform. (path, df, rows_in, seconds) return karega."""
+    start = time.perf_counter()
+    df_raw = extract(csv_path)
+    rows_in = len(df_raw)
+    df_clean = transform(df_raw)
+    return csv_path, df_clean, rows_in, time.perf_counter() - start
+
+def run_parallel(
+    paths: list,
+    db_path: str,
+    workers: int = 0,
+    clean_csv: str = CLEAN_CSV,
+    bulk: bool = False,
+    drop_indexes: bool = False,
+    batch_size: int = WRITE_BATCH_ROWS,
+    incremental: bool = False,
+):
+    """Shards ko ProcessPoolExecutor me extract/transform karo, load sirf is (writer) process se.
+
+    SQLite ek time pe ek hi writer allow karta hai, isliye saare workers ka output
+    yahan aata hai aur batch_size rows ki badi transactions me insert hota hai.
+    Results shard order me hi aate hain (executor.map), to duplicate contact me
+    pehli shard wala row jeetega -- har run ka result same.
+    """
+    workers = workers or os.cpu_count() or 1
+    print(f"[PARALLEL] {len(paths)} shard(s), {workers} worker process(es)")
+
+    seen = SeenContacts()
+    conn = instrumentation.instrument(connect_sqlite(db_path))
+    init_member_table(conn)
+    tally = None
+    if incremental:
+        ensure_incremental_schema(conn)
+        tally = UpsertTally(conn)
+
+    report = []
+    pending = 0
+    start = time.perf_counter()
+    try:
+        with load_mode(conn, bulk, drop_indexes), ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(process_shard, [str(p) for p in paths])
+            for i, (path, df_clean, rows_in, elapsed) in enumerate(results):
+                # Doosre shards me aa chuke contacts drop karo
+                df_clean = df_clean[seen.add_new(df_clean["contact"])]
+                save_clean_csv(df_clean, clean_csv, append=i > 0)
+                if tally is not None:
+                    inserted_rows, updated_rows = tally.load(df_clean)
+                    loaded = len(df_clean)
+                    record_watermark(conn, path, loaded, inserted_rows, updated_rows)
+                else:
+                    loaded = insert_records(conn, df_clean)
+                pending += loaded
+                if pending >= batch_size:
+                    conn.commit()
+                    pending = 0
+                report.append((path, rows_in, rows_in - loaded, elapsed))
+        conn.commit()
+        if tally is not None:
+            summary = tally.summary()
+    finally:
+        conn.close()
+        seen.close()
+
+    print_shard_report(report, time.perf_counter() - start, tally is not None)
+    if tally is not None:
+        print(summary)
+
+def print_shard_report(report: list, total_elapsed: float, incremental: bool = False):
+    """Per-shard rows in / dropped / time ka table print karo."""
+    print(f"\n{'shard':<40}{'rows in':>12}{'dropped':>12}{'seconds':>10}")
+    total_in = total_dropped = 0
+    for path, rows_in, dropped, elapsed in report:
+        total_in += rows_in
+        total_dropped += dropped
+        print(f"{Path(path).name:<40}{rows_in:>12}{dropped:>12}{elapsed:>10.2f}")
+    loaded = total_in - total_dropped
+    print(f"{'TOTAL':<40}{total_in:>12}{total_dropped:>12}{total_elapsed:>10.2f}")
+    print_load_rate(loaded, total_elapsed, incremental)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Contacts ETL: CSV -> clean -> SQLite")
+    parser.add_argument(
+        "--input",
+        default=RAW_CSV,
+        help="Raw CSV file, ya shards ke liye directory / glob (e.g. 'drops/*.csv')",
+    )
+    parser.add_argument("--db", default=DB_NAME, help="Target SQLite DB")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=0,
+        help="Itne rows ke chunks me stream karo (0 = poori file ek saath)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Multi-file mode me worker processes (0 = CPU cores)",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Bulk load mode: WAL, synchronous=OFF, bada cache, batched commits",
+    )
+    parser.add_argument(
+        "--drop-indexes",
+        action="store_true",
+        help="--bulk ke saath: load se pehle member ke non-UNIQUE B-tree indexes hatao, baad me rebuild "
+        "(FTS / stats / change feed triggers --bulk hamesha pause karta hai)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=WRITE_BATCH_ROWS,
+        help="Bulk / multi-file mode me itne rows par commit",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Contact number par upsert; unchanged rows skip, unchanged files bhi skip (watermark)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="--incremental ke saath: watermark ignore karke file dobara process karo",
+    )
+    parser.add_argument(
+        "--dedupe-existing",
+        action="store_true",
+        help="--incremental pehli baar: member ke purane duplicate contacts hatao (sabse purana row rahega)",
+    )
+    parser.add_argument(
+        "--find-duplicates",
+        action="store_true",
+        help="Load ke baad fuzzy duplicate detection (dedupe.py) -> dedupe_review table, GUI me review",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Instrumentation chalu karo: har stage / query ka timing histogram + slow queries is JSON me",
+    )
+    args = parser.parse_args(argv)
+    if args.drop_indexes and not args.bulk:
+        parser.error("--drop-indexes needs --bulk")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.metrics:
+        instrumentation.enable()
+    try:
+        run_pipeline(args)
+    finally:
+        if args.metrics:
+            instrumentation.dump(args.metrics)
+            print(f"[METRICS] Stage / query timings written to {args.metrics}")
+
+def run_pipeline(args):
+    paths = resolve_inputs(args.input)
     # Check karo raw CSV hai ya nahi
-    if not Path(RAW_CSV).exists():
-        print(f"[ERROR] {RAW_CSV} file nahi mili. Pehle CSV bana lo.")
+    if not paths or not all(p.exists() for p in paths):
+        print(f"[ERROR] {args.input} file nahi mili. Pehle CSV bana lo.")
         return
 
-    # ETL pipeline
-    df_raw = extract(RAW_CSV)
-    df_clean = transform(df_raw)
-    save_clean_csv(df_clean)
-    load_to_sqlite(df_clean, DB_NAME)
+    multi_file = len(paths) > 1 or Path(args.input).is_dir()
+    if args.incremental:
+        if args.dedupe_existing:
+            conn = connect_sqlite(args.db)
+            init_member_table(conn)
+            ensure_incremental_schema(conn, dedupe_existing=True)
+            conn.close()
+        if not args.force:
+            # Watermark: jo files last load ke baad badli hi nahi, unhe chhod do
+            changed_paths = [p for p in paths if not source_unchanged(args.db, p)]
+            for p in paths:
+                if p not in changed_paths:
+                    print(f"[INCREMENTAL] {p} unchanged since last load, skipping")
+            paths = changed_paths
+            if not paths:
+                print("[DONE] Nothing to load ✅")
+                return
+
+    if multi_file:
+        # Bahut saari CSV shards -> process pool
+        run_parallel(
+            paths,
+            args.db,
+            args.workers,
+            bulk=args.bulk,
+            drop_indexes=args.drop_indexes,
+            batch_size=args.batch_size,
+            incremental=args.incremental,
+        )
+    elif args.chunksize > 0:
+        # Streaming ETL pipeline (badi files ke liye)
+        run_streaming(
+            str(paths[0]),
+            args.db,
+            args.chunksize,
+            bulk=args.bulk,
+            drop_indexes=args.drop_indexes,
+            incremental=args.incremental,
+        )
+    else:
+        # ETL pipeline
+        df_raw = extract(str(paths[0]))
+        df_clean = transform(df_raw)
+        save_clean_csv(df_clean)
+        load_to_sqlite(
+            df_clean,
+            args.db,
+            bulk=args.bulk,
+            drop_indexes=args.drop_indexes,
+            batch_size=args.batch_size,
+            incremental=args.incremental,
+            source=paths[0],
+        )
+    prune_change_feed(args.db)
+    if args.find_duplicates:
+        find_duplicates(args.db)
     print("[DONE] ETL pipeline successfully completed ✅")
 
+def prune_change_feed(db_path: str):
+    """Bade load ke baad member_changes ko CHANGE_LOG_KEEP tak chhota karo (GUI reload kar lega)."""
+    conn = connect_sqlite(db_path)
+    try:
+        deleted = ContactRepository("sqlite", conn=conn).prune_changes()
+    finally:
+        conn.close()
+    if deleted:
+        print(f"[LOAD] Pruned {deleted} old change-feed entries")
+
+@instrumentation.timed("etl.find_duplicates")
+def find_duplicates(db_path: str):
+    """Exact duplicates transform me hi hat jate hain; yahan near-duplicates review ke liye."""
+    import dedupe
+
+    print("[DEDUPE] Looking for near-duplicate contacts ...")
+    conn = instrumentation.instrument(connect_sqlite(db_path))
+    try:
+        stats = dedupe.find_duplicates(ContactRepository("sqlite", conn=conn))
+    finally:
+        conn.close()
+    print(
+        f"[DEDUPE] {stats['clusters']} duplicate groups ({stats['duplicates']} extra rows) "
+        f"from {stats['comparisons']} comparisons in {stats['elapsed']:.2f}s -> dedupe_review"
+    )
+
 if __name__ == "__main__":
     main()
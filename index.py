@@ -3,47 +3,101 @@ from tkinter import filedialog
 import sqlite3
 import tkinter.ttk as ttk
 import tkinter.messagebox as tkMessageBox
-import csv
+import argparse
+import bisect
+import queue
+import threading
 from pathlib import Path
 
-# ======================= DATABASE CONFIG ============================
-# "sqlite"  -> local file DB
-# "mysql"   -> MySQL / AWS RDS (MySQL engine)
-DB_BACKEND = "sqlite"  # "sqlite" ya "mysql" me se ek choose karo
-
-SQLITE_DB_NAME = "pythontut.db"
-
-if DB_BACKEND == "mysql":
-    try:
-        import mysql.connector
-    except ImportError:
-        raise ImportError(
-            "mysql-connector-python install karo: pip install mysql-connector-python"
-        )
-
-    MYSQL_CONFIG = {
-        "host": "localhost",        # AWS RDS ho to yahan endpoint doge
-        "user": "root",             # apna MySQL username
-        "password": "password123",  # apna password
-        "database": "contact_db",   # apna DB naam
-    }
-
-
-def get_connection():
-    """DB backend ke hisaab se connection return karega."""
-    if DB_BACKEND == "sqlite":
-        return sqlite3.connect(SQLITE_DB_NAME)
-    elif DB_BACKEND == "mysql":
-        return mysql.connector.connect(**MYSQL_CONFIG)
-    else:
-        raise ValueError("Invalid DB_BACKEND value")
-
-
-PLACEHOLDER = "?" if DB_BACKEND == "sqlite" else "%s"
+import dedupe
+import instrumentation
+from contact_cache import ContactCache
+from contact_db import close_pool, get_pool
+from contact_shards import ShardedContactRepository, ShardedWriteQueue
+from contact_service import (
+    DEFAULT_SORT,
+    ConflictError,
+    Contact,
+    ContactFilter,
+    ContactRepository,
+    OperationCancelled,
+    sort_key,
+)
+from migrations import CHANGE_RELOAD
+from normalize import (
+    ERR_INVALID_AGE,
+    ERR_INVALID_CONTACT,
+    ERR_INVALID_GENDER,
+    MAX_AGE,
+    MIN_AGE,
+    clean_text,
+    normalize_age,
+    normalize_contact,
+    normalize_gender,
+    phone_prefixes,
+)
+from write_queue import WriteQueue
+
+# ======================= VIRTUAL LIST CONFIG ============================
+# Treeview me kabhi bhi poora table load nahi hota, sirf ek window.
+PAGE_SIZE = 200          # ek baar me DB se kitne rows laane hain
+MAX_WINDOW_ROWS = 1000   # Treeview me max kitne items rakhne hain
+PREFETCH_FRACTION = 0.1  # scroll end se itna pehle next page mangwa lo
+
+# ======================= SORT / FILTER CONFIG ============================
+# Treeview column -> (heading text, contact_service.SORT_COLUMNS ka sort)
+TREE_HEADINGS = {
+    "MemberID": ("ID", "mem_id"),
+    "Firstname": ("Firstname", "firstname"),
+    "Lastname": ("Lastname", "lastname"),
+    "Gender": ("Gender", "gender"),
+    "Age": ("Age", "age"),
+    "Address": ("Address", "address"),
+    "Contact": ("Contact", "contact"),
+}
+SORT_ARROWS = {False: " ▲", True: " ▼"}
+FILTER_GENDERS = ("", "Male", "Female", "Other")
+
+# ======================= STATISTICS CONFIG ============================
+STATS_TOP_CITIES = 10  # show_stats me kitne cities dikhani hain
+
+# ======================= SEARCH-AS-YOU-TYPE CONFIG ============================
+SEARCH_DEBOUNCE_MS = 250  # typing rukne ke itne ms baad query chalegi
+SEARCH_POLL_MS = 30       # worker thread ke results itni der me check honge
+
+# ======================= WRITE QUEUE CONFIG ============================
+WRITE_POLL_MS = 20  # background writer ke results (futures) itni der me check honge
+
+# ======================= CHANGE FEED CONFIG ============================
+CHANGE_POLL_MS = 1000      # doosre process (ETL, doosra GUI) ke changes itni der me dikhenge
+CHANGE_BATCH_LIMIT = 500   # isse zyada pending changes -> deltas ki jagah poora reload
+
+# ======================= IMPORT / EXPORT CONFIG ============================
+PROGRESS_POLL_MS = 100    # import / export progress bar kitni der me update ho
+
+# ======================= FORM VALIDATION MESSAGES ============================
+# normalize.py ke error -> form par dikhne wala message
+FORM_ERRORS = {
+    ERR_INVALID_CONTACT: "Contact must be a 10-digit mobile number or +<country code> number.",
+    ERR_INVALID_AGE: f"Age must be a whole number between {MIN_AGE} and {MAX_AGE}.",
+    ERR_INVALID_GENDER: "Please select Gender.",
+}
+
+
+class DescendingKey:
+    """sort_key ka ulta order (DESC list par bisect ke liye)."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
 
 
 class ContactApp:
-    def __init__(self, root: Tk):
+    def __init__(self, root: Tk, repo=None):
         self.root = root
         self.root.title("Contact Management System")
 
@@ -57,6 +111,8 @@ class ContactApp:
         self.root.geometry(f"{width}x{height}+{x}+{y}")
         self.root.resizable(False, False)
         self.root.config(bg="#0f172a")  # dark background
+        # Close button bhi File > Exit jaisa: mainloop ruke, window shutdown() tak rahe
+        self.root.protocol("WM_DELETE_WINDOW", self.root.quit)
 
         # Tkinter variables
         self.FIRSTNAME = StringVar()
@@ -67,114 +123,389 @@ class ContactApp:
         self.CONTACT = StringVar()
         self.SEARCH_TERM = StringVar()
 
-        # Currently selected member id
+        # Filter bar
+        self.FILTER_GENDER = StringVar()
+        self.FILTER_AGE_MIN = StringVar()
+        self.FILTER_AGE_MAX = StringVar()
+        self.FILTER_ADDRESS = StringVar()
+        self.FILTER_CONTACT = StringVar()
+
+        # Currently selected member id + uska version (jab tree me load hua tha)
         self.selected_mem_id = None
+        self.selected_version = None
+
+        # Saara DB kaam service layer se (UI-free, contact_service.py);
+        # --shards par ShardedContactRepository (contact_shards.py), interface same
+        self.repo = repo if repo is not None else ContactRepository()
+
+        # Virtual list state
+        self.current_search = ""
+        self.has_more_before = False
+        self.has_more_after = False
+        self.paging = False
+        self.sort_column = DEFAULT_SORT  # heading click se badalta hai (SORT_COLUMNS ka naam)
+        self.sort_descending = False
+        self.filters = ContactFilter()  # filter bar (Apply), khali = koi filter nahi
+        self.row_keys = {}  # tree iid -> Contact.key_for(sort_column) keyset key
+        self.row_versions = {}  # tree iid -> row version (edit / delete conflict check)
+        self.last_change_seq = None  # change feed ka last applied seq (None = feed nahi, MySQL)
+        self.cache = None  # ContactCache (Data > Load In-Memory Cache / --cache), None = seedha DB
+        self.cache_reload = None  # (cache, done Event, errors) -- feed gap ke baad silent reload
+        self.cache_note = ""  # status bar me cache ki halat (rows / MB)
+        self.status_text = ""  # status bar ka listing hissa (update_status_bar)
+
+        # Background search state
+        self.search_generation = 0     # har nayi search par +1, purane results discard
+        self.search_after_id = None    # pending debounce callback
+        self.search_poll_id = None
+        self.searches_in_flight = 0    # kitne worker threads ka result abhi aana baaki hai
+        self.search_conn = None        # in-flight search ka connection (interrupt ke liye)
+        self.search_lock = threading.Lock()
+        self.search_results = queue.Queue()
+
+        # Background writer: save / update / delete Tk thread par commit nahi karte
+        if self.repo.backend == "sharded":
+            self.write_queue = ShardedWriteQueue(self.repo)  # har shard ka apna writer
+        else:
+            self.write_queue = WriteQueue(self.repo)
+        self.write_results = queue.Queue()  # (future, callback) -- done futures
+        self.writes_in_flight = 0
+        self.write_poll_id = None
+        self.busy_forms = set()  # jin Add / Edit windows ka write abhi commit nahi hua
 
         # UI + DB
         self.create_widgets()
         self.init_db()
         self.load_contacts()
+        self.SEARCH_TERM.trace_add("write", self.on_search_term_changed)
+        self.root.after(CHANGE_POLL_MS, self.poll_changes)
 
     # ============================ DATABASE ============================
 
     def init_db(self):
-        """Create table if not exists."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS member (
-                mem_id   INTEGER NOT NULL PRIMARY KEY AUTO_INCREMENT,
-                firstname TEXT,
-                lastname  TEXT,
-                gender    TEXT,
-                age       TEXT,
-                address   TEXT,
-                contact   TEXT
-            )
-            """
-            if DB_BACKEND == "mysql"
-            else """
-            CREATE TABLE IF NOT EXISTS member (
-                mem_id   INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
-                firstname TEXT,
-                lastname  TEXT,
-                gender    TEXT,
-                age       TEXT,
-                address   TEXT,
-                contact   TEXT
-            )
-            """
+        """Schema migrations chalao (table, indexes, FTS ...), idempotent hai."""
+        self.repo.init_schema()
+        self.repo.prune_changes()
+
+    def single_db_only(self, title: str) -> bool:
+        """Feature sirf single-file backend par hai: sharded par message dikha ke False."""
+        if self.repo.backend != "sharded":
+            return True
+        tkMessageBox.showinfo(title, f"{title} is not available with the sharded backend (--shards).")
+        return False
+
+    @instrumentation.timed("ui.load_contacts")
+    def load_contacts(self, search: str = ""):
+        """Virtual list reset karo: sirf pehla page (visible window + prefetch) load hoga."""
+        # Koi background search chal rahi ho to uska result ab kaam ka nahi
+        self.cancel_background_search()
+
+        search = search.strip()
+        self.sync_cache()
+        # seq fetch se pehle: beech ke changes dobara apply ho jayenge, chhutenge nahi
+        seq = self.repo.last_change_seq()
+        rows = self.fetch_page(search=search)
+        self.show_first_page(search, rows, self.count_contacts(search), seq)
+
+    def show_first_page(self, search: str, rows, total: int, change_seq=None):
+        """Tree ko pehle page ke rows se reset karo aur status bar update karo.
+
+        change_seq: rows fetch hone se pehle ka change feed seq, iske baad ke deltas apply honge.
+        """
+        # Clear existing rows (tree me sirf ek window hota hai, isliye sasta hai)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.row_keys = {}
+        self.row_versions = {}
+        self.last_change_seq = change_seq
+
+        self.current_search = search
+        self.has_more_before = False
+        self.has_more_after = True
+
+        self.append_rows(rows)
+        if self.tree.get_children():
+            self.tree.yview_moveto(0)
+
+        self.update_status_bar(total, search)
+
+    def cache_usable(self) -> bool:
+        """Cache sirf default order (lastname ASC) aur bina filters ke listing deta hai."""
+        return (self.cache is not None and self.sort_column == DEFAULT_SORT
+                and not self.sort_descending and not self.filters)
+
+    def fetch_page(self, after_key=None, before_key=None, limit: int = PAGE_SIZE, search=None):
+        """Keyset page (cache ya repo.fetch_page), search None ho to current_search use hoga."""
+        if search is None:
+            search = self.current_search
+        if self.cache_usable():
+            return self.cache.fetch_page(search, after_key=after_key, before_key=before_key, limit=limit)
+        return self.repo.fetch_page(
+            search, after_key=after_key, before_key=before_key, limit=limit,
+            sort=self.sort_column, descending=self.sort_descending, filters=self.filters,
         )
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-    def load_contacts(self, search: str = ""):
-        """Load contacts from DB into Treeview. Optional search."""
-        # Clear existing rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+    def count_contacts(self, search: str = "") -> int:
+        if self.cache_usable():
+            return self.cache.count(search)
+        return self.repo.count(search, self.filters)
+
+    def get_many(self, mem_ids, search: str = "") -> list:
+        if self.cache_usable():
+            return self.cache.get_many(mem_ids, search)
+        return self.repo.get_many(mem_ids, search, self.filters)
+
+    def display_key(self, key):
+        """Row key -> tree order me comparable (bisect ke liye)."""
+        key = sort_key(key)
+        return DescendingKey(key) if self.sort_descending else key
+
+    # ============================ VIRTUAL LIST ============================
+
+    @instrumentation.timed("ui.tree_fill")
+    def append_rows(self, rows):
+        for contact in rows:
+            iid = self.tree.insert("", "end", values=contact.as_row())
+            self.row_keys[iid] = contact.key_for(self.sort_column)
+            self.row_versions[iid] = contact.version
+        if len(rows) < PAGE_SIZE:
+            self.has_more_after = False
+        self.trim_window(from_top=True)
+
+    @instrumentation.timed("ui.tree_fill")
+    def prepend_rows(self, rows):
+        for contact in reversed(rows):
+            iid = self.tree.insert("", 0, values=contact.as_row())
+            self.row_keys[iid] = contact.key_for(self.sort_column)
+            self.row_versions[iid] = contact.version
+        if len(rows) < PAGE_SIZE:
+            self.has_more_before = False
+        self.trim_window(from_top=False)
+
+    def trim_window(self, from_top: bool):
+        """Tree me MAX_WINDOW_ROWS se zyada items na rahein, taaki Tk memory flat rahe."""
+        children = self.tree.get_children()
+        extra = len(children) - MAX_WINDOW_ROWS
+        if extra <= 0:
+            return
+        victims = children[:extra] if from_top else children[-extra:]
+        self.tree.delete(*victims)
+        for iid in victims:
+            self.row_keys.pop(iid, None)
+            self.row_versions.pop(iid, None)
+        if from_top:
+            self.has_more_before = True
+        else:
+            self.has_more_after = True
 
-        query = "SELECT mem_id, firstname, lastname, gender, age, address, contact FROM member"
-        params = ()
-        if search.strip():
-            if DB_BACKEND == "sqlite":
-                query += " WHERE firstname LIKE ? OR lastname LIKE ? OR contact LIKE ?"
-            else:
-                query += " WHERE firstname LIKE %s OR lastname LIKE %s OR contact LIKE %s"
-            like = f"%{search.strip()}%"
-            params = (like, like, like)
-
-        query += " ORDER BY lastname ASC"
-
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        for data in rows:
-            self.tree.insert("", "end", values=data)
-
-        self.update_status_bar(len(rows), search)
-
-    def insert_contact(self, firstname, lastname, gender, age, address, contact):
-        conn = get_connection()
-        cursor = conn.cursor()
-        query = (
-            f"INSERT INTO member (firstname, lastname, gender, age, address, contact) "
-            f"VALUES ({PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER})"
-        )
-        cursor.execute(query, (firstname, lastname, gender, age, address, contact))
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-    def update_contact(self, mem_id, firstname, lastname, gender, age, address, contact):
-        conn = get_connection()
-        cursor = conn.cursor()
-        query = (
-            f"UPDATE member SET firstname = {PLACEHOLDER}, lastname = {PLACEHOLDER}, "
-            f"gender = {PLACEHOLDER}, age = {PLACEHOLDER}, address = {PLACEHOLDER}, contact = {PLACEHOLDER} "
-            f"WHERE mem_id = {PLACEHOLDER}"
-        )
-        cursor.execute(
-            query, (firstname, lastname, gender, age, address, contact, mem_id)
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-    def delete_contact_from_db(self, mem_id):
-        conn = get_connection()
-        cursor = conn.cursor()
-        query = f"DELETE FROM member WHERE mem_id = {PLACEHOLDER}"
-        cursor.execute(query, (mem_id,))
-        conn.commit()
-        cursor.close()
-        conn.close()
+    def on_tree_yscroll(self, first, last):
+        """Treeview yscrollcommand: scrollbar update + zarurat ho to next/prev page."""
+        self.scrollbary.set(first, last)
+        if self.paging:
+            return
+        first, last = float(first), float(last)
+        if last >= 1.0 - PREFETCH_FRACTION and self.has_more_after:
+            self.root.after_idle(self.load_next_page)
+        elif first <= PREFETCH_FRACTION and self.has_more_before:
+            self.root.after_idle(self.load_previous_page)
+
+    def load_next_page(self):
+        children = self.tree.get_children()
+        if self.paging or not children or not self.has_more_after:
+            return
+        self.paging = True
+        try:
+            anchor = children[-1]
+            rows = self.fetch_page(after_key=self.row_keys[anchor])
+            if not rows:
+                self.has_more_after = False
+                return
+            self.append_rows(rows)
+            # Jo row pehle dikh rahi thi wahi view me rahe (trim ke baad bhi)
+            self.tree.see(anchor)
+        finally:
+            self.paging = False
+
+    def load_previous_page(self):
+        children = self.tree.get_children()
+        if self.paging or not children or not self.has_more_before:
+            return
+        self.paging = True
+        try:
+            anchor = children[0]
+            rows = self.fetch_page(before_key=self.row_keys[anchor])
+            if not rows:
+                self.has_more_before = False
+                return
+            self.prepend_rows(rows)
+            self.tree.see(anchor)
+        finally:
+            self.paging = False
+
+    # ============================ CHANGE FEED ============================
+
+    def poll_changes(self):
+        """root.after loop: doosre processes (ETL, doosra GUI) ke writes bhi sasti PK range query se."""
+        try:
+            if self.last_change_seq is not None:
+                self.apply_changes()
+        finally:
+            self.root.after(CHANGE_POLL_MS, self.poll_changes)
+
+    @instrumentation.timed("ui.apply_changes")
+    def apply_changes(self):
+        """last_change_seq ke baad ke changes tree par lagao: sirf wahi rows hatao / sahi jagah daalo.
+
+        Feed na ho (MySQL), beech ke changes prune ho gaye hon, bulk load ('R') ya
+        bahut saare changes -> poora reload.
+        """
+        self.sync_cache()
+        changes = None
+        if self.last_change_seq is not None:
+            changes = self.repo.changes_since(self.last_change_seq, CHANGE_BATCH_LIMIT + 1)
+        if (changes is None or len(changes) > CHANGE_BATCH_LIMIT
+                or any(op == CHANGE_RELOAD for _, op, _ in changes)):
+            self.load_contacts(self.current_search)
+            return
+        if not changes:
+            return
+        self.last_change_seq = changes[-1][0]
+
+        # Har touched mem_id ki latest state DB se: insert / update / delete sab = hatao + wapas daalo
+        touched = {mem_id for _, _, mem_id in changes}
+        fresh = self.get_many(touched, self.current_search)
+        iid_of = {key[-1]: iid for iid, key in self.row_keys.items()}
+        gone = [iid_of[mem_id] for mem_id in touched if mem_id in iid_of]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self.row_keys[iid]
+                self.row_versions.pop(iid, None)
+
+        keys = [self.display_key(self.row_keys[iid]) for iid in self.tree.get_children()]
+        for contact in fresh:
+            key = self.display_key(contact.key_for(self.sort_column))
+            pos = bisect.bisect_left(keys, key)
+            # Window ke bahar ka row: scroll karne par apne page ke saath aayega
+            if (pos == 0 and self.has_more_before) or (pos == len(keys) and self.has_more_after):
+                continue
+            iid = self.tree.insert("", pos, values=contact.as_row())
+            keys.insert(pos, key)
+            self.row_keys[iid] = contact.key_for(self.sort_column)
+            self.row_versions[iid] = contact.version
+        self.trim_window(from_top=False)
+        self.update_status_bar(self.count_contacts(self.current_search), self.current_search)
+
+    # ============================ IN-MEMORY CACHE ============================
+
+    def enable_cache(self):
+        """member ko RAM me load karo (background), phir listing / search cache se."""
+        if self.repo.backend != "sqlite":
+            tkMessageBox.showinfo("Cache", "In-memory cache needs the SQLite backend.")
+            return
+        cache = ContactCache(self.repo)
+
+        def job(progress, cancel_event):
+            return cache.load(
+                lambda frac, rows: progress(frac, f"Loaded {rows} contacts ..."), cancel_event
+            )
+
+        def on_done(rows):
+            self.set_cache(cache)
+            self.load_contacts(self.current_search)
+
+        self.run_with_progress("In-Memory Cache", "Loading contacts ...", job, on_done)
+
+    def sync_cache(self):
+        """Cache ko change feed se DB ke barabar lao. Feed follow na ho sake to DB par wapas
+        aa jao aur cache background me chupchaap (bina progress window) dobara load karo."""
+        if self.cache_reload is not None:
+            self.finish_cache_reload()
+        if self.cache is None:
+            return
+        if self.cache.sync(reload=False) is None:
+            cache, self.cache = self.cache, None
+            self.start_cache_reload(cache)
+            self.show_status()
+
+    def start_cache_reload(self, cache):
+        """Worker thread me cache.load(); swap poll_changes (main thread) karega."""
+        done = threading.Event()
+        errors = []
+
+        def worker():
+            try:
+                cache.load()
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                done.set()
+
+        self.cache_reload = (cache, done, errors)
+        threading.Thread(target=worker, daemon=True).start()
+
+    def finish_cache_reload(self):
+        cache, done, errors = self.cache_reload
+        if not done.is_set():
+            return
+        self.cache_reload = None
+        if errors:
+            self.cache_note = ""
+            self.show_status()
+            tkMessageBox.showwarning(
+                "In-Memory Cache",
+                f"Reloading the cache failed, using the database instead.\n\n{errors[0]}\n\n"
+                "Use Data > Load In-Memory Cache to try again.",
+            )
+            return
+        self.set_cache(cache)
+
+    def set_cache(self, cache):
+        self.cache = cache
+        report = cache.memory_report()
+        self.cache_note = f"In-memory cache ({report['total_bytes'] / 1e6:.1f} MB)"
+        self.show_status()
+
+    # ============================ WRITE QUEUE ============================
+
+    def after_write(self, future, callback):
+        """future (WriteQueue) commit / fail hone par callback(future) main thread par."""
+        future.add_done_callback(lambda f: self.write_results.put((f, callback)))
+        self.writes_in_flight += 1
+        if self.write_poll_id is None:
+            self.write_poll_id = self.root.after(WRITE_POLL_MS, self.poll_write_results)
+
+    def poll_write_results(self):
+        self.write_poll_id = None
+        while True:
+            try:
+                future, callback = self.write_results.get_nowait()
+            except queue.Empty:
+                break
+            self.writes_in_flight -= 1
+            callback(future)
+        if self.writes_in_flight > 0:
+            self.write_poll_id = self.root.after(WRITE_POLL_MS, self.poll_write_results)
+
+    def close_form(self, win: Toplevel):
+        """Write commit hone tak user window band kar chuka ho sakta hai."""
+        self.busy_forms.discard(win)
+        if win.winfo_exists():
+            win.destroy()
+
+    def shutdown(self):
+        """Exit: pending writes flush karo (pool band hone se pehle).
+
+        Window abhi bhi zinda hai (mainloop quit hua, destroy nahi), to flush na ho
+        paaye to user ko yahin batao.
+        """
+        if not self.write_queue.close():
+            tkMessageBox.showwarning(
+                "Exit",
+                "Some changes were still being saved and could not be written before exit.\n\n"
+                "Please reopen the app and check your last edits.",
+            )
 
     # ============================ VALIDATION ============================
 
@@ -188,20 +519,34 @@ class ContactApp:
             return False, "Please select Gender."
         if not self.AGE.get().strip():
             return False, "Please enter Age."
-        if not self.AGE.get().isdigit():
-            return False, "Age must be a number."
-        if int(self.AGE.get()) <= 0:
-            return False, "Age must be greater than 0."
         if not self.ADDRESS.get().strip():
             return False, "Please enter Address."
         if not self.CONTACT.get().strip():
             return False, "Please enter Contact number."
-        if not self.CONTACT.get().isdigit():
-            return False, "Contact must contain only digits."
-        if len(self.CONTACT.get()) < 7:
-            return False, "Contact number looks too short."
+        _, error = normalize_contact(*self.form_values())
+        if error:
+            return False, FORM_ERRORS.get(error, error.capitalize() + ".")
         return True, ""
 
+    def form_values(self) -> tuple:
+        return (
+            self.FIRSTNAME.get(), self.LASTNAME.get(), self.GENDER.get(),
+            self.AGE.get(), self.ADDRESS.get(), self.CONTACT.get(),
+        )
+
+    def contact_from_form(self, mem_id=None, version=None) -> Contact:
+        """Validated form fields -> normalized Contact (import / ETL jaisa hi data)."""
+        values, _ = normalize_contact(*self.form_values())
+        return Contact(*values, mem_id, version)
+
+    def fill_form(self, contact: Contact):
+        self.FIRSTNAME.set(contact.firstname or "")
+        self.LASTNAME.set(contact.lastname or "")
+        self.GENDER.set(contact.gender or "")
+        self.AGE.set("" if contact.age is None else str(contact.age))
+        self.ADDRESS.set(contact.address or "")
+        self.CONTACT.set(contact.contact or "")
+
     def clear_form(self):
         self.FIRSTNAME.set("")
         self.LASTNAME.set("")
@@ -215,8 +560,28 @@ class ContactApp:
     def update_status_bar(self, count: int, search: str):
         if search.strip():
             msg = f"Showing {count} contact(s) for search: '{search.strip()}'"
+        elif self.filters:
+            msg = f"Showing {count} contact(s)"
         else:
             msg = f"Total contacts: {count}"
+        if self.filters:
+            msg += " (filtered)"
+        self.status_text = msg
+        self.show_status()
+
+    def show_status(self):
+        """Listing ka status + cache ki halat (cache load / background reload).
+
+        Cache search ke results DB search se alag ho sakte hain, isliye woh bhi dikhao.
+        """
+        msg = self.status_text
+        if self.cache is not None:
+            msg += f"   |   {self.cache_note}"
+            if self.current_search and self.cache_usable():
+                # Cache naam / number ka prefix (ya number suffix) match karta hai, DB substring
+                msg += ", prefix search"
+        elif self.cache_reload is not None:
+            msg += "   |   Reloading in-memory cache in background ..."
         self.status_label.config(text=msg)
 
     # ============================ UI SETUP ============================
@@ -226,10 +591,28 @@ class ContactApp:
         menubar = Menu(self.root, bg="#020617", fg="white", tearoff=0)
         file_menu = Menu(menubar, tearoff=0)
         file_menu.add_command(label="Import from CSV", command=self.import_from_csv)
-        file_menu.add_command(label="Export to CSV", command=self.export_to_csv)
+        file_menu.add_command(label="Export (CSV / gzip / Parquet / Arrow)", command=self.export_to_csv)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         menubar.add_cascade(label="File", menu=file_menu)
+
+        data_menu = Menu(menubar, tearoff=0)
+        data_menu.add_command(label="Find Duplicates...", command=self.find_duplicates)
+        data_menu.add_command(label="Review Duplicates...", command=self.open_duplicate_review)
+        data_menu.add_separator()
+        data_menu.add_command(label="Bulk Edit...", command=self.open_bulk_edit_window)
+        data_menu.add_command(label="Delete All Matching...", command=lambda: self.bulk_delete_contacts())
+        data_menu.add_command(label="Undo Last Bulk Change", command=self.undo_last_bulk_change)
+        data_menu.add_separator()
+        data_menu.add_command(label="Load In-Memory Cache", command=self.enable_cache)
+        menubar.add_cascade(label="Data", menu=data_menu)
+
+        diag_menu = Menu(menubar, tearoff=0)
+        diag_menu.add_command(label="Show Metrics / Slow Queries", command=self.show_diagnostics)
+        diag_menu.add_command(label="Dump Metrics to File...", command=self.dump_metrics)
+        diag_menu.add_command(label="Enable Instrumentation", command=self.enable_instrumentation)
+        diag_menu.add_command(label="Reset Metrics", command=instrumentation.reset)
+        menubar.add_cascade(label="Diagnostics", menu=diag_menu)
         self.root.config(menu=menubar)
 
         # Top title frame
@@ -345,6 +728,51 @@ class ContactApp:
         )
         btn_clear_search.grid(row=0, column=3, padx=5)
 
+        # Filter bar: structured filters, Apply par server-side query (search ke saath AND)
+        filter_bar = Frame(mid_center, bg="#0f172a")
+        filter_bar.grid(row=1, column=0, columnspan=4, sticky=W, pady=(6, 0))
+        lbl_style = {"font": ("Segoe UI", 9), "bg": "#0f172a", "fg": "#e5e7eb"}
+        entry_style = {"font": ("Segoe UI", 9), "relief": FLAT}
+
+        Label(filter_bar, text="Gender:", **lbl_style).grid(row=0, column=0, sticky=W)
+        ttk.Combobox(
+            filter_bar,
+            textvariable=self.FILTER_GENDER,
+            values=FILTER_GENDERS,
+            state="readonly",
+            width=8,
+        ).grid(row=0, column=1, sticky=W, padx=(2, 10), pady=2)
+        Label(filter_bar, text="Age:", **lbl_style).grid(row=0, column=2, sticky=W)
+        Entry(filter_bar, textvariable=self.FILTER_AGE_MIN, width=4, **entry_style).grid(
+            row=0, column=3, sticky=W, padx=2
+        )
+        Label(filter_bar, text="to", **lbl_style).grid(row=0, column=4)
+        Entry(filter_bar, textvariable=self.FILTER_AGE_MAX, width=4, **entry_style).grid(
+            row=0, column=5, sticky=W, padx=2
+        )
+        Label(filter_bar, text="Address has:", **lbl_style).grid(row=1, column=0, sticky=W)
+        Entry(filter_bar, textvariable=self.FILTER_ADDRESS, width=14, **entry_style).grid(
+            row=1, column=1, columnspan=2, sticky=W, padx=(2, 10), pady=2
+        )
+        Label(filter_bar, text="Contact starts:", **lbl_style).grid(row=1, column=3, columnspan=2, sticky=W)
+        Entry(filter_bar, textvariable=self.FILTER_CONTACT, width=14, **entry_style).grid(
+            row=1, column=5, sticky=W, padx=2
+        )
+        Button(
+            filter_bar,
+            text="Apply Filters",
+            command=self.on_apply_filters,
+            width=12,
+            font=("Segoe UI", 9, "bold"),
+        ).grid(row=0, column=6, padx=(10, 0))
+        Button(
+            filter_bar,
+            text="Reset Filters",
+            command=self.on_reset_filters,
+            width=12,
+            font=("Segoe UI", 9, "bold"),
+        ).grid(row=1, column=6, padx=(10, 0))
+
         # Table frame
         table_margin = Frame(self.root, width=800, bg="#020617")
         table_margin.pack(side=TOP, fill=BOTH, expand=True, padx=10, pady=5)
@@ -368,7 +796,7 @@ class ContactApp:
         style.map("Treeview", background=[("selected", "#1d4ed8")])
 
         scrollbarx = Scrollbar(table_margin, orient=HORIZONTAL)
-        scrollbary = Scrollbar(table_margin, orient=VERTICAL)
+        self.scrollbary = Scrollbar(table_margin, orient=VERTICAL)
 
         self.tree = ttk.Treeview(
             table_margin,
@@ -382,24 +810,20 @@ class ContactApp:
                 "Contact",
             ),
             height=10,
-            selectmode="browse",
-            yscrollcommand=scrollbary.set,
+            selectmode="extended",  # Ctrl / Shift click -> bulk edit / delete
+            yscrollcommand=self.on_tree_yscroll,
             xscrollcommand=scrollbarx.set,
         )
 
         scrollbarx.config(command=self.tree.xview)
-        scrollbary.config(command=self.tree.yview)
+        self.scrollbary.config(command=self.tree.yview)
         scrollbarx.pack(side=BOTTOM, fill=X)
-        scrollbary.pack(side=RIGHT, fill=Y)
+        self.scrollbary.pack(side=RIGHT, fill=Y)
 
-        # Tree headings
-        self.tree.heading("MemberID", text="ID", anchor=W)
-        self.tree.heading("Firstname", text="Firstname", anchor=W)
-        self.tree.heading("Lastname", text="Lastname", anchor=W)
-        self.tree.heading("Gender", text="Gender", anchor=W)
-        self.tree.heading("Age", text="Age", anchor=W)
-        self.tree.heading("Address", text="Address", anchor=W)
-        self.tree.heading("Contact", text="Contact", anchor=W)
+        # Tree headings: click = us column se sort (dobara click = ulta order)
+        for column in TREE_HEADINGS:
+            self.tree.heading(column, anchor=W, command=lambda c=column: self.on_heading_click(c))
+        self.update_heading_arrows()
 
         self.tree.column("#0", stretch=NO, minwidth=0, width=0)
         self.tree.column("MemberID", stretch=NO, minwidth=40, width=50)
@@ -412,6 +836,7 @@ class ContactApp:
 
         self.tree.pack(fill=BOTH, expand=True)
         self.tree.bind("<Double-Button-1>", self.on_tree_double_click)
+        self.tree.bind("<Delete>", lambda event: self.delete_selected_contact())
 
         # Status bar
         status_frame = Frame(self.root, bd=1, relief=SUNKEN, bg="#020617")
@@ -427,15 +852,150 @@ class ContactApp:
         )
         self.status_label.pack(fill=X)
 
+    # ============================ SORT / FILTER ============================
+
+    def update_heading_arrows(self):
+        for column, (text, sort) in TREE_HEADINGS.items():
+            if sort == self.sort_column:
+                text += SORT_ARROWS[self.sort_descending]
+            self.tree.heading(column, text=text)
+
+    def on_heading_click(self, column: str):
+        """Heading click: naya column -> ASC, wahi column -> direction ulta. Sort DB karta hai."""
+        sort = TREE_HEADINGS[column][1]
+        if sort == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = sort
+            self.sort_descending = False
+        self.update_heading_arrows()
+        self.start_background_search(self.current_search)
+
+    def filters_from_bar(self):
+        """Filter bar -> (ContactFilter, None) ya (None, error message)."""
+        ages = []
+        for var in (self.FILTER_AGE_MIN, self.FILTER_AGE_MAX):
+            text = var.get().strip()
+            age, ok = normalize_age(text) if text else (None, True)
+            if not ok:
+                return None, FORM_ERRORS[ERR_INVALID_AGE]
+            ages.append(age)
+        if None not in ages and ages[0] > ages[1]:
+            return None, "Age 'from' must not be greater than age 'to'."
+        contact = self.FILTER_CONTACT.get().strip()
+        if contact and phone_prefixes(contact) is None:
+            return None, "Contact filter must be the start of a phone number (digits, optional +)."
+        return ContactFilter(
+            gender=self.FILTER_GENDER.get(),
+            age_min=ages[0],
+            age_max=ages[1],
+            address=self.FILTER_ADDRESS.get().strip(),
+            contact_prefix=contact,
+        ), None
+
+    def on_apply_filters(self):
+        filters, error = self.filters_from_bar()
+        if error:
+            tkMessageBox.showwarning("Filter", error)
+            return
+        self.filters = filters
+        self.start_background_search(self.current_search)
+
+    def on_reset_filters(self):
+        for var in (self.FILTER_GENDER, self.FILTER_AGE_MIN, self.FILTER_AGE_MAX,
+                    self.FILTER_ADDRESS, self.FILTER_CONTACT):
+            var.set("")
+        self.filters = ContactFilter()
+        self.start_background_search(self.current_search)
+
     # ============================ SEARCH ============================
 
     def on_search(self):
-        term = self.SEARCH_TERM.get()
-        self.load_contacts(term)
+        # Button / Enter: debounce ka wait mat karo, turant search chalao
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+            self.search_after_id = None
+        self.start_background_search(self.SEARCH_TERM.get())
 
     def on_clear_search(self):
         self.SEARCH_TERM.set("")
-        self.load_contacts()
+        self.on_search()
+
+    def on_search_term_changed(self, *args):
+        """SEARCH_TERM trace: har keystroke par timer reset (debounce)."""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.on_search)
+
+    def cancel_background_search(self):
+        """In-flight search ko cancel karo aur uske result ko stale mark karo."""
+        self.search_generation += 1
+        with self.search_lock:
+            # Lock ke andar hi interrupt, taaki connection pool me wapas jaane ke baad
+            # kisi aur ki query interrupt na ho
+            interrupt = getattr(self.search_conn, "interrupt", None)  # sqlite3 only
+            if interrupt is not None:
+                interrupt()
+
+    def start_background_search(self, term: str):
+        self.cancel_background_search()
+        generation = self.search_generation
+        threading.Thread(
+            target=self.search_worker,
+            args=(generation, term.strip()),
+            daemon=True,
+        ).start()
+        self.searches_in_flight += 1
+        if self.search_poll_id is None:
+            self.search_poll_id = self.root.after(SEARCH_POLL_MS, self.poll_search_results)
+
+    def search_worker(self, generation: int, term: str):
+        """Worker thread: query chalao, result queue me daalo. Tk ko yahan se touch nahi karna.
+
+        Har worker queue me exactly ek item daalta hai (cancel hone par result None).
+        """
+        result = None
+        try:
+            # Pool thread affinity: fetch_page / count_contacts isi thread par
+            # yahi connection dobara paayenge, isliye interrupt dono ko cover karta hai
+            with self.repo.connection() as conn:
+                with self.search_lock:
+                    self.search_conn = conn
+                try:
+                    if generation == self.search_generation:
+                        seq = self.repo.last_change_seq()
+                        rows = self.fetch_page(search=term)
+                        total = self.count_contacts(term)
+                        result = (rows, total, seq)
+                finally:
+                    with self.search_lock:
+                        self.search_conn = None
+        except sqlite3.OperationalError:
+            # conn.interrupt() -> "interrupted", nayi search aa chuki hai
+            pass
+        finally:
+            self.search_results.put((generation, term, result))
+
+    def poll_search_results(self):
+        """Main thread (root.after) par worker ke results apply karo."""
+        self.search_poll_id = None
+        latest = None
+        while True:
+            try:
+                generation, term, result = self.search_results.get_nowait()
+            except queue.Empty:
+                break
+            self.searches_in_flight -= 1
+            if generation == self.search_generation and result is not None:
+                latest = (term, result)
+
+        if latest is not None:
+            term, (rows, total, seq) = latest
+            self.show_first_page(term, rows, total, seq)
+
+        if self.searches_in_flight > 0:
+            # Koi search abhi chal rahi hai, thodi der baad fir check karo
+            self.search_poll_id = self.root.after(SEARCH_POLL_MS, self.poll_search_results)
 
     # ============================ TREE EVENTS ============================
 
@@ -448,6 +1008,10 @@ class ContactApp:
         selected = contents.get("values")
         return selected
 
+    def selected_mem_ids(self) -> list:
+        """Tree me select kiye saare rows ke mem_ids (extended selection, tree order me)."""
+        return [self.row_keys[iid][-1] for iid in self.tree.selection() if iid in self.row_keys]
+
     def on_tree_double_click(self, event):
         self.open_edit_window_from_selection()
 
@@ -472,6 +1036,9 @@ class ContactApp:
         self.build_form(win, mode="add")
 
     def open_edit_window_from_selection(self):
+        if len(self.selected_mem_ids()) > 1:
+            self.open_bulk_edit_window()
+            return
         row = self.get_selected_row()
         if not row:
             tkMessageBox.showwarning("Warning", "Please select a contact first.")
@@ -479,6 +1046,7 @@ class ContactApp:
 
         # row layout: (mem_id, firstname, lastname, gender, age, address, contact)
         self.selected_mem_id = row[0]
+        self.selected_version = self.row_versions.get(self.tree.focus())
         self.FIRSTNAME.set(row[1])
         self.LASTNAME.set(row[2])
         self.GENDER.set(row[3])
@@ -607,25 +1175,35 @@ class ContactApp:
     # ============================ FORM ACTIONS ============================
 
     def on_save(self, win: Toplevel):
+        if win in self.busy_forms:
+            return  # pichla Save abhi commit ho raha hai (double click)
         ok, msg = self.validate_contact_form()
         if not ok:
             tkMessageBox.showwarning("Validation Error", msg)
             return
 
-        self.insert_contact(
-            self.FIRSTNAME.get().strip(),
-            self.LASTNAME.get().strip(),
-            self.GENDER.get().strip(),
-            self.AGE.get().strip(),
-            self.ADDRESS.get().strip(),
-            self.CONTACT.get().strip(),
-        )
-        tkMessageBox.showinfo("Success", "Contact saved successfully.")
-        self.clear_form()
-        win.destroy()
-        self.load_contacts()
+        def done(future):
+            self.busy_forms.discard(win)
+            try:
+                future.result()
+            except sqlite3.IntegrityError:
+                # Incremental ETL ke baad member.contact par UNIQUE index hota hai
+                tkMessageBox.showwarning("Duplicate", "This contact number already exists.")
+                return
+            except Exception as exc:
+                tkMessageBox.showerror("Error", str(exc))
+                return
+            tkMessageBox.showinfo("Success", "Contact saved successfully.")
+            self.clear_form()
+            self.close_form(win)
+            self.apply_changes()
+
+        self.busy_forms.add(win)
+        self.after_write(self.write_queue.insert(self.contact_from_form()), done)
 
     def on_update(self, win: Toplevel):
+        if win in self.busy_forms:
+            return
         if self.selected_mem_id is None:
             tkMessageBox.showwarning("Warning", "No contact selected to update.")
             return
@@ -635,68 +1213,404 @@ class ContactApp:
             tkMessageBox.showwarning("Validation Error", msg)
             return
 
-        self.update_contact(
-            self.selected_mem_id,
-            self.FIRSTNAME.get().strip(),
-            self.LASTNAME.get().strip(),
-            self.GENDER.get().strip(),
-            self.AGE.get().strip(),
-            self.ADDRESS.get().strip(),
-            self.CONTACT.get().strip(),
+        def done(future):
+            self.busy_forms.discard(win)
+            try:
+                found = future.result()
+            except sqlite3.IntegrityError:
+                tkMessageBox.showwarning("Duplicate", "Another contact already has this number.")
+                return
+            except ConflictError as exc:
+                self.resolve_update_conflict(win, exc.current)
+                return
+            except Exception as exc:
+                tkMessageBox.showerror("Error", str(exc))
+                return
+            if not found:
+                tkMessageBox.showerror("Not Found", "This contact was deleted by someone else.")
+                self.close_form(win)
+                self.apply_changes()
+                return
+            tkMessageBox.showinfo("Success", "Contact updated successfully.")
+            self.clear_form()
+            self.close_form(win)
+            self.apply_changes()
+
+        self.busy_forms.add(win)
+        contact = self.contact_from_form(self.selected_mem_id, self.selected_version)
+        self.after_write(self.write_queue.update(contact), done)
+
+    def resolve_update_conflict(self, win: Toplevel, current: Contact):
+        """Edit ke beech kisi aur ne row badal diya: overwrite / unka version load / editing jaari."""
+        when = f" at {current.updated_at}" if current.updated_at else ""
+        answer = tkMessageBox.askyesnocancel(
+            "Edit Conflict",
+            f"This contact was changed by someone else{when} while you were editing.\n\n"
+            f"Their version: {current.firstname} {current.lastname}, {current.gender or '-'}, "
+            f"{current.age if current.age is not None else '-'}, {current.address or '-'}, {current.contact}\n\n"
+            "Yes - overwrite with your changes\n"
+            "No - discard your changes and load theirs\n"
+            "Cancel - keep editing",
+            icon="warning",
         )
-        tkMessageBox.showinfo("Success", "Contact updated successfully.")
-        self.clear_form()
-        win.destroy()
-        self.load_contacts()
+        if answer is None:
+            return
+        self.selected_version = current.version
+        if answer:
+            self.on_update(win)
+        else:
+            self.fill_form(current)
 
     def delete_selected_contact(self):
+        mem_ids = self.selected_mem_ids()
+        if len(mem_ids) > 1:
+            self.bulk_delete_contacts(mem_ids)
+            return
         row = self.get_selected_row()
         if not row:
             tkMessageBox.showwarning("Warning", "Please select a contact first.")
             return
 
         mem_id = row[0]
+        version = self.row_versions.get(self.tree.focus())
         answer = tkMessageBox.askquestion(
             "Confirm Delete",
             "Are you sure you want to delete this record?",
             icon="warning",
         )
-        if answer == "yes":
-            self.delete_contact_from_db(mem_id)
-            self.load_contacts()
-            tkMessageBox.showinfo("Deleted", "Contact deleted successfully.")
+        if answer != "yes":
+            return
+
+        def done(future):
+            try:
+                found = future.result()
+            except ConflictError:
+                if tkMessageBox.askyesno(
+                    "Edit Conflict",
+                    "This contact was changed by someone else since it was loaded.\n\nDelete it anyway?",
+                    icon="warning",
+                ):
+                    self.after_write(self.write_queue.delete(mem_id), done)
+                else:
+                    self.apply_changes()
+                return
+            except Exception as exc:
+                tkMessageBox.showerror("Error", str(exc))
+                return
+            self.apply_changes()
+            if found:
+                tkMessageBox.showinfo("Deleted", "Contact deleted successfully.")
+            else:
+                tkMessageBox.showinfo("Deleted", "Contact was already deleted by someone else.")
+
+        self.after_write(self.write_queue.delete(mem_id, version), done)
+
+    # ============================ BULK EDIT / DELETE ============================
+
+    def bulk_scope_text(self, mem_ids) -> str:
+        if mem_ids is not None:
+            return f"{len(mem_ids)} selected contacts"
+        return f"all {self.count_contacts(self.current_search)} contacts in the current list"
+
+    def open_bulk_edit_window(self):
+        """Selected (ya current search / filters ke saare) rows par gender / age / address set karo."""
+        if not self.single_db_only("Bulk Edit"):
+            return
+        selected = self.selected_mem_ids()
+        win = Toplevel(self.root)
+        win.title("Bulk Edit")
+        win.resizable(False, False)
+        win.config(bg="#020617")
+        win.transient(self.root)
+
+        Label(
+            win,
+            text="Bulk Edit",
+            font=("Segoe UI", 14, "bold"),
+            bg="#f97316",
+            fg="#020617",
+        ).pack(fill=X)
+        form = Frame(win, bg="#020617")
+        form.pack(side=TOP, padx=12, pady=10)
+        label_style = {"font": ("Segoe UI", 10), "bg": "#020617", "fg": "#e5e7eb"}
+        check_style = {**label_style, "selectcolor": "#020617", "activebackground": "#020617"}
+
+        # Scope: selection ho to wahi, warna (ya user chahe to) poori current list
+        scope = StringVar(value="selected" if selected else "matching")
+        Radiobutton(
+            form, text=f"Selected rows ({len(selected)})", variable=scope, value="selected",
+            state=NORMAL if selected else DISABLED, **check_style,
+        ).grid(row=0, column=0, columnspan=2, sticky=W)
+        Radiobutton(
+            form, text="All contacts in the current list (search + filters)", variable=scope,
+            value="matching", **check_style,
+        ).grid(row=1, column=0, columnspan=2, sticky=W)
+
+        # Sirf tick kiye fields set honge
+        fields = {}
+        for row, (column, text) in enumerate(
+            (("gender", "Set Gender"), ("age", "Set Age (empty = clear)"), ("address", "Set Address")), start=2
+        ):
+            enabled = IntVar()
+            value = StringVar()
+            Checkbutton(form, text=text, variable=enabled, **check_style).grid(
+                row=row, column=0, sticky=W, pady=3
+            )
+            if column == "gender":
+                widget = ttk.Combobox(form, textvariable=value, values=FILTER_GENDERS[1:], state="readonly", width=12)
+            else:
+                widget = Entry(form, textvariable=value, width=28, font=("Segoe UI", 10), relief=FLAT)
+            widget.grid(row=row, column=1, sticky=W, padx=5, pady=3)
+            fields[column] = (enabled, value)
+
+        def on_apply():
+            changes = {}
+            for column, (enabled, value) in fields.items():
+                if not enabled.get():
+                    continue
+                text = value.get()
+                if column == "gender":
+                    gender = normalize_gender(text)
+                    if not gender:
+                        tkMessageBox.showwarning("Bulk Edit", "Please select Gender.", parent=win)
+                        return
+                    changes[column] = gender
+                elif column == "age":
+                    age, ok = normalize_age(text) if text.strip() else (None, True)
+                    if not ok:
+                        tkMessageBox.showwarning("Bulk Edit", FORM_ERRORS[ERR_INVALID_AGE], parent=win)
+                        return
+                    changes[column] = age
+                else:
+                    changes[column] = clean_text(text)
+            if not changes:
+                tkMessageBox.showwarning("Bulk Edit", "Tick at least one field to set.", parent=win)
+                return
+            mem_ids = selected if scope.get() == "selected" else None
+            summary = ", ".join(f"{col}={'(empty)' if val in (None, '') else val}" for col, val in changes.items())
+            if not tkMessageBox.askyesno(
+                "Confirm Bulk Edit",
+                f"Set {summary} on {self.bulk_scope_text(mem_ids)}?\n\n"
+                "You can undo this from Data > Undo Last Bulk Change.",
+                parent=win,
+            ):
+                return
+            win.destroy()
+            self.run_bulk(
+                "Bulk Edit", "Updating contacts ...", mem_ids,
+                lambda ids, progress, cancel_event: self.repo.bulk_update(
+                    ids, changes, f"Set {summary}",
+                    progress=lambda frac, rows: progress(frac, f"Updated {rows} contacts ..."),
+                    cancel_event=cancel_event,
+                ),
+                "Updated",
+            )
+
+        Button(
+            form,
+            text="Apply",
+            width=30,
+            command=on_apply,
+            font=("Segoe UI", 10, "bold"),
+            bg="#2563eb",
+            fg="white",
+            activebackground="#1d4ed8",
+            relief=RAISED,
+            bd=1,
+        ).grid(row=5, columnspan=2, pady=12)
+
+    def bulk_delete_contacts(self, mem_ids=None):
+        """mem_ids (None = current search / filters ke saare) ek transaction me delete, undo ke saath."""
+        if not self.single_db_only("Bulk Delete"):
+            return
+        if mem_ids is None and not (self.current_search or self.filters):
+            if not tkMessageBox.askyesno(
+                "Delete All",
+                "No search or filter is active, this will delete EVERY contact.\n\nContinue?",
+                icon="warning",
+            ):
+                return
+        if tkMessageBox.askquestion(
+            "Confirm Delete",
+            f"Delete {self.bulk_scope_text(mem_ids)}?\n\n"
+            "You can undo this from Data > Undo Last Bulk Change.",
+            icon="warning",
+        ) != "yes":
+            return
+        scope = self.bulk_scope_text(mem_ids)
+        self.run_bulk(
+            "Bulk Delete", "Deleting contacts ...", mem_ids,
+            lambda ids, progress, cancel_event: self.repo.bulk_delete(
+                ids, f"Delete {scope}",
+                progress=lambda frac, rows: progress(frac, f"Deleted {rows} contacts ..."),
+                cancel_event=cancel_event,
+            ),
+            "Deleted",
+        )
+
+    def run_bulk(self, title: str, text: str, mem_ids, operation, verb: str):
+        """Bulk operation progress window ke saath; mem_ids None = current list ke saare ids."""
+        search, filters = self.current_search, self.filters
+
+        def job(progress, cancel_event):
+            ids = mem_ids if mem_ids is not None else self.repo.matching_ids(search, filters)
+            return operation(ids, progress, cancel_event)
+
+        def on_done(result):
+            self.apply_changes()
+            tkMessageBox.showinfo(
+                title, f"{verb} {result['rows']} contacts.\n\nUndo: Data > Undo Last Bulk Change."
+            )
+
+        self.run_with_progress(title, text, job, on_done)
+
+    def undo_last_bulk_change(self):
+        if not self.single_db_only("Undo"):
+            return
+        batch = self.repo.last_undo_batch()
+        if batch is None:
+            tkMessageBox.showinfo("Undo", "Nothing to undo.")
+            return
+        if not tkMessageBox.askyesno(
+            "Undo",
+            f"Undo '{batch['description']}' ({batch['row_count']} contacts, {batch['created_at']})?",
+        ):
+            return
+
+        def job(progress, cancel_event):
+            return self.repo.undo_batch(
+                batch["batch_id"],
+                progress=lambda frac, rows: progress(frac, f"Restored {rows} contacts ..."),
+            )
+
+        def on_done(result):
+            self.apply_changes()
+            msg = f"Restored {result['restored']} contacts."
+            if result["skipped"]:
+                msg += f"\nSkipped {result['skipped']} (changed or re-used by someone else since)."
+            tkMessageBox.showinfo("Undo", msg)
+
+        self.run_with_progress("Undo", "Undoing bulk change ...", job, on_done)
 
     # ============================ CSV IMPORT / EXPORT ============================
 
+    def run_with_progress(self, title: str, text: str, job, on_done):
+        """job(progress, cancel_event) ko worker thread par chalao, progress window ke saath.
+
+        progress(fraction, message) worker se call hota hai; Tk updates root.after
+        se main thread par hi hote hain. Khatam hone par on_done(result) (main thread).
+        """
+        win = Toplevel(self.root)
+        win.title(title)
+        win.resizable(False, False)
+        win.config(bg="#020617")
+        win.transient(self.root)
+
+        lbl = Label(
+            win,
+            text=text,
+            font=("Segoe UI", 10),
+            bg="#020617",
+            fg="#e5e7eb",
+            padx=12,
+            pady=8,
+        )
+        lbl.pack(fill=X)
+        bar = ttk.Progressbar(win, orient=HORIZONTAL, length=320, mode="determinate", maximum=1.0)
+        bar.pack(padx=12, pady=4)
+
+        cancel_event = threading.Event()
+        updates = queue.Queue()
+
+        btn_cancel = Button(
+            win,
+            text="Cancel",
+            width=12,
+            font=("Segoe UI", 9, "bold"),
+            command=cancel_event.set,
+        )
+        btn_cancel.pack(pady=8)
+        win.protocol("WM_DELETE_WINDOW", cancel_event.set)
+
+        def worker():
+            try:
+                result = job(
+                    lambda frac, message: updates.put(("progress", frac, message)),
+                    cancel_event,
+                )
+                updates.put(("done", result))
+            except OperationCancelled:
+                updates.put(("cancelled",))
+            except Exception as exc:
+                updates.put(("error", str(exc)))
+
+        def poll():
+            finished = None
+            while True:
+                try:
+                    msg = updates.get_nowait()
+                except queue.Empty:
+                    break
+                if msg[0] == "progress":
+                    bar["value"] = msg[1]
+                    lbl.config(text=msg[2])
+                else:
+                    finished = msg
+            if finished is None:
+                self.root.after(PROGRESS_POLL_MS, poll)
+                return
+
+            win.destroy()
+            if finished[0] == "done":
+                on_done(finished[1])
+            elif finished[0] == "cancelled":
+                tkMessageBox.showinfo(title, "Cancelled.")
+            else:
+                tkMessageBox.showerror("Error", finished[1])
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(PROGRESS_POLL_MS, poll)
+
     def export_to_csv(self):
         path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+            filetypes=[
+                ("CSV Files", "*.csv"),
+                ("Gzip CSV", "*.csv.gz"),
+                ("Parquet", "*.parquet"),
+                ("Arrow / Feather", "*.arrow"),
+                ("All Files", "*.*"),
+            ],
         )
         if not path:
             return
 
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT firstname, lastname, gender, age, address, contact FROM member ORDER BY lastname ASC"
-        )
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                ["firstname", "lastname", "gender", "age", "address", "contact"]
+        # Current search + filters + sort hi export hoga (jo list me dikh raha hai)
+        search = self.current_search
+        filters = self.filters
+        sort, descending = self.sort_column, self.sort_descending
+
+        def job(progress, cancel_event):
+            total = self.repo.count(search, filters)
+            return self.repo.export(
+                path,
+                search,
+                progress=lambda frac, rows: progress(frac, f"Exported {rows} of {total} contacts ..."),
+                cancel_event=cancel_event,
+                total=total,
+                sort=sort,
+                descending=descending,
+                filters=filters,
             )
-            writer.writerows(rows)
 
-        tkMessageBox.showinfo(
-            "Export", f"Exported {len(rows)} contacts to:\n{path}"
-        )
+        def on_done(written):
+            tkMessageBox.showinfo("Export", f"Exported {written} contacts to:\n{path}")
+
+        self.run_with_progress("Exporting Contacts", "Exporting ...", job, on_done)
 
     def import_from_csv(self):
+        if not self.single_db_only("CSV Import"):
+            return
         path = filedialog.askopenfilename(
             filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
         )
@@ -708,95 +1622,254 @@ class ContactApp:
             tkMessageBox.showerror("Error", "File not found.")
             return
 
-        inserted = 0
-        skipped = 0
+        def job(progress, cancel_event):
+            return self.repo.import_csv(
+                path,
+                progress=lambda frac, ins, rej: progress(
+                    frac, f"Imported {ins} contacts, rejected {rej} ..."
+                ),
+                cancel_event=cancel_event,
+            )
+
+        def on_done(result):
+            self.apply_changes()
+            msg = f"Imported {result['inserted']} contacts.\nSkipped: {result['rejected']}"
+            if result["reject_path"]:
+                msg += f"\n\nSkipped rows (with reason) saved to:\n{result['reject_path']}"
+            tkMessageBox.showinfo("Import", msg)
+
+        self.run_with_progress("Importing Contacts", f"Importing {path_obj.name} ...", job, on_done)
+
+    # ============================ STATS ============================
+
+    def show_stats(self):
+        stats = self.repo.stats()
+
+        def section(rows, empty="No data"):
+            lines = [f"{label if label else 'Unknown'}: {c}" for label, c in rows]
+            return "\n".join(lines) if lines else empty
+
+        msg = (
+            f"Total contacts: {stats['total']}\n\n"
+            f"By gender:\n{section(stats['gender'])}\n\n"
+            f"By age:\n{section(stats['age'])}\n\n"
+            f"Top {STATS_TOP_CITIES} cities:\n{section(stats['city'][:STATS_TOP_CITIES])}"
+        )
+        tkMessageBox.showinfo("Statistics", msg)
+
+
+    # ============================ DUPLICATES ============================
 
-        with open(path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            if not reader.fieldnames:
-                tkMessageBox.showerror("Error", "CSV file is empty or invalid.")
+    def find_duplicates(self):
+        if not self.single_db_only("Find Duplicates"):
+            return
+
+        def job(progress, cancel_event):
+            return dedupe.find_duplicates(self.repo, progress=progress, cancel_event=cancel_event)
+
+        def on_done(stats):
+            if not stats["clusters"]:
+                tkMessageBox.showinfo("Duplicates", "No likely duplicates found.")
                 return
+            tkMessageBox.showinfo(
+                "Duplicates",
+                f"Found {stats['clusters']} groups of likely duplicates "
+                f"({stats['duplicates']} extra contacts).",
+            )
+            self.open_duplicate_review()
 
-            headers_lower = [h.lower() for h in reader.fieldnames]
-            required = ["firstname", "lastname", "gender", "age", "address", "contact"]
-            if not all(col in headers_lower for col in required):
-                tkMessageBox.showerror(
-                    "Error",
-                    "CSV must contain columns: firstname, lastname, gender, age, address, contact",
-                )
+        self.run_with_progress("Finding Duplicates", "Scanning contacts ...", job, on_done)
+
+    def open_duplicate_review(self):
+        """Pending duplicate groups: ek contact chuno -> baaki usme merge, ya group dismiss."""
+        if not self.single_db_only("Review Duplicates"):
+            return
+        win = Toplevel(self.root)
+        win.title("Review Duplicates")
+        win.config(bg="#020617")
+        win.transient(self.root)
+
+        columns = ("score", "firstname", "lastname", "gender", "age", "address", "contact")
+        tree = ttk.Treeview(win, columns=columns, show="tree headings", height=18)
+        tree.heading("#0", text="Group / ID")
+        tree.column("#0", width=110)
+        for col in columns:
+            tree.heading(col, text=col.capitalize())
+            tree.column(col, width=60 if col in ("score", "age", "gender") else 120)
+        tree.pack(fill=BOTH, expand=True, padx=8, pady=8)
+
+        status = Label(win, bg="#020617", fg="#e5e7eb", font=("Segoe UI", 9), anchor=W)
+        status.pack(fill=X, padx=8)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            clusters = dedupe.pending_clusters(self.repo)
+            for cluster_id, members in clusters:
+                parent = tree.insert("", END, iid=f"g{cluster_id}", text=f"Group {cluster_id}", open=True)
+                for contact, score in members:
+                    tree.insert(
+                        parent, END, iid=f"m{contact.mem_id}", text=str(contact.mem_id),
+                        values=(f"{score:.2f}", *contact.as_row()[1:]),
+                    )
+            status.config(
+                text=f"{len(clusters)} groups pending. Select the contact to keep, then Merge."
+                if clusters else "No pending duplicate groups."
+            )
+
+        def selected_group():
+            selection = tree.selection()
+            if not selection:
+                tkMessageBox.showwarning("Duplicates", "Please select a contact or group first.", parent=win)
+                return None, None
+            iid = selection[0]
+            group = iid if iid.startswith("g") else tree.parent(iid)
+            return int(group[1:]), (int(iid[1:]) if iid.startswith("m") else None)
+
+        def on_merge():
+            cluster_id, keep_id = selected_group()
+            if cluster_id is None:
+                return
+            if keep_id is None:
+                tkMessageBox.showwarning("Duplicates", "Select the contact to keep inside the group.", parent=win)
                 return
+            answer = tkMessageBox.askquestion(
+                "Confirm Merge",
+                f"Keep contact {keep_id} and merge the other contacts of group {cluster_id} into it?",
+                icon="warning",
+                parent=win,
+            )
+            if answer != "yes":
+                return
+
+            def job(progress, cancel_event):
+                # Ek transaction, beech me cancel nahi -- Tk thread block na ho isliye worker par
+                return dedupe.merge_cluster(self.repo, cluster_id, keep_id)
+
+            def on_done(deleted):
+                self.apply_changes()
+                if win.winfo_exists():
+                    refresh()
+                    status.config(text=f"Merged {deleted} contacts into {keep_id}.")
 
-            conn = get_connection()
-            cursor = conn.cursor()
-            query = (
-                f"INSERT INTO member (firstname, lastname, gender, age, address, contact) "
-                f"VALUES ({PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER}, {PLACEHOLDER})"
+            self.run_with_progress("Merge Duplicates", f"Merging group {cluster_id} ...", job, on_done)
+
+        def on_dismiss():
+            cluster_id, _ = selected_group()
+            if cluster_id is None:
+                return
+            dedupe.dismiss_cluster(self.repo, cluster_id)
+            refresh()
+
+        buttons = Frame(win, bg="#020617")
+        buttons.pack(fill=X, padx=8, pady=8)
+        for text, command in (
+            ("Merge into Selected", on_merge),
+            ("Not Duplicates", on_dismiss),
+            ("Close", win.destroy),
+        ):
+            Button(buttons, text=text, width=18, font=("Segoe UI", 9, "bold"), command=command).pack(
+                side=LEFT, padx=4
             )
+        refresh()
 
-            for row in reader:
-                try:
-                    def get_val(key):
-                        for k in row.keys():
-                            if k.lower() == key:
-                                return row[k]
-                        return ""
-
-                    firstname = (get_val("firstname") or "").strip()
-                    lastname = (get_val("lastname") or "").strip()
-                    gender = (get_val("gender") or "").strip()
-                    age = str(get_val("age") or "").strip()
-                    address = (get_val("address") or "").strip()
-                    contact = str(get_val("contact") or "").strip()
-
-                    if not firstname or not lastname or not contact:
-                        skipped += 1
-                        continue
-
-                    cursor.execute(
-                        query, (firstname, lastname, gender, age, address, contact)
-                    )
-                    inserted += 1
-                except Exception:
-                    skipped += 1
+    # ============================ DIAGNOSTICS ============================
 
-            conn.commit()
-            cursor.close()
-            conn.close()
+    def enable_instrumentation(self):
+        if instrumentation.ENABLED:
+            tkMessageBox.showinfo("Diagnostics", "Instrumentation is already enabled.")
+            return
+        instrumentation.enable()
+        # Purane (unwrapped) connections band, naye pool ke connections timed honge
+        self.cancel_background_search()
+        self.write_queue.flush()
+        close_pool()
+        tkMessageBox.showinfo("Diagnostics", "Instrumentation enabled.")
+
+    def metrics_extra(self) -> dict:
+        extra = {"Connection pool": get_pool().stats(), "Write queue": self.write_queue.stats()}
+        if self.repo.backend == "sharded":
+            extra["Shards"] = self.repo.shard_stats()
+        if self.cache is not None:
+            extra["In-memory cache"] = self.cache.memory_report()
+        return extra
+
+    def show_diagnostics(self):
+        if not instrumentation.ENABLED:
+            tkMessageBox.showinfo(
+                "Diagnostics",
+                "Instrumentation is off.\n\nUse Diagnostics > Enable Instrumentation, "
+                "or start with --metrics (or CONTACT_METRICS=1).",
+            )
+            return
 
-        self.load_contacts()
-        tkMessageBox.showinfo(
-            "Import",
-            f"Imported {inserted} contacts.\nSkipped: {skipped}",
+        win = Toplevel(self.root)
+        win.title("Diagnostics")
+        win.config(bg="#020617")
+        text = Text(
+            win, width=110, height=32, font=("Consolas", 9), bg="#020617", fg="#e5e7eb", wrap=NONE
         )
+        text.insert("1.0", instrumentation.format_report(self.metrics_extra()))
+        text.config(state=DISABLED)
+        text.pack(fill=BOTH, expand=True, padx=8, pady=8)
 
-    # ============================ STATS ============================
-
-    def show_stats(self):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM member")
-        total_row = cursor.fetchone()
-        total = total_row[0] if total_row else 0
-
-        cursor.execute("SELECT gender, COUNT(*) FROM member GROUP BY gender")
-        gender_rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        gender_text = ""
-        for g, c in gender_rows:
-            label = g if g else "Unknown"
-            gender_text += f"{label}: {c}\n"
-        if not gender_text:
-            gender_text = "No data"
-
-        msg = f"Total contacts: {total}\n\nBy gender:\n{gender_text}"
-        tkMessageBox.showinfo("Statistics", msg)
+    def dump_metrics(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            initialfile="contact_metrics.json",
+            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")],
+        )
+        if not path:
+            return
+        instrumentation.dump(path, self.metrics_extra())
+        tkMessageBox.showinfo("Diagnostics", f"Metrics written to:\n{path}")
 
 
 # ============================ MAIN ============================
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Contact Management System")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="GUI ki jagah HTTP/JSON server chalao (contact_server.py)",
+    )
+    parser.add_argument("--host", default=None, help="--serve ke saath: bind address")
+    parser.add_argument("--port", type=int, default=None, help="--serve ke saath: port")
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Instrumentation chalu karo (latency histograms + slow-query log)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Start par member ko in-memory cache me load karo (contact_cache.py, sirf SQLite)",
+    )
+    parser.add_argument(
+        "--shards",
+        metavar="DIR",
+        help="DIR ke sharded SQLite set par chalao (contact_shards.py, pehli baar khali set banta hai)",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    root = Tk()
-    app = ContactApp(root)
-    root.mainloop()
+    args = parse_args()
+    if args.metrics:
+        instrumentation.enable()
+    repo = ShardedContactRepository(args.shards) if args.shards else None
+    if args.serve:
+        from contact_server import SERVER_HOST, SERVER_PORT, serve
+
+        serve(args.host or SERVER_HOST, args.port or SERVER_PORT, repo)
+    else:
+        root = Tk()
+        app = ContactApp(root, repo)
+        if args.cache:
+            app.enable_cache()
+        root.mainloop()
+        app.shutdown()
+        root.destroy()
+        close_pool()
+    if repo is not None:
+        repo.close()
@@ -0,0 +1,323 @@
+"""Opt-in hot-path instrumentation: latency histograms + slow-query log.
+
+Band ho to kuch bhi wrap nahi hota (zero overhead). Chalu karne ke tareeke:
+    CONTACT_METRICS=1 python index.py
+    python index.py --metrics            (GUI / --serve)
+    python etl_contacts.py --metrics etl_metrics.json
+    Diagnostics -> Enable instrumentation (GUI, runtime)
+
+Histograms (ms): db.connect, pool.acquire, db.execute.<select|insert|...>,
+db.executemany, db.fetch, ui.tree_fill, etl.<stage> ...
+SLOW_QUERY_MS se slow har query uske EXPLAIN QUERY PLAN ke saath log hoti hai.
+"""
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+SLOW_QUERY_MS = 50.0       # isse slow queries slow-query log me jayengi
+SLOW_QUERY_KEEP = 200      # memory me last itni slow queries
+# Histogram bucket upper bounds (ms); aakhri bucket +inf
+BUCKET_BOUNDS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+ENABLED = os.environ.get("CONTACT_METRICS") == "1"
+
+
+class Histogram:
+    """Fixed log-scale buckets. Percentiles bucket ki upper bound se estimate hote hain."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                bound = BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms or 0.0, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {
+                (str(b) if i < len(BUCKET_BOUNDS_MS) else "+inf"): n
+                for i, (b, n) in enumerate(zip((*BUCKET_BOUNDS_MS, None), self.counts))
+                if n
+            },
+        }
+
+
+_lock = threading.Lock()
+_histograms = {}
+_slow_queries = deque(maxlen=SLOW_QUERY_KEEP)
+
+
+def enable():
+    """Instrumentation chalu karo. Naye connections hi wrap honge (pool reset caller karega)."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def observe(name: str, seconds: float):
+    ms = seconds * 1000
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.observe(ms)
+
+
+@contextmanager
+def timer(name: str):
+    """with timer("etl.transform"): ... -- band ho to sirf ek flag check."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """Decorator: function ka har call `name` histogram me (sirf ENABLED par)."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def timed_iter(name: str, iterable):
+    """Iterator ka har next() timed (e.g. CSV chunk reads)."""
+    if not ENABLED:
+        yield from iterable
+        return
+    it = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            return
+        observe(name, time.perf_counter() - start)
+        yield item
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _slow_queries.clear()
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "histograms": {name: h.summary() for name, h in sorted(_histograms.items())},
+            "slow_queries": list(_slow_queries),
+        }
+
+
+def dump(path: str, extra=None) -> dict:
+    """Metrics JSON file me likho. extra (e.g. pool stats) bhi saath me."""
+    data = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "enabled": ENABLED,
+        "slow_query_ms": SLOW_QUERY_MS,
+        **snapshot(),
+        **(extra or {}),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    return data
+
+
+def format_report(extra=None) -> str:
+    """Diagnostics window ke liye plain text table."""
+    snap = snapshot()
+    lines = [f"{'operation':<26}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>10}  (ms)"]
+    for name, h in snap["histograms"].items():
+        lines.append(
+            f"{name:<26}{h['count']:>8}{h['mean_ms']:>9.2f}{h['p50_ms']:>9.2f}"
+            f"{h['p95_ms']:>9.2f}{h['p99_ms']:>9.2f}{h['max_ms']:>10.2f}"
+        )
+    if not snap["histograms"]:
+        lines.append("(no samples yet)")
+    for title, values in (extra or {}).items():
+        lines.append("")
+        lines.append(f"{title}:")
+        lines.extend(f"  {k}: {v}" for k, v in values.items())
+    lines.append("")
+    lines.append(f"Slow queries (> {SLOW_QUERY_MS:g} ms), newest first:")
+    for entry in reversed(snap["slow_queries"]):
+        lines.append(f"  [{entry['ms']:.1f} ms] {entry['sql']}")
+        lines.extend(f"      plan: {step}" for step in entry["plan"])
+    if not snap["slow_queries"]:
+        lines.append("  (none)")
+    return "\n".join(lines)
+
+
+# ============================ DB-API WRAPPERS ============================
+
+def _statement_kind(sql: str) -> str:
+    head = sql.lstrip().split(None, 1)
+    return head[0].lower() if head else "unknown"
+
+
+def _one_line(sql: str, limit: int = 400) -> str:
+    text = " ".join(sql.split())
+    return text if len(text) <= limit else text[:limit] + " ..."
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, conn: "InstrumentedConnection"):
+        self._cursor = cursor
+        self._conn = conn
+
+    def execute(self, sql, params=()):
+        start = time.perf_counter()
+        self._cursor.execute(sql, params)
+        elapsed = time.perf_counter() - start
+        observe(f"db.execute.{_statement_kind(sql)}", elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            self._conn.log_slow(sql, params, elapsed)
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        start = time.perf_counter()
+        self._cursor.executemany(sql, seq_of_params)
+        elapsed = time.perf_counter() - start
+        observe("db.executemany", elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            self._conn.log_slow(sql, None, elapsed)
+        return self
+
+    def _timed_fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        observe("db.fetch", time.perf_counter() - start)
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            return self._timed_fetch(self._cursor.fetchmany)
+        return self._timed_fetch(self._cursor.fetchmany, size)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        # rowcount, lastrowid, close, description ...
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """sqlite3 / mysql connection ka proxy: har execute / fetch timed."""
+
+    def __init__(self, conn, backend: str = "sqlite"):
+        self._conn = conn
+        self._backend = backend
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def log_slow(self, sql, params, elapsed: float):
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "ms": round(elapsed * 1000, 3),
+            "sql": _one_line(sql),
+            "params": None if params is None else [str(p)[:80] for p in params][:20],
+            "plan": self.explain(sql, params),
+        }
+        with _lock:
+            _slow_queries.append(entry)
+        print(f"[SLOW QUERY] {entry['ms']:.1f} ms: {entry['sql']}")
+
+    def explain(self, sql, params) -> list:
+        if params is None or _statement_kind(sql) not in ("select", "with", "update", "delete", "insert"):
+            return []
+        prefix = "EXPLAIN QUERY PLAN " if self._backend == "sqlite" else "EXPLAIN "
+        try:
+            cursor = self._conn.cursor()
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        except Exception as exc:
+            return [f"(explain failed: {exc})"]
+        if self._backend == "sqlite":
+            return [row[-1] for row in rows]  # (id, parent, notused, detail)
+        return [" | ".join(str(v) for v in row) for row in rows]
+
+    def __getattr__(self, name):
+        # commit, rollback, close, interrupt, in_transaction ...
+        return getattr(self._conn, name)
+
+
+def instrument(conn, backend: str = "sqlite"):
+    """ENABLED ho to connection ko InstrumentedConnection me wrap karo, warna wahi connection."""
+    return InstrumentedConnection(conn, backend) if ENABLED else conn
+
+
+def connect_timed(factory, backend: str = "sqlite"):
+    """factory() se naya connection, connect time record + wrap (sirf ENABLED par)."""
+    if not ENABLED:
+        return factory()
+    start = time.perf_counter()
+    conn = factory()
+    observe("db.connect", time.perf_counter() - start)
+    return InstrumentedConnection(conn, backend)
@@ -0,0 +1,587 @@
+"""member table ke schema migrations.
+
+Har migration ek baar chalti hai aur schema_version table me record hoti hai.
+migrate() GUI (ContactApp.init_db) aur ETL (etl_contacts.init_member_table)
+dono se chalta hai, aur kitni bhi baar chalao, safe hai (idempotent).
+
+Naya migration add karna ho to MIGRATIONS list ke end me naya version daalo,
+purane versions kabhi edit mat karo.
+"""
+import sqlite3
+from datetime import datetime, timezone
+
+from contact_db import FTS_TABLE, FTS_TRIGGERS, create_fts_index
+from normalize import MAX_AGE, MIN_AGE, normalize_age, normalize_contact
+
+MYSQL_LOCK_NAME = "contact_db_schema_migrate"
+MYSQL_LOCK_TIMEOUT = 30  # seconds
+
+SQLITE_MEMBER_COLUMNS = f"""
+    mem_id    INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    firstname TEXT,
+    lastname  TEXT,
+    gender    TEXT,
+    age       INTEGER CHECK (
+        age IS NULL OR (typeof(age) = 'integer' AND age BETWEEN {MIN_AGE} AND {MAX_AGE})
+    ),
+    address   TEXT,
+    contact   TEXT
+"""
+
+
+# ============================ MIGRATIONS ============================
+
+def m001_create_member(cursor, backend):
+    """Base member table (purana schema, age TEXT)."""
+    if backend == "mysql":
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS member (
+                mem_id   INTEGER NOT NULL PRIMARY KEY AUTO_INCREMENT,
+                firstname TEXT,
+                lastname  TEXT,
+                gender    TEXT,
+                age       TEXT,
+                address   TEXT,
+                contact   TEXT
+            )
+        """)
+    else:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS member (
+                mem_id   INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+                firstname TEXT,
+                lastname  TEXT,
+                gender    TEXT,
+                age       TEXT,
+                address   TEXT,
+                contact   TEXT
+            )
+        """)
+
+
+def m002_fts_index(cursor, backend):
+    """SQLite: FTS5 search index. MySQL LIKE path hi use karta hai."""
+    if backend == "sqlite":
+        create_fts_index(cursor.connection)
+
+
+def m003_integer_age(cursor, backend):
+    """age TEXT -> INTEGER + CHECK constraint. Jo age number nahi / range ke bahar hai woh NULL.
+
+    Conversion normalize.normalize_age se hi ("42", " 42 ", "30.0" -> int), taaki
+    migration aur form / import / ETL ke rules ek hi rahein. (Yeh conversion release se
+    pehle in-place badla gaya tha; ship ho chuki migration ka fix naya version hota.)
+    """
+    if backend == "mysql":
+        cursor.execute("SELECT mem_id, age FROM member WHERE age IS NOT NULL")
+        fixes = []
+        for mem_id, raw in cursor.fetchall():
+            age = normalize_age(raw)[0]
+            if str(age) != str(raw):
+                fixes.append((None if age is None else str(age), mem_id))
+        if fixes:
+            cursor.executemany("UPDATE member SET age = %s WHERE mem_id = %s", fixes)
+        cursor.execute(f"""
+            UPDATE member SET age = NULL
+            WHERE age NOT REGEXP '^[0-9]+$' OR CAST(age AS UNSIGNED) NOT BETWEEN {MIN_AGE} AND {MAX_AGE}
+        """)
+        cursor.execute(f"""
+            ALTER TABLE member
+                MODIFY age INT NULL,
+                ADD CONSTRAINT chk_member_age CHECK (age IS NULL OR age BETWEEN {MIN_AGE} AND {MAX_AGE})
+        """)
+        return
+
+    # SQLite column type ALTER nahi kar sakta -> table rebuild (mem_id same rehte hain)
+    existing = cursor.execute("PRAGMA table_info(member)").fetchall()
+    base = {"mem_id", "firstname", "lastname", "gender", "age", "address", "contact"}
+    # Baad me add hue columns (e.g. ETL ka row_hash) bhi saath chalenge
+    extra = [(row[1], row[2]) for row in existing if row[1] not in base]
+    extra_ddl = "".join(f",\n    {name} {ctype}" for name, ctype in extra)
+    extra_cols = "".join(f", {name}" for name, _ in extra)
+
+    dependents = cursor.execute(
+        "SELECT sql FROM sqlite_master "
+        "WHERE tbl_name = 'member' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    ).fetchall()
+    seq = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'member'").fetchone()
+
+    cursor.connection.create_function(
+        "normalize_age", 1, lambda value: normalize_age(value)[0], deterministic=True
+    )
+    cursor.execute(f"CREATE TABLE member_new ({SQLITE_MEMBER_COLUMNS}{extra_ddl})")
+    cursor.execute(f"""
+        INSERT INTO member_new (mem_id, firstname, lastname, gender, age, address, contact{extra_cols})
+        SELECT mem_id, firstname, lastname, gender, normalize_age(age), address, contact{extra_cols}
+        FROM member
+    """)
+    cursor.execute("DROP TABLE member")
+    cursor.execute("ALTER TABLE member_new RENAME TO member")
+    if seq is not None:
+        # AUTOINCREMENT history mat khona (delete hue ids dobara use na hon)
+        cursor.execute(
+            "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'member'", (seq[0],)
+        )
+    # DROP TABLE ke saath gaye indexes / triggers (FTS sync, UNIQUE contact, ...) wapas
+    for (sql,) in dependents:
+        cursor.execute(sql)
+
+
+def m004_listing_indexes(cursor, backend):
+    """Sorted listing ke liye (lastname, firstname, mem_id) aur contact par index."""
+    if backend == "mysql":
+        # TEXT columns poore index nahi ho sakte, isliye VARCHAR
+        cursor.execute("""
+            ALTER TABLE member
+                MODIFY firstname VARCHAR(100),
+                MODIFY lastname VARCHAR(100),
+                MODIFY gender VARCHAR(16),
+                MODIFY contact VARCHAR(32)
+        """)
+        cursor.execute("CREATE INDEX idx_member_name ON member (lastname, firstname, mem_id)")
+        cursor.execute("CREATE INDEX idx_member_contact ON member (contact)")
+        return
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_member_name ON member (lastname, firstname, mem_id)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_member_contact ON member (contact)")
+
+
+# address ka last comma ke baad wala hissa = city ("12 MG Road, Jaipur" -> "Jaipur").
+# rtrim(x, <x ke saare non-comma chars>) last comma tak ka prefix deta hai.
+def city_expr(col: str) -> str:
+    return f"trim(substr({col}, length(rtrim({col}, replace({col}, ',', ''))) + 1))"
+
+
+def age_bucket_expr(col: str) -> str:
+    return (
+        f"CASE WHEN {col} IS NULL THEN 'unknown' "
+        f"ELSE printf('%d-%d', ({col} / 10) * 10, ({col} / 10) * 10 + 9) END"
+    )
+
+
+# stat -> bucket expression (NEW./OLD. row ke liye)
+STAT_BUCKETS = {
+    "gender": lambda row: f"COALESCE({row}.gender, '')",
+    "age": lambda row: age_bucket_expr(f"{row}.age"),
+    "city": lambda row: f"COALESCE({city_expr(f'{row}.address')}, '')",
+}
+
+
+STATS_TRIGGERS = ("member_stats_ai", "member_stats_ad", "member_stats_au")
+
+
+def _stats_bump(stat, bucket_sql, delta):
+    return (
+        f"INSERT INTO member_stats (stat, bucket, n) VALUES ('{stat}', {bucket_sql}, {delta}) "
+        f"ON CONFLICT (stat, bucket) DO UPDATE SET n = n + ({delta});"
+    )
+
+
+def create_stats_triggers(cursor):
+    """member_stats ko har INSERT / UPDATE / DELETE par sync rakhne wale triggers."""
+    inserts = "\n".join(_stats_bump(stat, expr("NEW"), 1) for stat, expr in STAT_BUCKETS.items())
+    deletes = "\n".join(_stats_bump(stat, expr("OLD"), -1) for stat, expr in STAT_BUCKETS.items())
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS member_stats_ai AFTER INSERT ON member BEGIN
+            {_stats_bump("total", "''", 1)}
+            {_stats_bump("changes", "''", 1)}
+            {inserts}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS member_stats_ad AFTER DELETE ON member BEGIN
+            {_stats_bump("total", "''", -1)}
+            {_stats_bump("changes", "''", 1)}
+            {deletes}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS member_stats_au AFTER UPDATE ON member BEGIN
+            {_stats_bump("changes", "''", 1)}
+            {deletes}
+            {inserts}
+        END
+    """)
+
+
+def rebuild_member_stats(cursor):
+    """member_stats ko member table se dobara calculate karo ('changes' counter aage badhta hai)."""
+    row = cursor.execute(
+        "SELECT n FROM member_stats WHERE stat = 'changes' AND bucket = ''"
+    ).fetchone()
+    changes = (row[0] if row else 0) + 1
+    cursor.execute("DELETE FROM member_stats")
+    cursor.execute("INSERT INTO member_stats (stat, bucket, n) SELECT 'total', '', COUNT(*) FROM member")
+    cursor.execute("INSERT INTO member_stats (stat, bucket, n) VALUES ('changes', '', ?)", (changes,))
+    for stat, expr in STAT_BUCKETS.items():
+        bucket = expr("member")
+        cursor.execute(f"""
+            INSERT INTO member_stats (stat, bucket, n)
+            SELECT '{stat}', {bucket}, COUNT(*) FROM member GROUP BY {bucket}
+        """)
+
+
+def m005_member_stats(cursor, backend):
+    """member_stats summary table, triggers se maintained -> show_stats O(1).
+
+    stat='total' / 'changes' (har write par +1, cache invalidation ke liye),
+    'gender', 'age' (10 saal ke buckets), 'city' (address se parse).
+    MySQL par stats live GROUP BY queries se hi aate hain.
+    """
+    if backend == "mysql":
+        return
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS member_stats (
+            stat   TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            n      INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (stat, bucket)
+        ) WITHOUT ROWID
+    """)
+    rebuild_member_stats(cursor)
+    create_stats_triggers(cursor)
+
+
+def m006_normalize_contacts(cursor, backend):
+    """Purane rows ko normalize.py ke rules se saaf karo (E.164 contact, gender, names).
+
+    Jo row validate nahi hoti use chhod dete hain (data delete nahi karna). Unique
+    contact index ho aur do rows ek hi number par aa jayein to doosri waise hi rehti hai.
+    """
+    cursor.execute(
+        "SELECT mem_id, firstname, lastname, gender, age, address, contact FROM member ORDER BY mem_id"
+    )
+    changed = []
+    for mem_id, *row in cursor.fetchall():
+        values, error = normalize_contact(*row)
+        if error is None and values != tuple(row):
+            changed.append((*values, mem_id))
+    if not changed:
+        return
+
+    mark = "?" if backend == "sqlite" else "%s"
+    ignore = "OR IGNORE" if backend == "sqlite" else "IGNORE"
+    cursor.executemany(
+        f"""UPDATE {ignore} member
+            SET firstname = {mark}, lastname = {mark}, gender = {mark}, age = {mark},
+                address = {mark}, contact = {mark}
+            WHERE mem_id = {mark}""",
+        changed,
+    )
+
+
+def m007_dedupe_review(cursor, backend):
+    """dedupe.py ke duplicate clusters: (cluster_id, mem_id) + score + review status."""
+    if backend == "mysql":
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dedupe_review (
+                cluster_id INT NOT NULL,
+                mem_id     INT NOT NULL,
+                score      DOUBLE NOT NULL,
+                status     VARCHAR(16) NOT NULL DEFAULT 'pending',
+                PRIMARY KEY (cluster_id, mem_id),
+                INDEX idx_dedupe_status (status, cluster_id)
+            )
+        """)
+        return
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dedupe_review (
+            cluster_id INTEGER NOT NULL,
+            mem_id     INTEGER NOT NULL,
+            score      REAL NOT NULL,
+            status     TEXT NOT NULL DEFAULT 'pending',
+            PRIMARY KEY (cluster_id, mem_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dedupe_status ON dedupe_review (status, cluster_id)"
+    )
+
+
+def m008_row_versions(cursor, backend):
+    """Optimistic concurrency: har row ka version (update par +1) aur updated_at (UTC ISO)."""
+    if backend == "mysql":
+        cursor.execute("""
+            ALTER TABLE member
+                ADD COLUMN version INT NOT NULL DEFAULT 1,
+                ADD COLUMN updated_at VARCHAR(32) NULL
+        """)
+        return
+    cursor.execute("ALTER TABLE member ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    cursor.execute("ALTER TABLE member ADD COLUMN updated_at TEXT")
+
+
+# ============================ CHANGE FEED ============================
+
+CHANGE_TRIGGERS = ("member_changes_ai", "member_changes_ad", "member_changes_au")
+CHANGE_INSERT, CHANGE_UPDATE, CHANGE_DELETE = "I", "U", "D"
+CHANGE_RELOAD = "R"   # bulk load (triggers band the): readers poora reload karein
+
+
+def create_change_triggers(cursor):
+    for name, event, op, row in zip(
+        CHANGE_TRIGGERS,
+        ("INSERT", "DELETE", "UPDATE"),
+        (CHANGE_INSERT, CHANGE_DELETE, CHANGE_UPDATE),
+        ("NEW", "OLD", "NEW"),
+    ):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON member BEGIN
+                INSERT INTO member_changes (op, mem_id) VALUES ('{op}', {row}.mem_id);
+            END
+        """)
+
+
+def record_reload(cursor):
+    """Triggers ke bina hue bulk changes ke baad ek 'R' entry."""
+    cursor.execute("INSERT INTO member_changes (op, mem_id) VALUES (?, NULL)", (CHANGE_RELOAD,))
+
+
+def prune_change_log(cursor, keep: int) -> int:
+    """Sirf aakhri `keep` changes rakho. Isse peeche wale readers reload karenge."""
+    cursor.execute(
+        "DELETE FROM member_changes WHERE seq <= (SELECT MAX(seq) FROM member_changes) - ?",
+        (keep,),
+    )
+    return cursor.rowcount
+
+
+def m009_change_feed(cursor, backend):
+    """member_changes (seq, op, mem_id): har insert / update / delete trigger se log.
+
+    GUI apne last seen seq ke baad ke changes padh ke sirf wahi rows refresh karta hai.
+    AUTOINCREMENT: prune ke baad bhi seq kabhi reuse nahi hota.
+    MySQL par feed nahi hai (GUI har write ke baad poora reload karta hai).
+    """
+    if backend == "mysql":
+        return
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS member_changes (
+            seq    INTEGER PRIMARY KEY AUTOINCREMENT,
+            op     TEXT NOT NULL,
+            mem_id INTEGER
+        )
+    """)
+    create_change_triggers(cursor)
+
+
+def m010_sort_indexes(cursor, backend):
+    """Har sortable heading ke liye index (contact_service.SORT_COLUMNS ke chains).
+
+    lastname: idx_member_name (4), contact: idx_member_contact (4), mem_id: primary key.
+    mem_id har chain ke end me hai (stable order), isliye index me bhi.
+    gender index name order ke saath: gender filter + default sort ek hi index walk.
+    """
+    if backend == "mysql":
+        # TEXT poora index nahi hota (m004 jaisa)
+        cursor.execute("ALTER TABLE member MODIFY address VARCHAR(255)")
+        cursor.execute("CREATE INDEX idx_member_first ON member (firstname, lastname, mem_id)")
+        cursor.execute("CREATE INDEX idx_member_gender ON member (gender, lastname, firstname, mem_id)")
+        cursor.execute("CREATE INDEX idx_member_age ON member (age, mem_id)")
+        cursor.execute("CREATE INDEX idx_member_address ON member (address, mem_id)")
+        return
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_member_first ON member (firstname, lastname, mem_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_member_gender ON member (gender, lastname, firstname, mem_id)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_member_age ON member (age, mem_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_member_address ON member (address, mem_id)")
+
+
+def m011_undo_journal(cursor, backend):
+    """Bulk delete / bulk edit ka undo journal.
+
+    undo_batches: ek bulk operation (action = 'delete' / 'update'), undone_at set = undo ho chuka.
+    member_undo: us operation se pehle har touched row ki poori copy (version ke saath).
+    """
+    if backend == "mysql":
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS undo_batches (
+                batch_id    INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+                action      VARCHAR(16) NOT NULL,
+                description VARCHAR(255),
+                row_count   INT NOT NULL DEFAULT 0,
+                created_at  VARCHAR(32) NOT NULL,
+                undone_at   VARCHAR(32) NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS member_undo (
+                batch_id   INT NOT NULL,
+                mem_id     INT NOT NULL,
+                firstname  VARCHAR(100),
+                lastname   VARCHAR(100),
+                gender     VARCHAR(16),
+                age        INT,
+                address    VARCHAR(255),
+                contact    VARCHAR(32),
+                version    INT NOT NULL,
+                updated_at VARCHAR(32),
+                PRIMARY KEY (batch_id, mem_id)
+            )
+        """)
+        return
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS undo_batches (
+            batch_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+            action      TEXT NOT NULL,
+            description TEXT,
+            row_count   INTEGER NOT NULL DEFAULT 0,
+            created_at  TEXT NOT NULL,
+            undone_at   TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS member_undo (
+            batch_id   INTEGER NOT NULL,
+            mem_id     INTEGER NOT NULL,
+            firstname  TEXT,
+            lastname   TEXT,
+            gender     TEXT,
+            age        INTEGER,
+            address    TEXT,
+            contact    TEXT,
+            version    INTEGER NOT NULL,
+            updated_at TEXT,
+            PRIMARY KEY (batch_id, mem_id)
+        )
+    """)
+
+
+MIGRATIONS = [
+    (1, "create member table", m001_create_member),
+    (2, "FTS5 search index", m002_fts_index),
+    (3, "age as INTEGER with CHECK constraint", m003_integer_age),
+    (4, "indexes for sorted listing and contact lookup", m004_listing_indexes),
+    (5, "trigger-maintained member_stats summary", m005_member_stats),
+    (6, "normalize existing contacts (E.164 phone, gender, names)", m006_normalize_contacts),
+    (7, "dedupe_review table for fuzzy duplicate clusters", m007_dedupe_review),
+    (8, "row version + updated_at for optimistic concurrency", m008_row_versions),
+    (9, "member_changes change feed (trigger-maintained)", m009_change_feed),
+    (10, "indexes for sortable Treeview headings", m010_sort_indexes),
+    (11, "undo journal for bulk delete / bulk edit", m011_undo_journal),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ============================ RUNNER ============================
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER NOT NULL PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    """)
+
+
+def current_version(cursor) -> int:
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    row = cursor.fetchone()
+    return (row[0] or 0) if row else 0
+
+
+def record_version(cursor, backend, version, description):
+    mark = "?" if backend == "sqlite" else "%s"
+    cursor.execute(
+        f"INSERT INTO schema_version (version, description, applied_at) VALUES ({mark}, {mark}, {mark})",
+        (version, description, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+    )
+
+
+def migrate(conn, backend: str = "sqlite") -> int:
+    """Pending migrations chalao. Kitni migrations apply hui, woh return karega."""
+    if backend == "mysql":
+        return _migrate_mysql(conn)
+    return _migrate_sqlite(conn)
+
+
+def repair_member_triggers(cursor) -> bool:
+    """Bulk load (etl_contacts.bulk_load_mode) FTS / stats / change feed triggers drop
+    karke chalta hai aur end me wapas banata hai. Process beech me kill ho jaye to
+    triggers kabhi wapas nahi aate (migrations already recorded hain) -- yahan har
+    open par check: koi trigger missing ho to sab wapas + FTS / member_stats rebuild
+    + 'R' change entry (readers reload karein). True = repair hua.
+    """
+    tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    triggers = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    expected = []
+    if FTS_TABLE in tables:
+        expected += FTS_TRIGGERS
+    if "member_stats" in tables:
+        expected += STATS_TRIGGERS
+    if "member_changes" in tables:
+        expected += CHANGE_TRIGGERS
+    missing = [name for name in expected if name not in triggers]
+    if not missing:
+        return False
+
+    print(f"[MIGRATE] Missing member triggers ({', '.join(missing)}), rebuilding")
+    if FTS_TABLE in tables:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        create_fts_index(cursor.connection)
+    if "member_stats" in tables:
+        rebuild_member_stats(cursor)
+        create_stats_triggers(cursor)
+    if "member_changes" in tables:
+        create_change_triggers(cursor)
+        record_reload(cursor)
+    return True
+
+
+def _migrate_sqlite(conn: sqlite3.Connection) -> int:
+    conn.commit()
+    cursor = conn.cursor()
+    applied = 0
+    try:
+        # BEGIN IMMEDIATE: GUI aur ETL ek saath start hon to bhi ek hi migrate karega
+        cursor.execute("BEGIN IMMEDIATE")
+        ensure_version_table(cursor)
+        version = current_version(cursor)
+        for number, description, func in MIGRATIONS:
+            if number <= version:
+                continue
+            func(cursor, "sqlite")
+            record_version(cursor, "sqlite", number, description)
+            applied += 1
+        repair_member_triggers(cursor)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return applied
+
+
+def _migrate_mysql(conn) -> int:
+    # MySQL me DDL auto-commit hota hai, isliye lock se serialize karte hain
+    # aur har migration ke turant baad version record hota hai
+    cursor = conn.cursor()
+    applied = 0
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (MYSQL_LOCK_NAME, MYSQL_LOCK_TIMEOUT))
+    cursor.fetchall()
+    try:
+        ensure_version_table(cursor)
+        version = current_version(cursor)
+        for number, description, func in MIGRATIONS:
+            if number <= version:
+                continue
+            func(cursor, "mysql")
+            record_version(cursor, "mysql", number, description)
+            conn.commit()
+            applied += 1
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (MYSQL_LOCK_NAME,))
+        cursor.fetchall()
+        cursor.close()
+    return applied
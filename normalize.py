@@ -0,0 +1,282 @@
+"""Contact normalization + validation -- ek hi rules, do engines.
+
+- normalize_frame(df): vectorized (pandas / NumPy string ops), ETL ke liye
+- normalize_contact(...): scalar, form / CSV import / HTTP server ke liye
+
+Dono ka output same input par bilkul same hota hai:
+- firstname / lastname: whitespace collapse, poora lower ya poora UPPER ho to Title Case
+- address: whitespace collapse
+- gender: Male / Female / Other (m, f, man, woman ... aliases), khali allowed
+- age: khali -> None, warna MIN_AGE..MAX_AGE ka whole number ("42", " 42 ", "42.0")
+- contact: E.164 (+<country><number>), bina country code ke numbers DEFAULT_COUNTRY_CODE
+  ke maane jate hain: 98765 43210 / 098765 43210 / 0091-98765-43210 -> +919876543210
+
+pandas sirf normalize_frame ke liye chahiye (GUI bina pandas ke chalta hai).
+"""
+import math
+import re
+
+MIN_AGE = 1
+MAX_AGE = 150   # migrations ka CHECK constraint bhi yahi range leta hai
+
+DEFAULT_COUNTRY_CODE = "91"
+NATIONAL_NUMBER_LENGTH = 10          # bina country code ke number ki length
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+COLUMNS = ("firstname", "lastname", "gender", "age", "address", "contact")
+REQUIRED_FIELDS = ("firstname", "lastname", "contact")
+
+GENDER_ALIASES = {
+    "m": "Male", "male": "Male", "man": "Male",
+    "f": "Female", "female": "Female", "woman": "Female",
+    "o": "Other", "other": "Other",
+}
+
+WHITESPACE = " \t\n\r\f\v"     # sirf ASCII whitespace (pandas / pyarrow ke saath same rahe)
+WHITESPACE_RUN = r"[ \t\n\r\f\v]+"
+
+# Phone me sirf digits, space, -, ., () aur shuru me + allowed hai
+PHONE_CHARS = r"\+?[0-9 ()\-.]+"
+# pandas.to_numeric jaisa number (underscore / hex nahi)
+AGE_NUMBER = r"[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+
+_WHITESPACE_RE = re.compile(WHITESPACE_RUN)
+_PHONE_RE = re.compile(PHONE_CHARS)
+_AGE_RE = re.compile(AGE_NUMBER)
+
+ERR_INVALID_CONTACT = "invalid contact number"
+ERR_INVALID_AGE = f"age must be a whole number between {MIN_AGE} and {MAX_AGE}"
+ERR_INVALID_GENDER = "unknown gender"
+
+
+# ============================ SCALAR ============================
+
+def clean_text(value) -> str:
+    if value is None:
+        return ""
+    return _WHITESPACE_RE.sub(" ", str(value)).strip(WHITESPACE)
+
+
+def fold_name(value) -> str:
+    text = clean_text(value)
+    return text.title() if text.islower() or text.isupper() else text
+
+
+def normalize_gender(value):
+    """Canonical gender, khali ke liye "", pehchana nahi to None."""
+    text = clean_text(value).lower()
+    if not text:
+        return ""
+    return GENDER_ALIASES.get(text)
+
+
+def normalize_age(value):
+    """(age, ok): khali -> (None, True), invalid -> (None, False)."""
+    if value is None:
+        return None, True
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+    else:
+        text = str(value).strip()
+        if not text:
+            return None, True
+        if not _AGE_RE.fullmatch(text):
+            return None, False
+        number = float(text)
+    if math.isnan(number):
+        return None, True
+    if not number.is_integer() or not MIN_AGE <= number <= MAX_AGE:
+        return None, False
+    return int(number), True
+
+
+def normalize_phone(value):
+    """E.164 string, ya None agar number samajh nahi aaya."""
+    text = clean_text(value)
+    if not text or not _PHONE_RE.fullmatch(text):
+        return None
+    digits = re.sub(r"\D", "", text)
+    if text.startswith("+"):
+        international = digits
+    elif digits.startswith("00"):
+        international = digits[2:]
+    elif len(digits) == NATIONAL_NUMBER_LENGTH:
+        international = DEFAULT_COUNTRY_CODE + digits
+    elif len(digits) == NATIONAL_NUMBER_LENGTH + 1 and digits.startswith("0"):
+        international = DEFAULT_COUNTRY_CODE + digits[1:]
+    elif (len(digits) == NATIONAL_NUMBER_LENGTH + len(DEFAULT_COUNTRY_CODE)
+          and digits.startswith(DEFAULT_COUNTRY_CODE)):
+        international = digits
+    else:
+        return None
+    if not E164_MIN_DIGITS <= len(international) <= E164_MAX_DIGITS or international.startswith("0"):
+        return None
+    return "+" + international
+
+
+def phone_prefixes(value):
+    """Adhoore number (filter bar) ke stored-form prefixes, ya None agar number jaisa nahi.
+
+    "+9198"  -> ["+9198"]
+    "98765"  -> ["+9198765", "+98765"]   (national number ya bina '+' ka country code)
+    "098765" -> ["+9198765"]
+    """
+    text = clean_text(value)
+    if not text or not _PHONE_RE.fullmatch(text):
+        return None
+    digits = re.sub(r"\D", "", text)
+    if not digits:
+        return None
+    if text.startswith("+"):
+        return ["+" + digits]
+    if digits.startswith("00"):
+        return ["+" + digits[2:]] if len(digits) > 2 else None
+    if digits.startswith("0"):
+        return ["+" + DEFAULT_COUNTRY_CODE + digits[1:]]
+    return ["+" + DEFAULT_COUNTRY_CODE + digits, "+" + digits]
+
+
+def normalize_contact(firstname, lastname, gender, age, address, contact):
+    """Ek contact normalize + validate karo.
+
+    Return (values, error): values COLUMNS order me normalized tuple, error None
+    ya pehli galti ka message (e.g. "missing firstname/contact").
+    """
+    first = fold_name(firstname)
+    last = fold_name(lastname)
+    raw_contact = clean_text(contact)
+    missing = [
+        name for name, value in (("firstname", first), ("lastname", last), ("contact", raw_contact))
+        if not value
+    ]
+    if missing:
+        return None, "missing " + "/".join(missing)
+
+    phone = normalize_phone(raw_contact)
+    if phone is None:
+        return None, ERR_INVALID_CONTACT
+    age_value, age_ok = normalize_age(age)
+    if not age_ok:
+        return None, ERR_INVALID_AGE
+    gender_value = normalize_gender(gender)
+    if gender_value is None:
+        return None, ERR_INVALID_GENDER
+    return (first, last, gender_value, age_value, clean_text(address), phone), None
+
+
+# ============================ VECTORIZED ============================
+
+def _by_unique(col, func):
+    """Low-cardinality column: func sirf unique values par, phir codes se wapas faila do.
+
+    Names / gender / age me 1M rows par bhi kuch sau unique values hote hain, isliye
+    yahi scalar rules (bilkul same output) bina per-row Python loop ke lagte hain.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(col)
+    return [func(u) for u in uniques], codes
+
+
+def _clean_series(s):
+    """clean_text ka vectorized roop; already-clean rows regex se bach jaate hain."""
+    s = s.str.strip(WHITESPACE)
+    messy = s.str.contains(r"[\t\n\r\f\v]|  ")
+    if messy.any():
+        s = s.mask(messy, s[messy].str.replace(WHITESPACE_RUN, " ", regex=True))
+    return s
+
+
+def _e164_series(raw):
+    """normalize_phone ka vectorized roop -> (E.164 Series, ok mask)."""
+    import pandas as pd
+
+    cc = DEFAULT_COUNTRY_CODE
+    national = NATIONAL_NUMBER_LENGTH
+    digits = raw.str.replace(r"\D", "", regex=True)
+    n = digits.str.len()
+    intl = pd.Series(pd.NA, index=raw.index, dtype="string")
+    # Ulte priority order me mask: aakhri mask (sabse pehla rule) jeetta hai
+    rules = (
+        ((n == national + len(cc)) & digits.str.startswith(cc), lambda: digits),
+        ((n == national + 1) & digits.str.startswith("0"), lambda: cc + digits.str.slice(1)),
+        (n == national, lambda: cc + digits),
+        (digits.str.startswith("00"), lambda: digits.str.slice(2)),
+        (raw.str.startswith("+"), lambda: digits),
+    )
+    for cond, value in rules:
+        if cond.any():
+            intl = intl.mask(cond, value())
+    m = intl.str.len()
+    ok = (
+        raw.str.fullmatch(PHONE_CHARS)
+        & (m >= E164_MIN_DIGITS) & (m <= E164_MAX_DIGITS)
+        & ~intl.str.startswith("0")
+    ).fillna(False).astype(bool)
+    return ("+" + intl).where(ok, ""), ok
+
+
+def normalize_frame(df):
+    """DataFrame (COLUMNS wale columns, koi bhi dtype) ko normalize karo.
+
+    Return: naya DataFrame -- normalized COLUMNS (age nullable Int64) + "error"
+    column ("" = valid row, warna normalize_contact jaisa hi message). Index same.
+    """
+    import numpy as np
+    import pandas as pd
+
+    def column(name):
+        return df[name].astype("string").fillna("")
+
+    out = pd.DataFrame(index=df.index)
+
+    # ---- names / gender / age: unique values par scalar rules ----
+    for name in ("firstname", "lastname"):
+        values, codes = _by_unique(column(name), fold_name)
+        out[name] = pd.array(values, dtype="string").take(codes)
+
+    values, codes = _by_unique(column("gender"), normalize_gender)
+    bad_gender = np.array([v is None for v in values], dtype=bool).take(codes)
+    out["gender"] = pd.array([v or "" for v in values], dtype="string").take(codes)
+
+    values, codes = _by_unique(column("age"), normalize_age)
+    age_ok = np.array([ok for _, ok in values], dtype=bool).take(codes)
+    out["age"] = pd.array([age for age, _ in values], dtype="Int64").take(codes)
+
+    out["address"] = _clean_series(column("address"))
+
+    # ---- contact -> E.164 ----
+    # Fast path: seedha 10 digit number (zyada tar rows) -> sirf prefix lagao
+    raw = column("contact")
+    plain = raw.str.fullmatch(f"[1-9][0-9]{{{NATIONAL_NUMBER_LENGTH - 1}}}")
+    contact = ("+" + DEFAULT_COUNTRY_CODE + raw).where(plain, "")
+    phone_ok = plain.to_numpy(dtype=bool, na_value=False)
+    rest = ~plain
+    if rest.any():
+        raw = raw.mask(rest, _clean_series(raw[rest]))
+        sub, sub_ok = _e164_series(raw[rest])
+        contact = contact.mask(rest, sub)
+        phone_ok[rest.to_numpy(dtype=bool)] = sub_ok.to_numpy(dtype=bool)
+    out["contact"] = contact
+
+    # ---- errors: normalize_contact jaisa hi priority order ----
+    missing_mask = (out["firstname"] == "") | (out["lastname"] == "") | (raw == "")
+    error = pd.Series("", index=df.index, dtype="string")
+    error = error.mask(bad_gender, ERR_INVALID_GENDER)
+    error = error.mask(~age_ok, ERR_INVALID_AGE)
+    error = error.mask(~phone_ok, ERR_INVALID_CONTACT)
+    if missing_mask.any():
+        # 3 flags -> 8 combinations ka lookup table ("missing firstname/contact" ...)
+        code = (
+            (out["firstname"] == "").to_numpy(dtype=int) * 4
+            + (out["lastname"] == "").to_numpy(dtype=int) * 2
+            + (raw == "").to_numpy(dtype=int)
+        )
+        labels = np.array([""] + [
+            "missing " + "/".join(f for f, bit in zip(REQUIRED_FIELDS, (4, 2, 1)) if i & bit)
+            for i in range(1, 8)
+        ], dtype=object)
+        error = error.mask(missing_mask, pd.Series(labels[code], index=df.index, dtype="string"))
+    out["error"] = error
+    return out
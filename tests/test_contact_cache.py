@@ -0,0 +1,139 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_cache import INDEX_REBUILD_THRESHOLD, ContactCache
+from contact_db import ConnectionPool, connect_sqlite
+from contact_service import Contact, ContactRepository
+from normalize import DEFAULT_COUNTRY_CODE
+
+SEARCHES = ("", "ra", "RA", "sh", "Kum", "z", "98765", "+9198765", "+91", "43210", "0012", "+1415", "415")
+NAMES = [("Rahul", "Sharma"), ("Ravi", "Kumar"), ("anita", "Rao"), ("Shreya", "Kulkarni"), ("Zoya", "Ansari")]
+ALL = 10 ** 6
+
+
+def sample_rows(n=40):
+    rows = []
+    for i in range(n):
+        first, last = NAMES[i % len(NAMES)]
+        contact = f"+1415555{i:04d}" if i % 9 == 0 else f"+9198765{i:05d}"
+        rows.append((first, last, ("Male", "Female", "")[i % 3], None if i % 4 == 0 else 20 + i, "Pune", contact))
+    return rows
+
+
+def matches(contact: Contact, term: str) -> bool:
+    """contact_cache ke search rules ka seedha (slow) version: naam ka prefix, number prefix / suffix."""
+    folded = term.casefold()
+    if contact.firstname.casefold().startswith(folded) or contact.lastname.casefold().startswith(folded):
+        return True
+    digits = term[1:] if term.startswith("+") else term
+    if not (digits.isascii() and digits.isdigit()):
+        return False
+    number = contact.contact[1:] if contact.contact.startswith("+") else contact.contact
+    if term.startswith("+"):
+        return number.startswith(digits)
+    return (number.startswith(digits) or number.startswith(DEFAULT_COUNTRY_CODE + digits)
+            or number.endswith(digits))
+
+
+def fields(contact: Contact) -> tuple:
+    return contact.values() + (contact.mem_id, contact.version)
+
+
+class ContactCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db = os.path.join(self.tmp.name, "contacts.db")
+        self.pool = ConnectionPool(lambda: connect_sqlite(db))
+        self.repo = ContactRepository("sqlite", pool=self.pool)
+        self.repo.init_schema()
+        self.repo.bulk_insert(sample_rows())
+        self.cache = ContactCache(self.repo)
+        self.cache.load()
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.tmp.cleanup()
+
+    def assertMatchesDb(self):
+        """Har search ka result (order ke saath) DB ke rows par wahi rules lagane jaisa."""
+        rows = list(self.repo.iter_contacts())  # (lastname, firstname, mem_id) order
+        for term in SEARCHES:
+            with self.subTest(search=term):
+                expected = [fields(c) for c in rows if not term or matches(c, term)]
+                self.assertEqual([fields(c) for c in self.cache.fetch_page(term, limit=ALL)], expected)
+                self.assertEqual(self.cache.count(term), len(expected))
+
+    def test_load_matches_db(self):
+        self.assertMatchesDb()
+
+    def test_keyset_pages_match_full_listing(self):
+        full = self.cache.fetch_page("", limit=ALL)
+        pages, after = [], None
+        while True:
+            page = self.cache.fetch_page("", after_key=after, limit=7)
+            pages.extend(page)
+            if len(page) < 7:
+                break
+            after = page[-1].key_for("lastname")
+        self.assertEqual([c.mem_id for c in pages], [c.mem_id for c in full])
+        before = full[20].key_for("lastname")
+        self.assertEqual([c.mem_id for c in self.cache.fetch_page("", before_key=before, limit=5)],
+                         [c.mem_id for c in full[15:20]])
+
+    def test_sync_insert_update_delete(self):
+        start = self.repo.last_change_seq()
+        new_id = self.repo.insert(Contact("Rakesh", "Anand", "Male", 33, "Delhi", "+919876500999"))
+        contact = self.repo.get(3)
+        contact.firstname, contact.contact = "Zubin", "+14155559999"
+        self.repo.update(contact)
+        self.repo.delete(5)
+        self.assertEqual(self.cache.sync(), 3)
+        self.assertEqual(self.cache.change_seq, self.repo.last_change_seq())
+        self.assertGreater(self.cache.change_seq, start)
+        self.assertIsNotNone(self.cache.get(new_id))
+        self.assertIsNone(self.cache.get(5))
+        self.assertMatchesDb()
+        self.assertEqual(self.cache.sync(), 0)
+
+    def test_sync_old_id_after_compaction_shifts_positions(self):
+        # Aadhe se zyada rows delete -> compact (slots hat jaate hain)
+        deleted = [self.repo.get(mem_id) for mem_id in range(2, 30)]
+        for contact in deleted:
+            self.repo.delete(contact.mem_id)
+        self.cache.sync()
+        self.assertEqual(len(self.cache.ids), self.cache.live)
+        # Undo jaisa: purane mem_id wapas -> beech me insert, positions khisakti hain
+        with self.pool.connection() as conn:
+            conn.executemany(
+                "INSERT INTO member(mem_id, firstname, lastname, gender, age, address, contact) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(c.mem_id, *c.values()) for c in deleted[:3]],
+            )
+            conn.commit()
+        self.cache.sync()
+        self.assertMatchesDb()
+
+    def test_sync_large_batch_rebuilds_indexes(self):
+        self.repo.bulk_insert(
+            (f"Bulk{i}", "Sharma", "Male", 30, "Pune", f"+9188888{i:05d}")
+            for i in range(INDEX_REBUILD_THRESHOLD + 10)
+        )
+        self.assertEqual(self.cache.sync(), INDEX_REBUILD_THRESHOLD + 10)
+        self.assertMatchesDb()
+
+    def test_reload_marker_forces_full_load(self):
+        with self.pool.connection() as conn:
+            conn.execute("UPDATE member SET firstname = 'Raw' WHERE mem_id = 1")
+            conn.execute("INSERT INTO member_changes(op, mem_id) VALUES ('R', 0)")
+            conn.commit()
+        self.assertIsNone(self.cache.sync(reload=False))
+        self.assertEqual(self.cache.sync(), -1)
+        self.assertMatchesDb()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_db import ConnectionPool, connect_sqlite
+from contact_service import ContactRepository, OperationCancelled
+
+
+class ImportCancelTest(unittest.TestCase):
+    def test_cancel_rolls_back_committed_batches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "contacts.db")
+            csv_path = os.path.join(tmp, "contacts.csv")
+            with open(csv_path, "w", encoding="utf-8") as f:
+                f.write("firstname,lastname,gender,age,address,contact\n")
+                for i in range(10):
+                    f.write(f"First{i},Last{i},Male,30,Pune,98765000{i:02d}\n")
+
+            pool = ConnectionPool(lambda: connect_sqlite(db))
+            repo = ContactRepository("sqlite", pool=pool)
+            repo.init_schema()
+            cancel = threading.Event()
+            batches = []
+
+            def progress(fraction, inserted, rejected):
+                batches.append(inserted)
+                if len(batches) == 2:
+                    cancel.set()
+
+            with self.assertRaises(OperationCancelled):
+                repo.import_csv(csv_path, chunk_size=2, progress=progress, cancel_event=cancel)
+            self.assertEqual(repo.count(), 0)
+            with pool.connection() as conn:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM member").fetchone()[0], 0)
+            pool.close_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
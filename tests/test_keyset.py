@@ -0,0 +1,107 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_db import ConnectionPool, connect_sqlite
+from contact_service import SELECT_COLUMNS, SORT_COLUMNS, Contact, ContactRepository, keyset_segments
+
+PAGE = 6
+
+
+def sample_rows(n=50):
+    """Bahut saare ties (same naam / age) aur pehle sort column me NULLs."""
+    return [
+        (
+            f"F{i % 3}",
+            f"L{i % 4}",
+            None if i % 7 == 0 else ("Male", "Female")[i % 2],
+            None if i % 5 == 0 else 25 + i % 4,
+            None if i % 6 == 0 else ("Pune", "Delhi")[i % 2],
+            f"98765{i:05d}",
+        )
+        for i in range(n)
+    ]
+
+
+class KeysetSegmentsTest(unittest.TestCase):
+    def test_plain_key_is_one_row_value_range(self):
+        self.assertEqual(
+            keyset_segments(("lastname", "firstname", "mem_id"), ("L", "F", 3), True, "?"),
+            [("(lastname, firstname, mem_id) > (?, ?, ?)", ("L", "F", 3))],
+        )
+
+    def test_backward_from_value_includes_null_block(self):
+        self.assertEqual(
+            keyset_segments(("age", "mem_id"), (30, 9), False, "?"),
+            [("(age, mem_id) < (?, ?)", (30, 9)), ("age IS NULL", ())],
+        )
+
+    def test_null_key_forward_then_non_null(self):
+        self.assertEqual(
+            keyset_segments(("age", "mem_id"), (None, 9), True, "%s"),
+            [("age IS NULL AND (mem_id) > (%s)", (9,)), ("age IS NOT NULL", ())],
+        )
+        self.assertEqual(
+            keyset_segments(("age", "mem_id"), (None, 9), False, "?"),
+            [("age IS NULL AND (mem_id) < (?)", (9,))],
+        )
+
+
+class KeysetPagingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db = os.path.join(self.tmp.name, "contacts.db")
+        self.pool = ConnectionPool(lambda: connect_sqlite(db))
+        self.repo = ContactRepository("sqlite", pool=self.pool)
+        self.repo.init_schema()
+        self.repo.bulk_insert(sample_rows())
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.tmp.cleanup()
+
+    def offset_page(self, sort, descending, offset, limit):
+        """Reference: seedha ORDER BY ... LIMIT / OFFSET (SQLite me bhi NULL ASC me pehle)."""
+        order = "DESC" if descending else "ASC"
+        order_sql = ", ".join(f"{column} {order}" for column in SORT_COLUMNS[sort])
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT {SELECT_COLUMNS} FROM member ORDER BY {order_sql} LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [Contact.from_row(row).mem_id for row in rows]
+
+    def test_forward_pages_match_offset(self):
+        total = self.repo.count()
+        for sort in SORT_COLUMNS:
+            for descending in (False, True):
+                with self.subTest(sort=sort, descending=descending):
+                    after, offset = None, 0
+                    while offset < total:
+                        page = self.repo.fetch_page(after_key=after, limit=PAGE, sort=sort, descending=descending)
+                        self.assertEqual([c.mem_id for c in page], self.offset_page(sort, descending, offset, PAGE))
+                        after = page[-1].key_for(sort)
+                        offset += PAGE
+                    self.assertEqual(
+                        self.repo.fetch_page(after_key=after, limit=PAGE, sort=sort, descending=descending), []
+                    )
+
+    def test_backward_pages_match_offset(self):
+        total = self.repo.count()
+        for sort in SORT_COLUMNS:
+            for descending in (False, True):
+                with self.subTest(sort=sort, descending=descending):
+                    last = self.offset_page(sort, descending, total - 1, 1)[0]
+                    before, end = self.repo.get(last).key_for(sort), total - 1
+                    while end > 0:
+                        page = self.repo.fetch_page(before_key=before, limit=PAGE, sort=sort, descending=descending)
+                        start = max(end - PAGE, 0)
+                        self.assertEqual([c.mem_id for c in page], self.offset_page(sort, descending, start, end - start))
+                        before, end = page[0].key_for(sort), start
+
+
+if __name__ == "__main__":
+    unittest.main()
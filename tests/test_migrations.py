@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_db import connect_sqlite
+from migrations import LATEST_VERSION, current_version, migrate
+
+# Purana (pre-migration) schema: age TEXT, koi schema_version table nahi
+LEGACY_SCHEMA = """
+    CREATE TABLE member (
+        mem_id    INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+        firstname TEXT,
+        lastname  TEXT,
+        gender    TEXT,
+        age       TEXT,
+        address   TEXT,
+        contact   TEXT
+    )
+"""
+
+# raw TEXT age -> m003 ke baad INTEGER / NULL (normalize_age jaisa)
+AGES = [
+    ("30.0", 30),
+    (" 42 ", 42),
+    ("abc", None),
+    ("200", None),
+    ("7", 7),
+    ("1e1", 10),
+    ("7.5", None),
+    ("0", None),
+    ("", None),
+    (None, None),
+]
+
+
+class IntegerAgeMigrationTest(unittest.TestCase):
+    def test_text_ages_become_integers_or_null(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect_sqlite(os.path.join(tmp, "legacy.db"))
+            conn.execute(LEGACY_SCHEMA)
+            conn.executemany(
+                "INSERT INTO member(firstname, lastname, gender, age, address, contact) VALUES (?, ?, ?, ?, ?, ?)",
+                [("Old", f"Row{i}", "Male", raw, "Pune", f"98765{i:05d}") for i, (raw, _) in enumerate(AGES)],
+            )
+            conn.commit()
+
+            migrate(conn)
+            self.assertEqual(current_version(conn.cursor()), LATEST_VERSION)
+            rows = dict(conn.execute("SELECT lastname, age FROM member").fetchall())
+            for i, (raw, expected) in enumerate(AGES):
+                with self.subTest(age=raw):
+                    self.assertEqual(rows[f"Row{i}"], expected)
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM member WHERE typeof(age) NOT IN ('integer', 'null')").fetchone()[0],
+                0,
+            )
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
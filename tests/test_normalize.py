@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalize import COLUMNS, normalize_contact, normalize_frame
+
+try:
+    import pandas as pd
+except ImportError:  # GUI bina pandas ke chalta hai, normalize_frame ko chahiye
+    pd = None
+
+# (firstname, lastname, gender, age, address, contact) -- valid aur har tarah ki galti
+CASES = [
+    ("rahul", "SHARMA", "m", "42", "  12  MG Road ", "98765 43210"),
+    ("  Anita ", "de Souza", "Female", " 30.0 ", "Pune", "098765-43210"),
+    ("KIRAN", "rao", "o", "", "", "0091-98765-43210"),
+    ("Sam", "Lee", "", None, None, "+1 (415) 555-0100"),
+    ("Ravi", "Kumar", "MALE", 42, "Delhi", "+919876543210"),
+    ("Meena", "Iyer", "woman", 42.0, "Chennai", "9876543210"),
+    ("Ravi", "Kumar", "Male", "1e1", "Delhi", "9876543210"),
+    ("Ravi", "Kumar", "Male", "7.5", "Delhi", "9876543210"),
+    ("Ravi", "Kumar", "Male", "200", "Delhi", "9876543210"),
+    ("Ravi", "Kumar", "Male", "0", "Delhi", "9876543210"),
+    ("Ravi", "Kumar", "Male", "abc", "Delhi", "9876543210"),
+    ("Ravi", "Kumar", "robot", "30", "Delhi", "9876543210"),
+    ("Ravi", "Kumar", "Male", "30", "Delhi", "12345"),
+    ("Ravi", "Kumar", "Male", "30", "Delhi", "98765abc10"),
+    ("Ravi", "Kumar", "robot", "abc", "Delhi", "12"),
+    ("", "Kumar", "Male", "30", "Delhi", "9876543210"),
+    ("Ravi", "  ", "Male", "30", "Delhi", ""),
+    (None, None, None, None, None, None),
+    ("ravi\tkumar", "o'BRIEN", "F", "+42", "a\n b", "+91 98765 43210"),
+]
+
+
+@unittest.skipIf(pd is None, "pandas not installed")
+class NormalizeParityTest(unittest.TestCase):
+    """normalize_frame (ETL) aur normalize_contact (form / import / m003) ka output same hona chahiye."""
+
+    def frame_rows(self, cases):
+        """normalize_frame ka output normalize_contact jaisi (values, error) list me."""
+        out = normalize_frame(pd.DataFrame(cases, columns=list(COLUMNS), dtype=object))
+        rows = []
+        for record in out.to_dict("records"):
+            values = tuple(None if pd.isna(record[name]) else record[name] for name in COLUMNS)
+            rows.append((values, record["error"] or None))
+        return rows
+
+    def test_frame_matches_scalar(self):
+        for case, (values, error) in zip(CASES, self.frame_rows(CASES)):
+            with self.subTest(case=case):
+                expected_values, expected_error = normalize_contact(*case)
+                self.assertEqual(error, expected_error)
+                if expected_error is None:
+                    self.assertEqual(values, expected_values)
+
+
+if __name__ == "__main__":
+    unittest.main()
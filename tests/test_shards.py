@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_db import ConnectionPool, connect_sqlite
+from contact_service import SORT_COLUMNS, Contact, ContactRepository, sort_key
+from contact_shards import ShardedContactRepository
+
+SHARDS = 3
+PAGE = 7
+
+
+def sample_rows(n=60):
+    """Kam distinct values (ties), kuch NULL ages -- keyset ke mushkil cases."""
+    return [
+        (
+            f"F{i % 5}",
+            f"L{i % 4}",
+            ("Male", "Female", "")[i % 3],
+            None if i % 6 == 0 else 20 + i % 9,
+            ("Pune", "Delhi", "Jaipur")[i % 3],
+            f"+9198765{i:05d}",
+        )
+        for i in range(n)
+    ]
+
+
+def page_forward(repo, sort, descending):
+    rows, after = [], None
+    while True:
+        page = repo.fetch_page(after_key=after, limit=PAGE, sort=sort, descending=descending)
+        rows.extend(page)
+        if len(page) < PAGE:
+            return rows
+        after = page[-1].key_for(sort)
+
+
+def page_backward(repo, sort, descending, last):
+    rows, before = [], last.key_for(sort)
+    rows.append(last)
+    while True:
+        page = repo.fetch_page(before_key=before, limit=PAGE, sort=sort, descending=descending)
+        rows[:0] = page
+        if len(page) < PAGE:
+            return rows
+        before = page[0].key_for(sort)
+
+
+class ShardedRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sharded = ShardedContactRepository(os.path.join(self.tmp.name, "shards"), SHARDS)
+        self.sharded.init_schema()
+        db = os.path.join(self.tmp.name, "single.db")
+        self.pool = ConnectionPool(lambda: connect_sqlite(db))
+        self.single = ContactRepository("sqlite", pool=self.pool)
+        self.single.init_schema()
+        rows = sample_rows()
+        self.sharded.bulk_insert(rows)
+        self.single.bulk_insert(rows)
+
+    def tearDown(self):
+        self.sharded.close()
+        self.pool.close_all()
+        self.tmp.cleanup()
+
+    def test_global_id_round_trip(self):
+        for shard in range(SHARDS):
+            for local in (1, 2, 17, 10 ** 9):
+                mem_id = self.sharded.global_id(local, shard)
+                self.assertEqual(self.sharded.locate(mem_id), (shard, local))
+        self.assertIsNone(self.sharded.global_id(None, 0))
+
+        mem_id = self.sharded.insert(Contact("Round", "Trip", "Male", 40, "Pune", "+919999900000"))
+        shard, local = self.sharded.locate(mem_id)
+        self.assertEqual(shard, self.sharded.shard_of_contact("+919999900000"))
+        self.assertEqual(self.sharded.shards[shard].get(local).contact, "+919999900000")
+        self.assertEqual(self.sharded.get(mem_id).mem_id, mem_id)
+
+    def test_fetch_page_merge_matches_single_db(self):
+        for sort in SORT_COLUMNS:
+            for descending in (False, True):
+                with self.subTest(sort=sort, descending=descending):
+                    sharded = page_forward(self.sharded, sort, descending)
+                    single = page_forward(self.single, sort, descending)
+                    self.assertEqual(len(sharded), len(single))
+                    self.assertEqual(len({c.mem_id for c in sharded}), len(sharded))
+                    keys = [c.key_for(sort) for c in sharded]
+                    self.assertEqual(keys, sorted(keys, key=sort_key, reverse=descending))
+                    # mem_id dono me alag hain; baaki sort columns ka order same hona chahiye
+                    if sort == "mem_id":
+                        self.assertEqual(sorted(c.contact for c in sharded), sorted(c.contact for c in single))
+                    else:
+                        self.assertEqual(
+                            [c.key_for(sort)[:-1] for c in sharded], [c.key_for(sort)[:-1] for c in single]
+                        )
+                    backward = page_backward(self.sharded, sort, descending, sharded[-1])
+                    self.assertEqual([c.mem_id for c in backward], [c.mem_id for c in sharded])
+
+    def test_changes_since_truncated_positions(self):
+        start = self.sharded.last_change_seq()
+        contacts = [
+            Contact(f"New{i}", "Feed", "Female", 30, "Pune", f"+919111100{i:03d}") for i in range(12)
+        ]
+        ids = [self.sharded.insert(contact) for contact in contacts]
+        self.sharded.delete(ids[0])
+
+        full = self.sharded.changes_since(start, 100)
+        self.assertEqual(len(full), 13)
+        for limit in (1, 4, 5, 12):
+            with self.subTest(limit=limit):
+                part = self.sharded.changes_since(start, limit)
+                self.assertEqual(len(part), limit)
+                positions = [position for position, _, _ in part]
+                for before, after in zip(positions, positions[1:]):
+                    self.assertTrue(all(a >= b for a, b in zip(after, before)))
+                # Aakhri position se resume: na koi change chhute na dobara aaye
+                rest = self.sharded.changes_since(part[-1][0], 100)
+                seen = [(op, mem_id) for _, op, mem_id in part + rest]
+                self.assertEqual(sorted(seen), sorted((op, mem_id) for _, op, mem_id in full))
+        self.assertEqual(self.sharded.changes_since(full[-1][0], 100), [])
+        self.assertEqual(full[-1][0], self.sharded.last_change_seq())
+
+
+if __name__ == "__main__":
+    unittest.main()
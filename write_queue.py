@@ -0,0 +1,176 @@
+"""Background writer: GUI ke writes Tk thread se hata ke ek thread par, group commit ke saath.
+
+Har click par ek synchronous commit (SQLite par fsync, MySQL par network round trip)
+UI ko atka deta tha. Ab:
+- submit() turant concurrent.futures.Future return karta hai, UI result root.after
+  se poll karta hai (index.py: ContactApp.after_write)
+- writer thread queue me jitne writes pending hain (max WRITE_BATCH_MAX) sab ek
+  transaction me chalata hai, ek hi commit -- ek fsync / round trip poore batch ka
+- har write apne SAVEPOINT me: ek write fail ho (ConflictError, duplicate contact)
+  to sirf uska future error paata hai, baaki batch commit hota hai
+- futures commit hone ke baad hi resolve hote hain (UI "saved" tabhi dikhata hai)
+- busy / deadlock par poora batch run_with_retry se dobara
+- close(): pending writes flush karke thread band (GUI exit par)
+
+    queue = WriteQueue(repo)
+    future = queue.insert(contact)   # future.result() -> mem_id
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+
+import instrumentation
+from contact_db import is_busy_error, run_with_retry
+from contact_service import Contact, ContactRepository
+
+# ======================= WRITE QUEUE CONFIG ============================
+WRITE_BATCH_MAX = 100         # ek group commit me max itne writes
+GROUP_COMMIT_WINDOW = 0.002   # pehle write ke baad itne seconds aur writes ka wait
+CLOSE_TIMEOUT = 30.0          # exit par pending writes flush hone ka max wait
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Ek writer thread, FIFO order me writes. submit() kisi bhi thread se safe hai."""
+
+    def __init__(self, repo: ContactRepository):
+        self.repo = repo
+        self.pending = queue.Queue()
+        self.closed = False
+        self.batches = 0
+        self.writes = 0
+        self.thread = threading.Thread(target=self._run, name="contact-writer", daemon=True)
+        self.thread.start()
+
+    # ============================ SUBMIT ============================
+
+    def submit(self, operation) -> Future:
+        """operation(repo) writer thread par, batch ke transaction me chalega.
+
+        repo ek hi connection par bound hai; operation commit na kare (commit=False).
+        Batch retry par operation dobara chal sakta hai, isliye inputs mutate na kare.
+        """
+        if self.closed:
+            raise RuntimeError("write queue is closed")
+        future = Future()
+        self.pending.put((operation, future))
+        return future
+
+    def insert(self, contact: Contact) -> Future:
+        """Future -> naya mem_id."""
+        return self.submit(lambda repo: repo.insert(replace(contact), commit=False))
+
+    def update(self, contact: Contact) -> Future:
+        """Future -> found (bool), ya ConflictError."""
+        return self.submit(lambda repo: repo.update(replace(contact), commit=False))
+
+    def delete(self, mem_id: int, version=None) -> Future:
+        """Future -> found (bool), ya ConflictError."""
+        return self.submit(lambda repo: repo.delete(mem_id, version, commit=False))
+
+    def flush(self, timeout=None) -> bool:
+        """Ab tak submit hue saare writes commit hone tak ruko. True = ho gaye."""
+        marker = self.submit(lambda repo: None)
+        try:
+            marker.result(timeout)
+        except Exception:
+            return marker.done()
+        return True
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> bool:
+        """Pending writes flush karo aur writer thread band. True = sab likh diya gaya."""
+        if self.closed:
+            return not self.thread.is_alive()
+        self.closed = True
+        self.pending.put(_STOP)
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    # ============================ WRITER THREAD ============================
+
+    def _next_batch(self):
+        """Pehle write ka wait (blocking), phir window ke andar jitne aur aa jayein."""
+        first = self.pending.get()
+        if first is _STOP:
+            return None, True
+        batch = [first]
+        deadline = time.monotonic() + GROUP_COMMIT_WINDOW
+        while len(batch) < WRITE_BATCH_MAX:
+            try:
+                item = self.pending.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if batch:
+                self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        live = [(op, future) for op, future in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        started = time.perf_counter()
+        try:
+            results = run_with_retry(lambda: self._apply(live))
+        except Exception as exc:
+            # Commit hi fail (connection gaya, retries khatam): poora batch fail,
+            # har caller ko apne future se exception milega
+            for _, future in live:
+                future.set_exception(exc)
+            return
+        self.repo.stats_cache = None
+        self.batches += 1
+        self.writes += len(live)
+        if instrumentation.ENABLED:
+            instrumentation.observe("db.group_commit", time.perf_counter() - started)
+        for (_, future), (ok, value) in zip(live, results):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _apply(self, live) -> list:
+        """Ek transaction: har operation apne savepoint me. [(ok, result / exception)]."""
+        with self.repo.connection() as conn:
+            bound = ContactRepository(self.repo.backend, conn=conn)
+            cursor = conn.cursor()
+            try:
+                if self.repo.backend == "sqlite":
+                    # Write lock shuru me hi: baad me upgrade par deadlock / busy nahi
+                    cursor.execute("BEGIN IMMEDIATE")
+                results = []
+                for operation, _ in live:
+                    cursor.execute("SAVEPOINT write_op")
+                    try:
+                        results.append((True, operation(bound)))
+                    except Exception as exc:
+                        if is_busy_error(exc):
+                            raise
+                        cursor.execute("ROLLBACK TO write_op")
+                        results.append((False, exc))
+                    cursor.execute("RELEASE write_op")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending.qsize(),
+            "batches": self.batches,
+            "writes": self.writes,
+            "writes_per_commit": round(self.writes / self.batches, 2) if self.batches else 0.0,
+        }